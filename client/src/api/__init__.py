@@ -9,8 +9,14 @@ from .experiment import (
     template_api, TemplateAPI,
     experiment_api, ExperimentAPI,
     metrics_api, ObjectiveMetricsAPI,
-    version_api, TemplateVersionAPI
+    version_api, TemplateVersionAPI,
+    batch_api, BatchAPI
 )
+from .cache import (
+    entity_cache, EntityCache,
+    CUSTOMERS_PATH, APPS_PATH, TEMPLATES_PATH, EXPERIMENTS_PATH, MATRIX_PATH
+)
+from .async_api import async_api, AsyncAPI, RequestFuture, error_message
 
 __all__ = [
     "api_client", "APIClient", "APIError", "ServerUnreachableError",
@@ -22,4 +28,8 @@ __all__ = [
     "experiment_api", "ExperimentAPI",
     "metrics_api", "ObjectiveMetricsAPI",
     "version_api", "TemplateVersionAPI",
+    "batch_api", "BatchAPI",
+    "entity_cache", "EntityCache",
+    "CUSTOMERS_PATH", "APPS_PATH", "TEMPLATES_PATH", "EXPERIMENTS_PATH", "MATRIX_PATH",
+    "async_api", "AsyncAPI", "RequestFuture", "error_message",
 ]
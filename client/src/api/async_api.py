@@ -0,0 +1,231 @@
+"""异步 API 调用
+
+页面不在 GUI 线程上直接调用同步 API（一次网络往返就会冻结整个界面），
+而是把调用交给线程池执行，结果通过 Qt 信号回到 GUI 线程再回调：
+
+    async_api.fetch(app_api.list, customer_id=1, owner=self, group="apps").then(
+        self._onAppsLoaded, self._onLoadFailed
+    )
+
+- fetch: 读请求，函数和参数相同且仍在进行中的请求合并为一次调用
+- submit: 写请求，不合并；写请求开始和结束时，之前的读请求不再参与合并，避免拿到旧数据
+- owner: 回调所属的 QObject，结果返回时已销毁则丢弃
+- group: 同一 owner 下同组的新请求会取消旧请求（如筛选条件变化），旧请求的结果不再回调
+"""
+
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import shiboken6
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from .cache import entity_cache
+
+logger = logging.getLogger("async_api")
+
+
+def error_message(error: Exception) -> str:
+    """取异常的提示文本（APIError / ServerUnreachableError 带 message）"""
+    return getattr(error, "message", None) or str(error) or type(error).__name__
+
+
+class RequestFuture(QObject):
+    """一次异步 API 调用的结果，信号和回调都在 GUI 线程上触发"""
+
+    succeeded = Signal(object)  # 调用结果
+    failed = Signal(object)     # 异常
+
+    def __init__(self, owner: Optional[QObject] = None):
+        super().__init__()
+        self._owner = owner
+        self._callbacks: List[Tuple[Optional[Callable], Optional[Callable]]] = []
+        self._cancelled = False
+        self._done = False
+        self._result: Any = None
+        self._error: Optional[Exception] = None
+
+    def then(self, on_success: Optional[Callable[[Any], None]] = None,
+             on_error: Optional[Callable[[Exception], None]] = None) -> "RequestFuture":
+        """注册回调；已完成时立即回调"""
+        if self._done:
+            self._invoke(on_success, on_error)
+        else:
+            self._callbacks.append((on_success, on_error))
+        return self
+
+    def cancel(self):
+        """取消：结果不再回调（已发出的网络请求无法中止，但其结果会被丢弃）"""
+        self._cancelled = True
+        self._callbacks.clear()
+
+    def isCancelled(self) -> bool:
+        return self._cancelled
+
+    def isDone(self) -> bool:
+        return self._done
+
+    def _isActive(self) -> bool:
+        """仍需要结果：未取消且 owner 未销毁"""
+        if self._cancelled:
+            return False
+        return self._owner is None or shiboken6.isValid(self._owner)
+
+    def _finish(self, result: Any, error: Optional[Exception]):
+        if not self._isActive():
+            self._callbacks.clear()
+            return
+        self._done = True
+        self._result = result
+        self._error = error
+
+        callbacks, self._callbacks = self._callbacks, []
+        if error is not None:
+            self.failed.emit(error)
+            if not any(on_error for _, on_error in callbacks):
+                logger.warning(f"异步请求失败: {error_message(error)}")
+        else:
+            self.succeeded.emit(result)
+        for on_success, on_error in callbacks:
+            self._invoke(on_success, on_error)
+
+    def _invoke(self, on_success, on_error):
+        if self._error is not None:
+            if on_error is not None:
+                on_error(self._error)
+        elif on_success is not None:
+            on_success(self._result)
+
+
+class _Call(QObject):
+    """一次实际执行的调用，可被多个 RequestFuture 共享（请求合并）
+
+    在 GUI 线程创建，completed 信号从工作线程发出，经队列连接回到 GUI 线程处理。
+    """
+
+    completed = Signal(object, object)  # result, error
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.futures: List[RequestFuture] = []
+        # 完成后、回调前执行的清理（执行器的登记信息）
+        self.cleanups: List[Callable[[], None]] = []
+        self.completed.connect(self._deliver)
+
+    def isAbandoned(self) -> bool:
+        """所有等待者都已取消"""
+        return bool(self.futures) and not any(f._isActive() for f in self.futures)
+
+    def execute(self):
+        """在工作线程中执行"""
+        if self.isAbandoned():
+            self.completed.emit(None, None)
+            return
+        try:
+            result, error = self.fn(*self.args, **self.kwargs), None
+        except Exception as e:
+            result, error = None, e
+        self.completed.emit(result, error)
+
+    def _deliver(self, result, error):
+        # 先清理登记信息，回调中发起的新请求不会再合并到这次已完成的调用
+        for cleanup in self.cleanups:
+            cleanup()
+        for future in self.futures:
+            future._finish(result, error)
+
+
+class _CallRunnable(QRunnable):
+    def __init__(self, call: _Call):
+        super().__init__()
+        self._call = call
+
+    def run(self):
+        self._call.execute()
+
+
+class AsyncAPI(QObject):
+    """异步 API 执行器"""
+
+    # 实体缓存在后台确认后数据有变化（参数为缓存路径，如 MATRIX_PATH），页面据此重新加载
+    cacheUpdated = Signal(str)
+
+    def __init__(self, max_threads: int = 4):
+        super().__init__()
+        entity_cache.add_listener(self.cacheUpdated.emit)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        # 进行中的读请求（用于合并）和所有未完成的调用（保持引用直到回调）
+        self._inflight: Dict[Hashable, _Call] = {}
+        self._running: Set[_Call] = set()
+        # (id(owner), group) -> 该组最新的请求
+        self._groups: Dict[Tuple[int, Hashable], RequestFuture] = {}
+
+    def fetch(self, fn: Callable, *args, owner: Optional[QObject] = None,
+              group: Optional[Hashable] = None, **kwargs) -> RequestFuture:
+        """读请求：相同调用进行中时直接共享其结果（需在 GUI 线程调用）"""
+        key = self._callKey(fn, args, kwargs)
+        call = self._inflight.get(key) if key is not None else None
+        if call is None:
+            call = self._start(fn, args, kwargs)
+            if key is not None:
+                self._inflight[key] = call
+                call.cleanups.append(lambda: self._dropInflight(key, call))
+        return self._attach(call, owner, group)
+
+    def submit(self, fn: Callable, *args, owner: Optional[QObject] = None,
+               group: Optional[Hashable] = None, **kwargs) -> RequestFuture:
+        """写请求：总是单独执行"""
+        self._inflight.clear()
+        call = self._start(fn, args, kwargs)
+        call.cleanups.append(self._inflight.clear)
+        return self._attach(call, owner, group)
+
+    def cancelGroup(self, owner: Optional[QObject], group: Hashable):
+        """取消指定组中进行中的请求"""
+        future = self._groups.pop((id(owner), group), None)
+        if future is not None:
+            future.cancel()
+
+    def _start(self, fn: Callable, args: tuple, kwargs: dict) -> _Call:
+        call = _Call(fn, args, kwargs)
+        self._running.add(call)
+        call.cleanups.append(lambda: self._running.discard(call))
+        self._pool.start(_CallRunnable(call))
+        return call
+
+    def _attach(self, call: _Call, owner: Optional[QObject], group: Optional[Hashable]) -> RequestFuture:
+        future = RequestFuture(owner)
+        call.futures.append(future)
+        if group is not None:
+            group_key = (id(owner), group)
+            previous = self._groups.get(group_key)
+            if previous is not None:
+                previous.cancel()
+            self._groups[group_key] = future
+            call.cleanups.append(lambda: self._dropGroup(group_key, future))
+        return future
+
+    def _dropInflight(self, key: Hashable, call: _Call):
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+
+    def _dropGroup(self, group_key: Tuple[int, Hashable], future: RequestFuture):
+        if self._groups.get(group_key) is future:
+            del self._groups[group_key]
+
+    @staticmethod
+    def _callKey(fn: Callable, args: tuple, kwargs: dict) -> Optional[Hashable]:
+        """合并用的键，参数不可哈希时不合并"""
+        key = (fn, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+
+# 全局异步 API 执行器
+async_api = AsyncAPI()
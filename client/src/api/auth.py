@@ -3,6 +3,7 @@
 from typing import Optional
 
 from .client import api_client, APIError
+from .cache import entity_cache
 from models.user import LoginRequest, TokenResponse, UserResponse, ChangePasswordRequest
 
 
@@ -19,12 +20,15 @@ class AuthAPI:
         token_data = TokenResponse(**response)
         # 保存 token 到客户端
         api_client.set_token(token_data.access_token, token_data.refresh_token)
+        # 实体缓存按用户持久化
+        entity_cache.set_user(token_data.user.id)
         return token_data
 
     @staticmethod
     def logout():
         """用户登出"""
         api_client.clear_token()
+        entity_cache.clear()
 
     @staticmethod
     def get_current_user() -> UserResponse:
@@ -43,7 +47,7 @@ class AuthAPI:
     @staticmethod
     def refresh_token(refresh_token: str) -> TokenResponse:
         """刷新令牌"""
-        response = api_client.post("/auth/refresh", data={"refresh_token": refresh_token})
+        response = api_client.post("/auth/refresh", params={"refresh_token": refresh_token})
         token_data = TokenResponse(**response)
         api_client.set_token(token_data.access_token, token_data.refresh_token)
         return token_data
@@ -0,0 +1,257 @@
+"""客户端实体缓存
+
+客户/应用/模板层级、实验列表和矩阵数据在多个页面和对话框间共享：
+- 新鲜期（ENTITY_CACHE_TTL）内直接返回缓存，不发请求
+- 过期后带 If-None-Match 重新验证，服务端返回 304 时沿用缓存，省去传输和解析
+- 本地增删改后就地更新缓存；不便就地更新的（实验列表带分页筛选、矩阵）标记为过期
+- 登录后按服务器地址和用户持久化到本地（DiskCache）：启动时先返回上次的数据，
+  同时在后台重新验证，数据有变化时通知监听者（页面据此重新加载）
+
+缓存的列表按写时复制更新，返回给调用方的是副本，页面持有的列表不会被修改。
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from core.config import settings
+from .client import api_client
+from .disk_cache import DiskCache
+
+logger = logging.getLogger("entity_cache")
+
+# 缓存的路径
+CUSTOMERS_PATH = "/experiments/customers"
+APPS_PATH = "/experiments/apps"
+TEMPLATES_PATH = "/experiments/templates"
+EXPERIMENTS_PATH = "/experiments"
+MATRIX_PATH = "/experiments/matrix"
+
+# 实体变化后需要重新验证的派生数据
+_DERIVED_PATHS = (EXPERIMENTS_PATH, MATRIX_PATH)
+
+CacheKey = Tuple[str, str, tuple]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    etag: Optional[str]
+    fetched_at: float
+    # 从本地读取、本次运行尚未经服务端确认
+    from_disk: bool = False
+
+
+class EntityCache:
+    """带 TTL 和 ETag 重新验证的实体缓存（线程安全，请求来自异步 API 的工作线程）"""
+
+    def __init__(self, ttl: float = None, disk: Optional[DiskCache] = None):
+        self.ttl = settings.ENTITY_CACHE_TTL if ttl is None else ttl
+        self._disk = disk
+        self._user_id: Optional[int] = None
+        self._entries: Dict[CacheKey, _Entry] = {}
+        self._lock = threading.Lock()
+        # 每次修改缓存递增，请求期间缓存被修改时不写回（响应可能早于本地修改）
+        self._generation = 0
+        self._listeners: List[Callable[[str], None]] = []
+        # 后台重新验证和写盘
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="entity-cache")
+        self._revalidating: Set[CacheKey] = set()
+
+    def set_user(self, user_id: Optional[int]):
+        """设置当前用户（登录后），本地持久化按用户区分"""
+        with self._lock:
+            if user_id != self._user_id:
+                self._entries.clear()
+                self._generation += 1
+            self._user_id = user_id
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """后台重新验证得到新数据时回调 listener(path)（在后台线程调用）"""
+        self._listeners.append(listener)
+
+    def get(self, path: str, params: dict = None, parse: Callable[[Any], Any] = None) -> Any:
+        """读取缓存，过期时重新验证
+
+        Args:
+            path: 请求路径
+            params: 查询参数（值为 None 的参数不发送）
+            parse: 把响应数据转换为缓存值（通常是模型列表）
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        key = self._key(path, params)
+        parse = parse or (lambda data: data)
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+            scope = self._scope()
+
+        if entry is None and scope is not None:
+            entry = self._loadFromDisk(scope, key, parse, generation)
+
+        with self._lock:
+            if entry is not None:
+                if time.monotonic() - entry.fetched_at < self.ttl:
+                    return self._copy(entry.value)
+                if entry.from_disk:
+                    # 先用上次的数据，后台向服务端确认
+                    self._scheduleRevalidate(key, path, params, parse, entry, generation)
+                    return self._copy(entry.value)
+
+        value, _ = self._fetch(key, path, params, parse, entry, generation)
+        return self._copy(value)
+
+    # ============ 本地修改后更新 ============
+
+    def add(self, path: str, item: Any):
+        """新建实体：加入所有筛选条件匹配的列表"""
+        with self._lock:
+            changed = []
+            for key, entry in self._iterPath(path):
+                if self._matches(key, item):
+                    entry.value = entry.value + [item]
+                    changed.append((key, entry))
+            self._invalidatePaths(_DERIVED_PATHS)
+            self._persist(changed)
+
+    def replace(self, path: str, item: Any):
+        """更新实体：替换列表中同 ID 的实体"""
+        with self._lock:
+            changed = []
+            for key, entry in self._iterPath(path):
+                entry.value = [item if existing.id == item.id else existing for existing in entry.value]
+                changed.append((key, entry))
+            self._invalidatePaths(_DERIVED_PATHS)
+            self._persist(changed)
+
+    def remove(self, path: str, item_id: int, cascade: Tuple[str, ...] = ()):
+        """删除实体：从列表中移除，级联删除的下级列表标记为过期"""
+        with self._lock:
+            changed = []
+            for key, entry in self._iterPath(path):
+                entry.value = [existing for existing in entry.value if existing.id != item_id]
+                changed.append((key, entry))
+            self._invalidatePaths(cascade + _DERIVED_PATHS)
+            self._persist(changed)
+
+    def invalidate(self, *paths: str):
+        """标记为过期（保留 ETag，下次读取时重新验证）；不传路径时全部过期"""
+        with self._lock:
+            self._invalidatePaths(paths or None)
+
+    def clear(self):
+        """清空内存中的缓存并取消当前用户（登出、切换服务器时），本地持久化的数据保留"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._user_id = None
+
+    # ============ 内部方法 ============
+
+    def _key(self, path: str, params: dict) -> CacheKey:
+        # 不同服务器的数据互不相干
+        return (api_client.base_url, path, tuple(sorted(params.items())))
+
+    def _scope(self) -> Optional[str]:
+        """本地持久化的范围（服务器地址 + 用户），未登录或未启用时为 None"""
+        if self._disk is None or self._user_id is None:
+            return None
+        return f"{api_client.base_url}#{self._user_id}"
+
+    def _loadFromDisk(self, scope: str, key: CacheKey, parse: Callable, generation: int) -> Optional[_Entry]:
+        stored = self._disk.load(scope, key[1], key[2])
+        if stored is None:
+            return None
+        data, etag = stored
+        try:
+            value = parse(data)
+        except Exception as e:
+            logger.debug(f"本地缓存数据无法解析，忽略: {e}")
+            return None
+
+        entry = _Entry(value, etag, float("-inf"), from_disk=True)
+        with self._lock:
+            if self._generation != generation:
+                return None
+            return self._entries.setdefault(key, entry)
+
+    def _fetch(self, key: CacheKey, path: str, params: dict, parse: Callable,
+               entry: Optional[_Entry], generation: int) -> Tuple[Any, bool]:
+        """请求服务端（带 ETag），返回 (值, 数据是否有变化并已写入缓存)"""
+        etag = entry.etag if entry is not None else None
+        data, etag = api_client.get_conditional(path, params=params or None, etag=etag)
+        value = entry.value if data is None else parse(data)
+
+        with self._lock:
+            if self._generation != generation:
+                return value, False
+            self._entries[key] = _Entry(value, etag, time.monotonic())
+            scope = self._scope()
+
+        if data is not None and scope is not None:
+            self._executor.submit(self._disk.save, scope, key[1], key[2], data, etag)
+        return value, data is not None
+
+    def _scheduleRevalidate(self, key: CacheKey, path: str, params: dict, parse: Callable,
+                            entry: _Entry, generation: int):
+        """后台重新验证本地读取的数据（需持有锁）"""
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+        self._executor.submit(self._revalidate, key, path, params, parse, entry, generation)
+
+    def _revalidate(self, key: CacheKey, path: str, params: dict, parse: Callable,
+                    entry: _Entry, generation: int):
+        try:
+            _, changed = self._fetch(key, path, params, parse, entry, generation)
+        except Exception as e:
+            # 服务端暂不可用时继续使用本地数据，下次读取再确认
+            logger.debug(f"后台重新验证失败: {path} {e}")
+            return
+        finally:
+            with self._lock:
+                self._revalidating.discard(key)
+
+        if changed:
+            for listener in list(self._listeners):
+                listener(path)
+
+    def _persist(self, changed: List[Tuple[CacheKey, _Entry]]):
+        """把就地更新后的列表写入本地（需持有锁）"""
+        scope = self._scope()
+        if scope is None:
+            return
+        for key, entry in changed:
+            data = [item.model_dump(mode="json") if isinstance(item, BaseModel) else item for item in entry.value]
+            self._executor.submit(self._disk.save, scope, key[1], key[2], data, entry.etag)
+
+    def _iterPath(self, path: str):
+        for key, entry in self._entries.items():
+            if key[1] == path:
+                yield key, entry
+
+    def _invalidatePaths(self, paths: Optional[Tuple[str, ...]]):
+        self._generation += 1
+        for key, entry in self._entries.items():
+            if paths is None or key[1] in paths:
+                entry.fetched_at = float("-inf")
+                # 本地修改后必须等服务端确认，不再先返回旧数据
+                entry.from_disk = False
+
+    @staticmethod
+    def _matches(key: CacheKey, item: Any) -> bool:
+        """列表的筛选参数（如 customer_id、app_id）与实体字段一致"""
+        return all(getattr(item, name, None) == value for name, value in key[2])
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return list(value) if isinstance(value, list) else value
+
+
+# 全局实体缓存
+entity_cache = EntityCache(disk=DiskCache(settings.CACHE_DIR / "entities.sqlite3"))
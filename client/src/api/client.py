@@ -1,17 +1,37 @@
 """API 客户端封装"""
 
 import logging
+import random
+import threading
+import time
 import httpx
-from typing import TypeVar, Type, Optional, Any
+from typing import TypeVar, Type, Optional, Any, Tuple
 from pydantic import BaseModel
 
-from app.config import user_config
+from core.config import settings, user_config
+
+try:
+    import h2  # noqa: F401  HTTP/2 支持（可选依赖）
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
 
 T = TypeVar("T", bound=BaseModel)
 
 # API 客户端日志
 logger = logging.getLogger("api_client")
 
+# 只读请求方法：已发出后出错（如读取超时）也可以重发
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# 幂等请求方法：网关/服务返回暂不可用时可以重发
+_IDEMPOTENT_METHODS = _SAFE_METHODS | {"PUT", "DELETE"}
+# 网关/服务暂不可用，幂等请求稍后重试
+_RETRY_STATUS_CODES = frozenset({502, 503, 504})
+# 请求尚未发出的错误（连接失败、等待连接池超时）
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# 按服务端不可达处理的错误；RemoteProtocolError 常见于服务端已关闭的空闲连接
+_NETWORK_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
 
 class APIError(Exception):
     """API 错误"""
@@ -34,62 +54,84 @@ class ServerUnreachableError(Exception):
 
 
 class APIClient:
-    """HTTP API 客户端"""
+    """HTTP API 客户端
+
+    - 连接池大小和空闲连接保留时间见 settings.HTTP_*，并发请求复用已建立的连接
+    - 安装 h2 后对 HTTPS 服务器启用 HTTP/2，多个请求共用一条连接
+    - 令牌随每个请求设置，登录、刷新令牌不会重建客户端；令牌过期（401）时自动刷新后重发一次
+    - 按抖动的指数退避重试：连接未建立的请求都可重试；已发出后出错只重试只读请求；
+      502/503/504 只重试幂等请求。DELETE 读取超时时服务端可能已经删除，重发会得到 404，
+      还会让界面多等几个读取超时，所以不重试
+    """
 
     def __init__(self, base_url: str = None):
         self._base_url = base_url
         self._token: Optional[str] = None
         self._refresh_token: Optional[str] = None
         self._client: Optional[httpx.Client] = None
+        self._transport: Optional[httpx.BaseTransport] = None
+        # 请求可能来自异步 API 的多个工作线程，创建/替换 httpx 客户端时加锁
+        self._lock = threading.Lock()
+        # 多个请求同时遇到令牌过期时只刷新一次
+        self._refresh_lock = threading.Lock()
 
     @property
     def base_url(self) -> str:
         """获取当前服务器地址"""
         return self._base_url or user_config.server_url
 
-    def update_base_url(self, url: str):
-        """更新服务器地址"""
-        self._base_url = url.rstrip("/")
-        # 关闭旧客户端，下次使用时会创建新客户端
-        if self._client:
-            self._client.close()
-            self._client = None
+    def update_base_url(self, url: str, transport: Optional[httpx.BaseTransport] = None):
+        """更新服务器地址（地址和传输都未变化时保留现有连接）
+
+        Args:
+            url: 服务器地址
+            transport: 自定义传输，进程内服务器使用它直接调用服务端应用
+        """
+        url = url.rstrip("/")
+        with self._lock:
+            if url == self._base_url and transport is self._transport:
+                return
+            self._base_url = url
+            self._transport = transport
+            # 关闭旧客户端，下次使用时会创建新客户端
+            if self._client:
+                self._client.close()
+                self._client = None
 
     @property
     def client(self) -> httpx.Client:
         """获取 HTTP 客户端 (懒加载)"""
-        if self._client is None:
-            headers = {}
-            if self._token:
-                headers["Authorization"] = f"Bearer {self._token}"
-
-            # 设置更合理的超时：连接超时 5 秒，读取超时 30 秒
-            timeout = httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0)
-            self._client = httpx.Client(
-                base_url=self.base_url,
-                headers=headers,
-                timeout=timeout,
-            )
-        return self._client
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                # 设置更合理的超时：连接超时 5 秒，读取超时 30 秒
+                timeout = httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0)
+                limits = httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+                )
+                # 自定义传输（进程内服务器）不经过连接池，limits 和 http2 不起作用
+                self._client = httpx.Client(
+                    base_url=self.base_url,
+                    timeout=timeout,
+                    limits=limits,
+                    http2=settings.HTTP2_ENABLED and _HTTP2_AVAILABLE,
+                    transport=self._transport,
+                )
+            return self._client
 
     def set_token(self, access_token: str, refresh_token: str = None):
-        """设置认证令牌"""
+        """设置认证令牌（之后的请求使用新令牌，连接池不受影响）"""
         self._token = access_token
         self._refresh_token = refresh_token
 
-        # 更新客户端头部
-        if self._client:
-            self._client.headers["Authorization"] = f"Bearer {access_token}"
-        else:
-            # 触发客户端创建
-            _ = self.client
-
     def clear_token(self):
         """清除认证令牌"""
         self._token = None
         self._refresh_token = None
-        if self._client:
-            self._client.headers.pop("Authorization", None)
 
     def get_token(self) -> Optional[str]:
         """获取当前令牌"""
@@ -129,11 +171,76 @@ class APIClient:
             raise ServerUnreachableError("连接服务器超时，请检查网络连接")
         elif isinstance(e, httpx.ReadTimeout):
             raise ServerUnreachableError("服务器响应超时，请稍后重试")
-        elif isinstance(e, httpx.NetworkError):
+        elif isinstance(e, (httpx.NetworkError, httpx.RemoteProtocolError)):
             raise ServerUnreachableError(f"网络错误: {str(e)}")
         else:
             raise ServerUnreachableError(f"请求失败: {str(e)}")
 
+    def _request(self, method: str, path: str, headers: dict = None, **kwargs) -> httpx.Response:
+        """发送请求：附加令牌，令牌过期时刷新后重发，网络错误按退避重试
+
+        重试次数用完后网络错误转为 ServerUnreachableError。
+        """
+        safe = method in _SAFE_METHODS
+        idempotent = method in _IDEMPOTENT_METHODS
+        attempt = 0
+        refreshed = False
+        while True:
+            token = self._token
+            request_headers = dict(headers) if headers else {}
+            if token:
+                request_headers["Authorization"] = f"Bearer {token}"
+
+            try:
+                response = self.client.request(method, path, headers=request_headers, **kwargs)
+            except _NETWORK_ERRORS as e:
+                # 连接未建立时请求没有发出，任何请求都可以安全重试
+                if attempt < settings.HTTP_RETRIES and (safe or isinstance(e, _UNSENT_ERRORS)):
+                    self._backoff(attempt, method, path, e)
+                    attempt += 1
+                    continue
+                self._handle_request_error(e)
+
+            if response.status_code == 401 and token and not refreshed and self._refresh_access_token(token):
+                refreshed = True
+                continue
+            if response.status_code in _RETRY_STATUS_CODES and idempotent and attempt < settings.HTTP_RETRIES:
+                self._backoff(attempt, method, path, f"HTTP {response.status_code}")
+                attempt += 1
+                continue
+            return response
+
+    @staticmethod
+    def _backoff(attempt: int, method: str, path: str, reason: Any):
+        """指数退避，在 [0, 上限) 内随机取值，避免并发请求同时重试"""
+        delay = random.uniform(0, min(settings.HTTP_RETRY_BACKOFF_MAX, settings.HTTP_RETRY_BACKOFF * 2 ** attempt))
+        logger.warning(f"{method} {path} 失败（{reason}），{delay:.2f} 秒后第 {attempt + 1} 次重试")
+        time.sleep(delay)
+
+    def _refresh_access_token(self, stale_token: str) -> bool:
+        """用刷新令牌换取新令牌，返回是否有可用的新令牌
+
+        Args:
+            stale_token: 被服务端拒绝的令牌；其他线程已经换过令牌时直接使用新令牌
+        """
+        with self._refresh_lock:
+            if self._token != stale_token:
+                return self._token is not None
+            refresh_token = self._refresh_token
+            if not refresh_token:
+                return False
+            try:
+                response = self.client.post("/auth/refresh", params={"refresh_token": refresh_token})
+            except _NETWORK_ERRORS:
+                return False
+            if response.status_code != 200:
+                logger.info(f"刷新令牌失败: {response.status_code}")
+                return False
+            data = response.json()
+            self._token = data["access_token"]
+            self._refresh_token = data.get("refresh_token", refresh_token)
+            return True
+
     def ping(self) -> bool:
         """检测服务端是否可用"""
         try:
@@ -145,43 +252,44 @@ class APIClient:
 
     def get(self, path: str, params: dict = None) -> dict:
         """GET 请求"""
-        try:
-            response = self.client.get(path, params=params)
-            return self._handle_response(response)
-        except (httpx.ConnectError, httpx.TimeoutException, httpx.NetworkError) as e:
-            self._handle_request_error(e)
+        response = self._request("GET", path, params=params)
+        return self._handle_response(response)
 
-    def post(self, path: str, body: BaseModel = None, data: dict = None) -> dict:
+    def get_conditional(self, path: str, params: dict = None, etag: str = None) -> Tuple[Optional[Any], Optional[str]]:
+        """带 If-None-Match 的 GET 请求
+
+        Returns:
+            (响应数据, ETag)；服务端返回 304 时响应数据为 None
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        response = self._request("GET", path, params=params, headers=headers)
+        if response.status_code == 304:
+            return None, etag
+        return self._handle_response(response), response.headers.get("etag")
+
+    def post(self, path: str, body: BaseModel = None, data: dict = None, params: dict = None) -> dict:
         """POST 请求"""
-        try:
-            json_data = body.model_dump() if body else data
-            response = self.client.post(path, json=json_data)
-            return self._handle_response(response)
-        except (httpx.ConnectError, httpx.TimeoutException, httpx.NetworkError) as e:
-            self._handle_request_error(e)
+        json_data = body.model_dump() if body else data
+        response = self._request("POST", path, json=json_data, params=params)
+        return self._handle_response(response)
 
     def put(self, path: str, body: BaseModel = None, data: dict = None) -> dict:
         """PUT 请求"""
-        try:
-            json_data = body.model_dump() if body else data
-            response = self.client.put(path, json=json_data)
-            return self._handle_response(response)
-        except (httpx.ConnectError, httpx.TimeoutException, httpx.NetworkError) as e:
-            self._handle_request_error(e)
+        json_data = body.model_dump() if body else data
+        response = self._request("PUT", path, json=json_data)
+        return self._handle_response(response)
 
     def delete(self, path: str) -> dict:
         """DELETE 请求"""
-        try:
-            response = self.client.delete(path)
-            return self._handle_response(response)
-        except (httpx.ConnectError, httpx.TimeoutException, httpx.NetworkError) as e:
-            self._handle_request_error(e)
+        response = self._request("DELETE", path)
+        return self._handle_response(response)
 
     def close(self):
         """关闭客户端"""
-        if self._client:
-            self._client.close()
-            self._client = None
+        with self._lock:
+            if self._client:
+                self._client.close()
+                self._client = None
 
 
 # 全局 API 客户端实例
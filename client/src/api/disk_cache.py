@@ -0,0 +1,101 @@
+"""实体缓存的本地持久化
+
+把最近一次的矩阵、实验列表和客户/应用/模板层级保存在 CACHE_DIR 下的 SQLite 中，
+按服务器地址和用户区分。启动时页面先用这些数据渲染，再由 EntityCache 在后台按 ETag 重新验证。
+数据为 zlib 压缩的 JSON（服务端响应格式），读取时用与网络响应相同的解析函数。
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger("disk_cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    scope TEXT NOT NULL,
+    path TEXT NOT NULL,
+    params TEXT NOT NULL,
+    etag TEXT,
+    data BLOB NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (scope, path, params)
+)
+"""
+
+
+class DiskCache:
+    """SQLite 持久化存储（线程安全；出错时停用，不影响正常请求）"""
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._disabled = False
+
+    def load(self, scope: str, path: str, params: tuple) -> Optional[Tuple[Any, Optional[str]]]:
+        """读取 (响应数据, ETag)，不存在时返回 None"""
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT data, etag FROM entries WHERE scope = ? AND path = ? AND params = ?",
+                    (scope, path, self._paramsKey(params))
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._disable(e)
+                return None
+        if row is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(row[0])), row[1]
+        except (zlib.error, ValueError):
+            return None
+
+    def save(self, scope: str, path: str, params: tuple, data: Any, etag: Optional[str]):
+        """保存响应数据"""
+        blob = zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (scope, path, params, etag, data, saved_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (scope, path, self._paramsKey(params), etag, blob, time.time())
+                )
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._disabled:
+            return None
+        if self._conn is None:
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(self._path), check_same_thread=False, isolation_level=None)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(_SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                self._disable(e)
+        return self._conn
+
+    def _disable(self, error: Exception):
+        logger.warning(f"本地缓存不可用，已停用: {error}")
+        self._disabled = True
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _paramsKey(params: tuple) -> str:
+        return json.dumps(params, separators=(",", ":"))
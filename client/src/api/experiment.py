@@ -3,6 +3,9 @@
 from typing import List, Optional
 
 from .client import api_client, APIError
+from .cache import (
+    entity_cache, CUSTOMERS_PATH, APPS_PATH, TEMPLATES_PATH, EXPERIMENTS_PATH, MATRIX_PATH
+)
 from models.experiment import (
     CustomerResponse, CustomerCreateRequest, CustomerUpdateRequest,
     AppResponse, AppCreateRequest, AppUpdateRequest,
@@ -14,6 +17,8 @@ from models.experiment import (
     ObjectiveMetricsResponse, ObjectiveMetricsCreateRequest, ObjectiveMetricsUpdateRequest,
     MatrixResponse,
     TemplateVersionResponse, TemplateVersionCreateRequest, TemplateVersionUpdateRequest,
+    ExperimentFullResponse,
+    BatchOperation, BatchResponse,
 )
 
 
@@ -22,15 +27,16 @@ class CustomerAPI:
 
     @staticmethod
     def list() -> List[CustomerResponse]:
-        """获取客户列表"""
-        response = api_client.get("/experiments/customers")
-        return [CustomerResponse(**item) for item in response]
+        """获取客户列表（缓存）"""
+        return entity_cache.get(CUSTOMERS_PATH, parse=lambda response: [CustomerResponse(**item) for item in response])
 
     @staticmethod
     def create(data: CustomerCreateRequest) -> CustomerResponse:
         """创建客户"""
         response = api_client.post("/experiments/customers", data)
-        return CustomerResponse(**response)
+        customer = CustomerResponse(**response)
+        entity_cache.add(CUSTOMERS_PATH, customer)
+        return customer
 
     @staticmethod
     def get(customer_id: int) -> dict:
@@ -41,12 +47,16 @@ class CustomerAPI:
     def update(customer_id: int, data: CustomerUpdateRequest) -> CustomerResponse:
         """更新客户"""
         response = api_client.put(f"/experiments/customers/{customer_id}", data)
-        return CustomerResponse(**response)
+        customer = CustomerResponse(**response)
+        entity_cache.replace(CUSTOMERS_PATH, customer)
+        return customer
 
     @staticmethod
     def delete(customer_id: int) -> dict:
         """删除客户"""
-        return api_client.delete(f"/experiments/customers/{customer_id}")
+        result = api_client.delete(f"/experiments/customers/{customer_id}")
+        entity_cache.remove(CUSTOMERS_PATH, customer_id, cascade=(APPS_PATH, TEMPLATES_PATH))
+        return result
 
 
 class AppAPI:
@@ -54,16 +64,17 @@ class AppAPI:
 
     @staticmethod
     def list(customer_id: int = None) -> List[AppResponse]:
-        """获取应用列表"""
+        """获取应用列表（缓存）"""
         params = {"customer_id": customer_id} if customer_id else None
-        response = api_client.get("/experiments/apps", params=params)
-        return [AppResponse(**item) for item in response]
+        return entity_cache.get(APPS_PATH, params, parse=lambda response: [AppResponse(**item) for item in response])
 
     @staticmethod
     def create(data: AppCreateRequest) -> AppResponse:
         """创建应用"""
         response = api_client.post("/experiments/apps", data)
-        return AppResponse(**response)
+        app = AppResponse(**response)
+        entity_cache.add(APPS_PATH, app)
+        return app
 
     @staticmethod
     def get(app_id: int) -> dict:
@@ -74,12 +85,16 @@ class AppAPI:
     def update(app_id: int, data: AppUpdateRequest) -> AppResponse:
         """更新应用"""
         response = api_client.put(f"/experiments/apps/{app_id}", data)
-        return AppResponse(**response)
+        app = AppResponse(**response)
+        entity_cache.replace(APPS_PATH, app)
+        return app
 
     @staticmethod
     def delete(app_id: int) -> dict:
         """删除应用"""
-        return api_client.delete(f"/experiments/apps/{app_id}")
+        result = api_client.delete(f"/experiments/apps/{app_id}")
+        entity_cache.remove(APPS_PATH, app_id, cascade=(TEMPLATES_PATH,))
+        return result
 
 
 class TemplateAPI:
@@ -87,16 +102,19 @@ class TemplateAPI:
 
     @staticmethod
     def list(app_id: int = None) -> List[TemplateResponse]:
-        """获取模板列表"""
+        """获取模板列表（缓存）"""
         params = {"app_id": app_id} if app_id else None
-        response = api_client.get("/experiments/templates", params=params)
-        return [TemplateResponse(**item) for item in response]
+        return entity_cache.get(
+            TEMPLATES_PATH, params, parse=lambda response: [TemplateResponse(**item) for item in response]
+        )
 
     @staticmethod
     def create(data: TemplateCreateRequest) -> TemplateResponse:
         """创建模板"""
         response = api_client.post("/experiments/templates", data)
-        return TemplateResponse(**response)
+        template = TemplateResponse(**response)
+        entity_cache.add(TEMPLATES_PATH, template)
+        return template
 
     @staticmethod
     def get(template_id: int) -> dict:
@@ -107,12 +125,16 @@ class TemplateAPI:
     def update(template_id: int, data: TemplateUpdateRequest) -> TemplateResponse:
         """更新模板"""
         response = api_client.put(f"/experiments/templates/{template_id}", data)
-        return TemplateResponse(**response)
+        template = TemplateResponse(**response)
+        entity_cache.replace(TEMPLATES_PATH, template)
+        return template
 
     @staticmethod
     def delete(template_id: int) -> dict:
         """删除模板"""
-        return api_client.delete(f"/experiments/templates/{template_id}")
+        result = api_client.delete(f"/experiments/templates/{template_id}")
+        entity_cache.remove(TEMPLATES_PATH, template_id)
+        return result
 
 
 class ExperimentAPI:
@@ -125,19 +147,19 @@ class ExperimentAPI:
         template_id: int = None,
         status: str = None
     ) -> ExperimentListResponse:
-        """获取实验列表"""
+        """获取实验列表（缓存）"""
         params = {"page": page, "page_size": page_size}
         if template_id:
             params["template_id"] = template_id
         if status:
             params["status"] = status
-        response = api_client.get("/experiments", params=params)
-        return ExperimentListResponse(**response)
+        return entity_cache.get(EXPERIMENTS_PATH, params, parse=lambda response: ExperimentListResponse(**response))
 
     @staticmethod
     def create(data: ExperimentCreateRequest) -> ExperimentResponse:
         """创建实验"""
         response = api_client.post("/experiments", data)
+        entity_cache.invalidate(EXPERIMENTS_PATH, MATRIX_PATH)
         return ExperimentResponse(**response)
 
     @staticmethod
@@ -146,33 +168,43 @@ class ExperimentAPI:
         response = api_client.get(f"/experiments/{experiment_id}")
         return ExperimentResponse(**response)
 
+    @staticmethod
+    def get_full(experiment_id: int) -> ExperimentFullResponse:
+        """获取实验完整数据（关联模板、备注和版本列表）"""
+        response = api_client.get(f"/experiments/{experiment_id}/full")
+        return ExperimentFullResponse(**response)
+
     @staticmethod
     def update(experiment_id: int, data: ExperimentUpdateRequest) -> ExperimentResponse:
         """更新实验"""
         response = api_client.put(f"/experiments/{experiment_id}", data)
+        entity_cache.invalidate(EXPERIMENTS_PATH, MATRIX_PATH)
         return ExperimentResponse(**response)
 
     @staticmethod
     def delete(experiment_id: int) -> dict:
         """删除实验"""
-        return api_client.delete(f"/experiments/{experiment_id}")
+        result = api_client.delete(f"/experiments/{experiment_id}")
+        entity_cache.invalidate(EXPERIMENTS_PATH, MATRIX_PATH)
+        return result
 
     @staticmethod
     def get_matrix() -> MatrixResponse:
-        """获取客户矩阵数据"""
-        response = api_client.get("/experiments/matrix")
-        return MatrixResponse(**response)
+        """获取客户矩阵数据（缓存）"""
+        return entity_cache.get(MATRIX_PATH, parse=lambda response: MatrixResponse(**response))
 
     @staticmethod
     def link_templates(experiment_id: int, data: ExperimentTemplateLinkRequest) -> ExperimentWithTemplatesResponse:
         """关联模板到实验"""
         response = api_client.post(f"/experiments/{experiment_id}/templates", data)
+        entity_cache.invalidate(EXPERIMENTS_PATH, MATRIX_PATH)
         return ExperimentWithTemplatesResponse(**response)
 
     @staticmethod
     def unlink_template(experiment_id: int, template_id: int) -> ExperimentWithTemplatesResponse:
         """解除实验与模板的关联"""
         response = api_client.delete(f"/experiments/{experiment_id}/templates/{template_id}")
+        entity_cache.invalidate(EXPERIMENTS_PATH, MATRIX_PATH)
         return ExperimentWithTemplatesResponse(**response)
 
     @staticmethod
@@ -236,6 +268,12 @@ class TemplateVersionAPI:
         response = api_client.get(f"/experiments/{experiment_id}/templates/{template_id}/versions")
         return [TemplateVersionResponse(**item) for item in response]
 
+    @staticmethod
+    def get(version_id: int) -> TemplateVersionResponse:
+        """获取模板版本（含模板配置）"""
+        response = api_client.get(f"/experiments/versions/{version_id}")
+        return TemplateVersionResponse(**response)
+
     @staticmethod
     def create(experiment_id: int, template_id: int, data: TemplateVersionCreateRequest) -> TemplateVersionResponse:
         """创建模板版本"""
@@ -265,6 +303,24 @@ class TemplateVersionAPI:
         return api_client.put(f"/experiments/{experiment_id}/templates/{template_id}/notes", {"notes": notes})
 
 
+class BatchAPI:
+    """批量操作 API"""
+
+    @staticmethod
+    def execute(operations: List[BatchOperation]) -> BatchResponse:
+        """在一个事务中执行多个子操作，任一失败则整体回滚并抛出 APIError"""
+        response = api_client.post("/batch", data={"operations": [op.model_dump() for op in operations]})
+        # 批量操作可能涉及任意实体，全部重新验证
+        entity_cache.invalidate()
+        result = BatchResponse(**response)
+        if not result.committed:
+            error = result.error
+            detail = error.detail if error else None
+            message = detail if isinstance(detail, str) else "批量操作失败"
+            raise APIError(message, error.status_code if error else None, detail)
+        return result
+
+
 # 便捷访问
 customer_api = CustomerAPI()
 app_api = AppAPI()
@@ -272,3 +328,4 @@ template_api = TemplateAPI()
 experiment_api = ExperimentAPI()
 metrics_api = ObjectiveMetricsAPI()
 version_api = TemplateVersionAPI()
+batch_api = BatchAPI()
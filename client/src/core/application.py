@@ -13,10 +13,11 @@ from qfluentwidgets import setThemeColor, setTheme, Theme, InfoBar, InfoBarPosit
 
 from voidview_shared import setup_logging, get_logger
 
-from app.config import user_config
-from app.app_state import app_state
-from app.local_server import local_server
-from api import auth_api, api_client
+from core.config import settings, user_config
+from core.app_state import app_state
+from core.local_server import local_server
+from core.inprocess_server import inprocess_server
+from api import auth_api, api_client, async_api
 from ui import LoginDialog, MainWindow, ChangePasswordDialog, ServerConfigDialog
 from utils import get_logo_path
 
@@ -105,6 +106,13 @@ def _set_windows_app_id():
             pass  # 忽略旧版 Windows 不支持的情况
 
 
+def _login_local_root():
+    """本地模式：登录 root 账号并返回当前用户（在工作线程执行）"""
+    from voidview_shared.constants import DEFAULT_ROOT_USERNAME, DEFAULT_ROOT_PASSWORD
+    auth_api.login(DEFAULT_ROOT_USERNAME, DEFAULT_ROOT_PASSWORD)
+    return auth_api.get_current_user()
+
+
 class ServerCheckWorker(QThread):
     """服务端健康检查工作线程"""
     finished = Signal(bool)  # 检查完成，传递是否成功
@@ -125,8 +133,15 @@ class LocalServerStartWorker(QThread):
     failed = Signal(str)   # 启动失败，传递错误信息
 
     def run(self):
-        """启动本地服务器"""
+        """启动本地服务器（优先进程内，失败时回退到子进程）"""
         try:
+            if settings.LOCAL_SERVER_IN_PROCESS and inprocess_server.start():
+                if inprocess_server.wait_for_ready(timeout=15.0):
+                    self.success.emit(inprocess_server.url)
+                    return
+                logger.warning("进程内服务器就绪超时，改用子进程模式")
+                inprocess_server.stop()
+
             if local_server.start():
                 if local_server.wait_for_ready(timeout=15.0):
                     self.success.emit(local_server.url)
@@ -359,31 +374,36 @@ class VoidViewApplication:
         """本地服务器启动成功"""
         logger.info(f"本地服务器已启动: {server_url}")
 
-        # 更新配置
-        user_config.set_server_url(server_url)
-        api_client.update_base_url(server_url)
+        # 更新配置（进程内服务器的地址只在本次运行有效，不写入用户配置）
+        if inprocess_server.is_running:
+            api_client.update_base_url(server_url, transport=inprocess_server.transport)
+        else:
+            user_config.set_server_url(server_url)
+            api_client.update_base_url(server_url)
 
         # 关闭配置对话框
         if self._serverConfigDialog:
             self._serverConfigDialog.close()
             self._serverConfigDialog = None
 
-        # 本地模式：自动登录 root 账号
-        try:
-            from voidview_shared.constants import DEFAULT_ROOT_USERNAME, DEFAULT_ROOT_PASSWORD
-            auth_api.login(DEFAULT_ROOT_USERNAME, DEFAULT_ROOT_PASSWORD)
-            user = auth_api.get_current_user()
-            app_state.set_user(user)
-            logger.info(f"本地模式自动登录成功: {user.username}")
-
-            # 直接显示主窗口
-            self._mainWindow = MainWindow()
-            self._mainWindow.logoutRequested.connect(self.onLogout)
-            self._mainWindow.show()
-        except Exception as e:
-            logger.error(f"本地模式自动登录失败: {e}")
-            # 回退到显示登录窗口
-            self.showLogin()
+        # 本地模式：后台自动登录 root 账号
+        async_api.submit(_login_local_root).then(self._onLocalLoginSucceeded, self._onLocalLoginFailed)
+
+    def _onLocalLoginSucceeded(self, user):
+        """本地模式自动登录成功"""
+        app_state.set_user(user)
+        logger.info(f"本地模式自动登录成功: {user.username}")
+
+        # 直接显示主窗口
+        self._mainWindow = MainWindow()
+        self._mainWindow.logoutRequested.connect(self.onLogout)
+        self._mainWindow.show()
+
+    def _onLocalLoginFailed(self, error: Exception):
+        """本地模式自动登录失败"""
+        logger.error(f"本地模式自动登录失败: {error}")
+        # 回退到显示登录窗口
+        self.showLogin()
 
     def onLocalServerFailed(self, error: str):
         """本地服务器启动失败"""
@@ -433,6 +453,8 @@ class VoidViewApplication:
         """用户退出登录"""
         logger.info("用户退出登录")
         # 停止本地服务器（如果正在运行）
+        if inprocess_server.is_running:
+            inprocess_server.stop()
         if local_server.is_running:
             local_server.stop()
         self.showLogin()
@@ -457,6 +479,8 @@ class VoidViewApplication:
         logger.info("应用正在退出，清理资源...")
 
         # 停止本地服务器（如果正在运行）
+        if inprocess_server.is_running:
+            inprocess_server.stop()
         if local_server.is_running:
             logger.info("停止本地服务器...")
             local_server.stop()
@@ -19,6 +19,23 @@ class Settings(BaseSettings):
     SCREENSHOTS_DIR: Path = PROJECT_ROOT / "client" / "data" / "screenshots"
     EXPORTS_DIR: Path = PROJECT_ROOT / "client" / "data" / "exports"
 
+    # 本地模式：优先在客户端进程内运行服务端，失败时回退到子进程
+    LOCAL_SERVER_IN_PROCESS: bool = True
+
+    # 实体缓存（客户/应用/模板、实验列表、矩阵）的新鲜期（秒），过期后按 ETag 重新验证
+    ENTITY_CACHE_TTL: float = 60.0
+
+    # HTTP 连接池：异步 API 的多个工作线程并发请求时复用空闲连接
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0  # 空闲连接保留时间（秒）
+    # HTTP/2 多路复用，需要安装 h2（可选依赖 http2），未安装时使用 HTTP/1.1
+    HTTP2_ENABLED: bool = True
+    # 网络错误重试：次数、首次退避（秒）、退避上限（秒），退避时间随机抖动
+    HTTP_RETRIES: int = 2
+    HTTP_RETRY_BACKOFF: float = 0.2
+    HTTP_RETRY_BACKOFF_MAX: float = 2.0
+
     # UI 配置
     WINDOW_WIDTH: int = 1280
     WINDOW_HEIGHT: int = 800
@@ -0,0 +1,213 @@
+"""进程内服务器 - 本地模式下在客户端进程中直接运行服务端应用
+
+与 LocalServerManager 启动子进程不同，这里把服务端 FastAPI 应用导入到客户端进程，
+在后台线程的事件循环上运行，APIClient 通过 InProcessTransport 直接调用 ASGI 应用，
+不监听端口、不经过网络：省去第二个 Python 解释器的启动时间和内存。
+
+服务端配置在首次导入时读取环境变量，同一进程内只能使用一个数据目录。
+"""
+
+import asyncio
+import concurrent.futures
+import importlib
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from voidview_shared import get_logger
+
+from .local_server import default_data_dir
+
+logger = get_logger()
+
+# 进程内服务器的虚拟地址，只用于拼接请求 URL，不会真正连接
+INPROCESS_BASE_URL = "http://voidview.local/api/v1"
+
+
+def _add_server_paths():
+    """把服务端代码和 shared 模块加入 sys.path（与 embedded_server/main.py 一致）"""
+    if getattr(sys, 'frozen', False):
+        # PyInstaller 打包模式
+        base_path = Path(sys._MEIPASS)
+        paths = [base_path / "server", base_path]
+    else:
+        # 开发模式
+        project_root = Path(__file__).parent.parent.parent.parent
+        paths = [project_root / "server", project_root / "shared" / "src"]
+
+    for path in paths:
+        if path.exists() and str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+
+
+class InProcessTransport(httpx.BaseTransport):
+    """httpx 同步传输：把请求交给后台事件循环上的 ASGI 应用处理"""
+
+    def __init__(self, app, loop: asyncio.AbstractEventLoop):
+        # 应用异常按真实服务器的行为返回 500，而不是在客户端抛出
+        self._asgi = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        self._loop = loop
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._loop.is_closed() or not self._loop.is_running():
+            raise httpx.ConnectError("进程内服务器未运行", request=request)
+
+        # 进程内没有网络传输，压缩只会白白消耗 CPU
+        request.headers["Accept-Encoding"] = "identity"
+        request.read()
+
+        timeout = request.extensions.get("timeout", {}).get("read")
+        future = asyncio.run_coroutine_threadsafe(self._handle(request), self._loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise httpx.ReadTimeout("服务器响应超时", request=request)
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        response = await self._asgi.handle_async_request(request)
+        content = await response.aread()
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            content=content,
+            request=request,
+        )
+
+
+class InProcessServer:
+    """进程内服务器管理器，接口与 LocalServerManager 保持一致"""
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport: Optional[InProcessTransport] = None
+        self._shutdown: Optional[asyncio.Event] = None
+        # 应用生命周期启动完成（或失败）时置位
+        self._started = threading.Event()
+        self._data_dir: Optional[Path] = None
+
+    @property
+    def is_running(self) -> bool:
+        """检查服务器是否在运行"""
+        return self._thread is not None and self._thread.is_alive() and self._transport is not None
+
+    @property
+    def url(self) -> Optional[str]:
+        """获取服务器 URL"""
+        return INPROCESS_BASE_URL if self.is_running else None
+
+    @property
+    def transport(self) -> Optional[InProcessTransport]:
+        """供 APIClient 使用的传输"""
+        return self._transport
+
+    def start(self, data_dir: Optional[Path] = None) -> bool:
+        """在客户端进程内启动服务端应用
+
+        Args:
+            data_dir: 数据目录，None 则使用默认目录
+
+        Returns:
+            是否启动成功（导入服务端失败时返回 False，由调用方回退到子进程模式）
+        """
+        if self.is_running:
+            logger.warning("进程内服务器已在运行中")
+            return True
+
+        self._data_dir = data_dir or default_data_dir()
+        self._data_dir.mkdir(parents=True, exist_ok=True)
+
+        # 服务端 config 导入时读取：存储目录与子进程模式相同，日志由客户端配置
+        os.environ.update({
+            "STORAGE_PATH": str(self._data_dir / "storage"),
+            "SETUP_LOGGING": "false",
+        })
+        _add_server_paths()
+
+        try:
+            app = importlib.import_module("app.main").app
+        except Exception as e:
+            logger.warning(f"无法在进程内加载服务端: {e}")
+            return False
+
+        self._started.clear()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, args=(app,), name="inprocess-server", daemon=True
+        )
+        self._thread.start()
+
+        self._started.wait(timeout=30)
+        if not self.is_running:
+            logger.error("进程内服务器启动失败")
+            self.stop()
+            return False
+
+        logger.info(f"进程内服务器已启动，数据目录: {self._data_dir}")
+        return True
+
+    def _run(self, app):
+        """后台线程：运行事件循环直到 stop()"""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve(app))
+        finally:
+            self._loop.close()
+
+    async def _serve(self, app):
+        """执行应用生命周期（启动、初始化 root 账号、后台预热），等待关闭信号"""
+        self._shutdown = asyncio.Event()
+        try:
+            async with app.router.lifespan_context(app):
+                self._transport = InProcessTransport(app, self._loop)
+                self._started.set()
+                await self._shutdown.wait()
+        except Exception:
+            logger.exception("进程内服务器运行出错")
+        finally:
+            self._transport = None
+            self._started.set()
+
+    def stop(self):
+        """停止进程内服务器"""
+        if self._thread is None:
+            return
+
+        logger.info("正在停止进程内服务器...")
+        if self._shutdown is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._shutdown.set)
+        self._thread.join(timeout=5)
+        if self._thread.is_alive():
+            logger.warning("进程内服务器未在超时内退出")
+
+        self._thread = None
+        self._shutdown = None
+        logger.info("进程内服务器已停止")
+
+    def wait_for_ready(self, timeout: float = 10.0) -> bool:
+        """等待服务器就绪（存储预热完成）
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            服务器是否就绪
+        """
+        if not self.is_running:
+            return False
+
+        from app.core.readiness import wait_ready
+        if not wait_ready(timeout):
+            return False
+
+        logger.info("进程内服务器已就绪")
+        return True
+
+
+# 全局进程内服务器管理器
+inprocess_server = InProcessServer()
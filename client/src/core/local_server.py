@@ -9,7 +9,7 @@ import threading
 from pathlib import Path
 from typing import Optional, TextIO
 
-from voidview_shared import get_logger
+from voidview_shared import get_logger, SERVER_READY_MARKER
 
 logger = get_logger()
 
@@ -44,12 +44,23 @@ def find_free_port(min_port: int = 1024, max_port: int = 65535, max_attempts: in
     raise RuntimeError(f"无法找到可用端口 (尝试了 {max_attempts} 个随机端口)")
 
 
-def _log_stream(stream, log_file: Optional[TextIO] = None):
+def default_data_dir() -> Path:
+    """本地模式默认数据目录"""
+    if sys.platform == "win32":
+        return Path.home() / "AppData" / "Local" / "VoidView" / "data"
+    elif sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / "VoidView" / "data"
+    else:
+        return Path.home() / ".local" / "share" / "VoidView" / "data"
+
+
+def _log_stream(stream, log_file: Optional[TextIO] = None, ready_event: Optional[threading.Event] = None):
     """后台线程中记录子进程输出
 
     Args:
         stream: 子进程的 stdout 或 stderr 流
         log_file: 可选的日志文件句柄，如果提供则写入文件
+        ready_event: 可选，读到服务端就绪握手行时置位
     """
     try:
         for line in iter(stream.readline, b''):
@@ -62,6 +73,9 @@ def _log_stream(stream, log_file: Optional[TextIO] = None):
                 # 去除末尾的空白字符（包括 \r\n 或 \n），然后统一添加换行
                 clean_line = clean_line.rstrip() + '\n'
 
+                if ready_event is not None and clean_line.startswith(SERVER_READY_MARKER):
+                    ready_event.set()
+
                 # 写入独立的服务器日志文件
                 if log_file and not log_file.closed:
                     try:
@@ -83,6 +97,9 @@ class LocalServerManager:
         self._port: Optional[int] = None
         self._data_dir: Optional[Path] = None
         self._log_file: Optional[TextIO] = None
+        # 就绪信号：stdout 握手行置位事件，同时写入就绪文件（两者任一到达即就绪）
+        self._ready_event = threading.Event()
+        self._ready_file: Optional[Path] = None
 
     def _get_log_file_path(self) -> Path:
         """获取服务器日志文件路径"""
@@ -143,25 +160,27 @@ class LocalServerManager:
             self._port = port
 
         # 确定数据目录
-        if data_dir is None:
-            if sys.platform == "win32":
-                self._data_dir = Path.home() / "AppData" / "Local" / "VoidView" / "data"
-            elif sys.platform == "darwin":
-                self._data_dir = Path.home() / "Library" / "Application Support" / "VoidView" / "data"
-            else:
-                self._data_dir = Path.home() / ".local" / "share" / "VoidView" / "data"
-        else:
-            self._data_dir = data_dir
+        self._data_dir = data_dir or default_data_dir()
 
         # 确保数据目录存在
         self._data_dir.mkdir(parents=True, exist_ok=True)
 
+        # 就绪文件按端口区分，启动前清除上次遗留的文件
+        self._ready_event.clear()
+        self._ready_file = self._data_dir / f"server-{self._port}.ready"
+        self._ready_file.unlink(missing_ok=True)
+
         # 设置环境变量
         env = {
             **subprocess.os.environ,
             "DATABASE_URL": f"sqlite+aiosqlite:///{self._data_dir / 'voidview.db'}",
             "STORAGE_PATH": str(self._data_dir / "storage"),
             "VOIDVIEW_DATA_DIR": str(self._data_dir),
+            "READY_HANDSHAKE": "true",
+            "READY_FILE": str(self._ready_file),
+            "PYTHONUNBUFFERED": "1",
+            # 进程内启动失败后回退到这里时，环境中会残留进程内模式设置的 false
+            "SETUP_LOGGING": "true",
         }
 
         # 查找服务器模块路径
@@ -194,8 +213,7 @@ class LocalServerManager:
             # 开发模式: 使用项目中的服务器
             logger.info(f"使用开发模式启动服务器，目录: {server_dir}")
             cmd = [
-                sys.executable, "-m", "uvicorn",
-                "app.main:app",
+                sys.executable, "-m", "app.runner",
                 "--host", "127.0.0.1",
                 "--port", str(self._port),
             ]
@@ -231,7 +249,7 @@ class LocalServerManager:
         # 启动后台线程记录子进程输出到独立日志文件
         threading.Thread(
             target=_log_stream,
-            args=(self._process.stdout, self._log_file),
+            args=(self._process.stdout, self._log_file, self._ready_event),
             daemon=True
         ).start()
         threading.Thread(
@@ -240,12 +258,15 @@ class LocalServerManager:
             daemon=True
         ).start()
 
-        # 等待服务器启动
+        # 进程立即退出（如端口被占用、依赖缺失）视为启动失败，就绪由 wait_for_ready 等待
         logger.info(f"本地服务器启动中，端口: {self._port}")
-        time.sleep(2)
+        try:
+            self._process.wait(timeout=0.2)
+        except subprocess.TimeoutExpired:
+            pass
 
         if self.is_running:
-            logger.info(f"本地服务器已启动: {self.url}")
+            logger.info(f"本地服务器进程已启动: {self.url}")
             return True
         else:
             logger.error("本地服务器启动失败")
@@ -286,25 +307,32 @@ class LocalServerManager:
     def wait_for_ready(self, timeout: float = 10.0) -> bool:
         """等待服务器就绪
 
+        服务端存储预热完成后在 stdout 输出握手行并写入就绪文件，收到任一信号立即返回；
+        服务端先监听端口再启动应用，收到信号时端口一定可以连接。
+
         Args:
             timeout: 超时时间（秒）
 
         Returns:
             服务器是否就绪
         """
-        import httpx
-
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                response = httpx.get(f"http://127.0.0.1:{self._port}/health", timeout=1.0)
-                if response.status_code == 200:
-                    return True
-            except:
-                pass
-            time.sleep(0.5)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            # 短间隔等待握手事件，期间顺带检查就绪文件和进程是否已退出
+            if self._ready_event.wait(timeout=0.05):
+                break
+            if self._ready_file is not None and self._ready_file.exists():
+                break
+            if not self.is_running:
+                logger.error("本地服务器进程已退出")
+                return False
+        else:
+            return False
 
-        return False
+        if self._ready_file is not None:
+            self._ready_file.unlink(missing_ok=True)
+        logger.info(f"本地服务器已就绪: {self.url}")
+        return True
 
 
 # 全局本地服务器管理器
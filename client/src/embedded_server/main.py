@@ -34,7 +34,6 @@ if _shared_dir.exists():
 
 def main():
     """启动嵌入式服务器"""
-    import uvicorn
     from voidview_shared import setup_logging, get_logger
 
     parser = argparse.ArgumentParser(description="VoidView 嵌入式服务器")
@@ -56,13 +55,9 @@ def main():
     logger = get_logger()
     logger.info(f"嵌入式服务器启动，路径: {_server_dir}")
 
-    # 启动服务器
-    uvicorn.run(
-        "app.main:app",
-        host=args.host,
-        port=args.port,
-        log_level="info",
-    )
+    # 启动服务器（先监听端口再启动应用，就绪信号发出时端口已可连接）
+    from app.runner import run
+    run(args.host, args.port, log_level="info")
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "shared" / "src"))
 
-from app.application import VoidViewApplication
+from core.application import VoidViewApplication
 
 
 def main():
@@ -1,7 +1,7 @@
 """实验相关模型"""
 
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict, Union
 
 from pydantic import BaseModel, Field
 
@@ -282,14 +282,13 @@ class ObjectiveMetricsUpdateRequest(BaseModel):
 
 # ============ TemplateVersion ============
 
-class TemplateVersionResponse(BaseModel):
-    """模板版本响应模型"""
+class TemplateVersionHeader(BaseModel):
+    """模板版本概要模型（不含模板配置）"""
     id: int
     experiment_id: int
     template_id: int
     name: str
     notes: str = ""
-    template_content: str = ""
     order_index: int
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -298,6 +297,25 @@ class TemplateVersionResponse(BaseModel):
         from_attributes = True
 
 
+class TemplateVersionResponse(TemplateVersionHeader):
+    """模板版本响应模型"""
+    template_content: str = ""
+
+
+class ExperimentTemplateDetail(BaseModel):
+    """实验关联模板详情模型"""
+    template_id: int
+    template_name: Optional[str] = None
+    path: str  # 客户/APP/模板
+    notes: str = ""
+    versions: List[TemplateVersionHeader] = []  # 模板配置按需用 version_api.get 获取
+
+
+class ExperimentFullResponse(ExperimentResponse):
+    """实验完整数据模型（实验 + 关联模板 + 备注 + 版本）"""
+    templates: List[ExperimentTemplateDetail] = []
+
+
 class TemplateVersionCreateRequest(BaseModel):
     """创建模板版本请求"""
     name: str = Field(..., min_length=1, max_length=100)
@@ -310,3 +328,35 @@ class TemplateVersionUpdateRequest(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     notes: Optional[str] = None
     template_content: Optional[str] = None
+
+
+# ============ Batch ============
+
+class BatchOperation(BaseModel):
+    """批量子操作，id/data 中的 "$<序号>.<字段>" 引用前面操作的结果"""
+    resource: str  # customer / app / template / experiment / link / version
+    action: str  # create / update / delete
+    id: Optional[Union[int, str]] = None
+    data: Dict[str, Any] = {}
+
+
+class BatchOperationResult(BaseModel):
+    """批量子操作结果"""
+    index: int
+    resource: str
+    action: str
+    data: Optional[Dict[str, Any]] = None
+
+
+class BatchError(BaseModel):
+    """批量中失败的子操作"""
+    index: int
+    status_code: int
+    detail: Any = None
+
+
+class BatchResponse(BaseModel):
+    """批量响应"""
+    committed: bool
+    results: List[BatchOperationResult] = []
+    error: Optional[BatchError] = None
@@ -8,8 +8,8 @@ from qfluentwidgets import (
     InfoBar, InfoBarPosition, StrongBodyLabel
 )
 
-from app.config import settings
-from app.app_state import app_state
+from core.config import settings
+from core.app_state import app_state
 from api import auth_api
 
 
@@ -1,9 +1,10 @@
 """公共组件"""
 
 from .color_badge import ColorBadge, PRESET_COLORS, get_color_by_index
-from .waterfall_layout import WaterfallLayout
+from .waterfall_layout import WaterfallGeometry, WaterfallLayout
+from .waterfall_view import WaterfallView
 
 __all__ = [
     "ColorBadge", "PRESET_COLORS", "get_color_by_index",
-    "WaterfallLayout"
+    "WaterfallGeometry", "WaterfallLayout", "WaterfallView"
 ]
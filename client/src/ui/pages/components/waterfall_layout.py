@@ -1,13 +1,126 @@
 """瀑布流布局"""
 
+import heapq
+from bisect import bisect_right
+from typing import Callable, List, Tuple
+
 from PySide6.QtCore import Qt, QRect, QSize
-from PySide6.QtWidgets import QLayout, QSizePolicy, QWidgetItem
+from PySide6.QtWidgets import QLayout
+
+
+class WaterfallGeometry:
+    """瀑布流位置计算
+
+    按顺序把每项放到当前最短的列（用堆查找，相同高度时取靠左的列）。
+    计算结果缓存，只有列宽、列数、间距或项目变化时才重新计算；追加项目时只计算新增的项目。
+    """
+
+    def __init__(self, columns: int = 3, spacing: int = 16, min_column_width: int = 150):
+        self._columns = max(1, columns)
+        self._spacing = spacing
+        self._min_column_width = min_column_width
+        self._height_for: Callable[[int, int], int] = lambda index, width: 100
+        self._count = 0
+
+        self._valid = False
+        self._column_width = 0
+        self._rects: List[Tuple[int, int, int, int]] = []  # (x, y, w, h)
+        self._heap: List[Tuple[int, int]] = []             # (列高, 列号)
+        self._column_items: List[List[int]] = []           # 每列的项目（从上到下）
+        self._column_bottoms: List[List[int]] = []         # 每列项目的底边（递增）
+
+    def columns(self) -> int:
+        return self._columns
+
+    def setColumns(self, columns: int):
+        columns = max(1, columns)
+        if columns != self._columns:
+            self._columns = columns
+            self.invalidate()
+
+    def setSpacing(self, spacing: int):
+        if spacing != self._spacing:
+            self._spacing = spacing
+            self.invalidate()
+
+    def setItems(self, count: int, height_for: Callable[[int, int], int]):
+        """设置项目数和高度函数 height_for(索引, 列宽)"""
+        self._count = count
+        self._height_for = height_for
+        self.invalidate()
+
+    def appendItems(self, count: int):
+        """在末尾追加项目，已计算的位置保持不变"""
+        start = self._count
+        self._count += count
+        if self._valid:
+            self._place(start)
+
+    def invalidate(self):
+        self._valid = False
+
+    def columnWidth(self, width: int) -> int:
+        return max(self._min_column_width, (width - self._spacing * (self._columns - 1)) // self._columns)
+
+    def layout(self, width: int) -> int:
+        """按可用宽度计算位置（列宽不变时直接使用缓存），返回总高度"""
+        column_width = self.columnWidth(width)
+        if not self._valid or column_width != self._column_width:
+            self._column_width = column_width
+            self._rects = []
+            self._heap = [(0, column) for column in range(self._columns)]
+            self._column_items = [[] for _ in range(self._columns)]
+            self._column_bottoms = [[] for _ in range(self._columns)]
+            self._valid = True
+            self._place(0)
+        return self.height()
+
+    def height(self) -> int:
+        if not self._rects:
+            return 0
+        return max(height for height, _ in self._heap)
+
+    def count(self) -> int:
+        return self._count
+
+    def itemRect(self, index: int) -> QRect:
+        return QRect(*self._rects[index])
+
+    def itemsIn(self, top: int, bottom: int) -> List[int]:
+        """与 [top, bottom) 相交的项目，按索引排序"""
+        indices = []
+        for items, bottoms in zip(self._column_items, self._column_bottoms):
+            start = bisect_right(bottoms, top)
+            for i in range(start, len(items)):
+                index = items[i]
+                if self._rects[index][1] >= bottom:
+                    break
+                indices.append(index)
+        indices.sort()
+        return indices
+
+    def _place(self, start: int):
+        column_width = self._column_width
+        spacing = self._spacing
+        heap = self._heap
+        for index in range(start, self._count):
+            column_height, column = heap[0]
+            item_height = self._height_for(index, column_width)
+            # 确保最小高度
+            if item_height <= 0:
+                item_height = 100
+            self._rects.append((column * (column_width + spacing), column_height, column_width, item_height))
+            self._column_items[column].append(index)
+            self._column_bottoms[column].append(column_height + item_height)
+            heapq.heapreplace(heap, (column_height + item_height + spacing, column))
 
 
 class WaterfallLayout(QLayout):
     """瀑布流布局
 
     将子组件按瀑布流方式排列，每列高度自动平衡。
+    位置由 WaterfallGeometry 计算并缓存，宽度或子组件变化时才重新计算。
+    子组件很多时使用 WaterfallView，只为可见项创建控件。
     """
 
     def __init__(self, parent=None, columns: int = 3, spacing: int = 16):
@@ -15,10 +128,12 @@ class WaterfallLayout(QLayout):
         self._columns = columns
         self._spacing = spacing
         self._items = []
-        self._column_heights = [0] * columns
+        self._geometry = WaterfallGeometry(columns, spacing)
+        self._geometry.setItems(0, self._itemHeight)
 
     def addItem(self, item):
         self._items.append(item)
+        self._geometry.appendItems(1)
 
     def count(self):
         return len(self._items)
@@ -30,7 +145,9 @@ class WaterfallLayout(QLayout):
 
     def takeAt(self, index):
         if 0 <= index < len(self._items):
-            return self._items.pop(index)
+            item = self._items.pop(index)
+            self._geometry.setItems(len(self._items), self._itemHeight)
+            return item
         return None
 
     def expandingDirections(self):
@@ -46,6 +163,11 @@ class WaterfallLayout(QLayout):
         super().setGeometry(rect)
         self._doLayout(rect, True)
 
+    def invalidate(self):
+        # 子组件的 sizeHint 变化时 Qt 会调用 invalidate
+        self._geometry.invalidate()
+        super().invalidate()
+
     def sizeHint(self):
         return self.minimumSize()
 
@@ -59,13 +181,14 @@ class WaterfallLayout(QLayout):
     def setColumns(self, columns: int):
         """设置列数"""
         self._columns = max(1, columns)
-        self._column_heights = [0] * self._columns
+        self._geometry.setColumns(self._columns)
         self.invalidate()
         self.update()
 
     def setSpacing(self, spacing: int):
         """设置间距"""
         self._spacing = spacing
+        self._geometry.setSpacing(spacing)
         self.invalidate()
         self.update()
 
@@ -75,49 +198,19 @@ class WaterfallLayout(QLayout):
             item = self._items.pop()
             if item.widget():
                 item.widget().deleteLater()
-        self._column_heights = [0] * self._columns
+        self._geometry.setItems(0, self._itemHeight)
         self.invalidate()
 
+    def _itemHeight(self, index: int, width: int) -> int:
+        return self._items[index].sizeHint().height()
+
     def _doLayout(self, rect, apply_geometry):
         """执行布局"""
-        if not self._items:
+        if not self._items or rect.width() <= 0:
             return 0
 
-        x = rect.x()
-        y = rect.y()
-        width = rect.width()
-
-        if width <= 0:
-            return 0
-
-        # 计算每列宽度
-        total_spacing = self._spacing * (self._columns - 1)
-        column_width = max(150, (width - total_spacing) // self._columns)
-
-        # 重置列高度
-        self._column_heights = [0] * self._columns
-
-        for item in self._items:
-            # 找到最短的列
-            min_height = min(self._column_heights)
-            min_column = self._column_heights.index(min_height)
-
-            # 计算位置
-            item_x = x + min_column * (column_width + self._spacing)
-            item_y = y + self._column_heights[min_column]
-
-            # 获取项目尺寸
-            item_size = item.sizeHint()
-            item_height = item_size.height()
-
-            # 确保最小高度
-            if item_height <= 0:
-                item_height = 100
-
-            if apply_geometry:
-                item.setGeometry(QRect(item_x, item_y, column_width, item_height))
-
-            # 更新列高度
-            self._column_heights[min_column] += item_height + self._spacing
-
-        return max(self._column_heights) if self._column_heights else 0
+        height = self._geometry.layout(rect.width())
+        if apply_geometry:
+            for i, item in enumerate(self._items):
+                item.setGeometry(self._geometry.itemRect(i).translated(rect.x(), rect.y()))
+        return height
@@ -0,0 +1,117 @@
+"""虚拟化瀑布流视图"""
+
+from typing import Dict, List
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget
+from qfluentwidgets import SmoothScrollArea
+
+from .waterfall_layout import WaterfallGeometry
+
+
+class WaterfallView(SmoothScrollArea):
+    """虚拟化瀑布流视图
+
+    只为视口内（及上下预留区域）的项目创建控件，滚出的控件放回池中，绑定到新进入的项目上复用。
+    项目高度由 itemHeight 按列宽给出，不需要创建控件；位置由 WaterfallGeometry 计算并缓存。
+
+    子类实现:
+        createItemWidget(parent) -> QWidget
+        bindItemWidget(widget, index)
+        itemHeight(index, column_width) -> int
+    """
+
+    OVERSCAN = 0.5  # 视口上下各多准备半屏
+
+    def __init__(self, parent=None, columns: int = 3, spacing: int = 16, min_column_width: int = 150):
+        super().__init__(parent)
+        self._geometry = WaterfallGeometry(columns, spacing, min_column_width)
+        self._active: Dict[int, QWidget] = {}  # 项目索引 -> 控件
+        self._pool: List[QWidget] = []
+
+        self.setWidgetResizable(False)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.container = QWidget()
+        self.container.setStyleSheet("background: transparent;")
+        self.setWidget(self.container)
+        self.verticalScrollBar().valueChanged.connect(self._updateVisible)
+
+    # ============ 子类实现 ============
+
+    def createItemWidget(self, parent: QWidget) -> QWidget:
+        raise NotImplementedError
+
+    def bindItemWidget(self, widget: QWidget, index: int):
+        raise NotImplementedError
+
+    def itemHeight(self, index: int, column_width: int) -> int:
+        raise NotImplementedError
+
+    # ============ 公共方法 ============
+
+    def setItemCount(self, count: int):
+        """项目整体变化：重新计算位置，可见控件重新绑定"""
+        self._recycleAll()
+        self._geometry.setItems(count, self.itemHeight)
+        self._relayout()
+
+    def appendItems(self, count: int):
+        """在末尾追加项目，已有项目的位置不变"""
+        self._geometry.appendItems(count)
+        self._relayout()
+
+    def itemCount(self) -> int:
+        return self._geometry.count()
+
+    def setColumns(self, columns: int):
+        """设置列数"""
+        if columns != self._geometry.columns():
+            self._geometry.setColumns(columns)
+            self._relayout()
+
+    def setSpacing(self, spacing: int):
+        """设置间距"""
+        self._geometry.setSpacing(spacing)
+        self._relayout()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._relayout()
+
+    # ============ 内部方法 ============
+
+    def _relayout(self):
+        width = self.viewport().width()
+        if width <= 0:
+            return
+        height = self._geometry.layout(width)
+        self.container.resize(width, max(height, 1))
+        for index, widget in self._active.items():
+            widget.setGeometry(self._geometry.itemRect(index))
+        self._updateVisible()
+
+    def _updateVisible(self):
+        """按滚动位置回收滚出的控件，为新进入的项目绑定控件"""
+        viewport_height = self.viewport().height()
+        margin = int(viewport_height * self.OVERSCAN)
+        top = self.verticalScrollBar().value() - margin
+        visible = set(self._geometry.itemsIn(top, top + viewport_height + 2 * margin))
+
+        for index in [index for index in self._active if index not in visible]:
+            self._recycle(self._active.pop(index))
+
+        for index in sorted(visible - self._active.keys()):
+            widget = self._pool.pop() if self._pool else self.createItemWidget(self.container)
+            self.bindItemWidget(widget, index)
+            widget.setGeometry(self._geometry.itemRect(index))
+            widget.show()
+            self._active[index] = widget
+
+    def _recycle(self, widget: QWidget):
+        widget.hide()
+        self._pool.append(widget)
+
+    def _recycleAll(self):
+        for widget in self._active.values():
+            self._recycle(widget)
+        self._active.clear()
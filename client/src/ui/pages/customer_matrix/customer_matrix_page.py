@@ -1,14 +1,15 @@
 """客户矩阵页面"""
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout
 from qfluentwidgets import (
     SubtitleLabel, BodyLabel, TransparentToolButton, FluentIcon,
-    LineEdit, InfoBar, InfoBarPosition
+    LineEdit, ComboBox, InfoBar, InfoBarPosition
 )
 
-from api import experiment_api, APIError
+from api import experiment_api, async_api, error_message, MATRIX_PATH
 from models.experiment import MatrixResponse
+from .matrix_filter import MatrixFilter
 from .matrix_table_widget import MatrixTableWidget
 from .floating_toolbar import FloatingToolbar
 from .dialogs import AddEntityDialog, AddExperimentDialog
@@ -21,13 +22,24 @@ class CustomerMatrixPage(QWidget):
     experimentClicked = Signal(int)  # experiment_id
     rowClicked = Signal(int)  # 行点击（非多选模式下）
 
+    SEARCH_DEBOUNCE_MS = 200
+    STATUSES = [(None, "全部状态"), ("draft", "草稿"), ("running", "进行中"),
+                ("completed", "已完成"), ("archived", "已归档")]
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._matrix_data = MatrixResponse(rows=[], experiments=[])
         self._selected_rows = set()
         self._multi_select_mode = False
 
+        # 搜索防抖：停止输入一段时间后再筛选
+        self._searchTimer = QTimer(self)
+        self._searchTimer.setSingleShot(True)
+        self._searchTimer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._searchTimer.timeout.connect(self._applyFilters)
+
         self.setupUI()
+        async_api.cacheUpdated.connect(self._onCacheUpdated)
         self.loadData()
 
     def setupUI(self):
@@ -55,7 +67,7 @@ class CustomerMatrixPage(QWidget):
 
         # 搜索框
         self.searchEdit = LineEdit(self)
-        self.searchEdit.setPlaceholderText("搜索客户名、APP、模板...")
+        self.searchEdit.setPlaceholderText("搜索客户、APP、模板、实验（支持拼音首字母）...")
         self.searchEdit.setFixedWidth(280)
         self.searchEdit.setFixedHeight(32)
         self.searchEdit.textChanged.connect(self._onSearchChanged)
@@ -63,6 +75,47 @@ class CustomerMatrixPage(QWidget):
 
         layout.addLayout(headerLayout)
 
+        # 筛选栏
+        filterLayout = QHBoxLayout()
+
+        customerLabel = BodyLabel(self)
+        customerLabel.setText("客户:")
+        filterLayout.addWidget(customerLabel)
+
+        self.customerCombo = ComboBox(self)
+        self.customerCombo.setFixedWidth(150)
+        self.customerCombo.addItem("全部客户", userData=None)
+        self.customerCombo.currentIndexChanged.connect(self._applyFilters)
+        filterLayout.addWidget(self.customerCombo)
+
+        filterLayout.addSpacing(16)
+
+        experimentLabel = BodyLabel(self)
+        experimentLabel.setText("实验:")
+        filterLayout.addWidget(experimentLabel)
+
+        self.experimentCombo = ComboBox(self)
+        self.experimentCombo.setFixedWidth(180)
+        self.experimentCombo.addItem("全部实验", userData=None)
+        self.experimentCombo.currentIndexChanged.connect(self._applyFilters)
+        filterLayout.addWidget(self.experimentCombo)
+
+        filterLayout.addSpacing(16)
+
+        statusLabel = BodyLabel(self)
+        statusLabel.setText("状态:")
+        filterLayout.addWidget(statusLabel)
+
+        self.statusCombo = ComboBox(self)
+        self.statusCombo.setFixedWidth(120)
+        for status, text in self.STATUSES:
+            self.statusCombo.addItem(text, userData=status)
+        self.statusCombo.currentIndexChanged.connect(self._applyFilters)
+        filterLayout.addWidget(self.statusCombo)
+
+        filterLayout.addStretch()
+        layout.addLayout(filterLayout)
+
         # 表格区域
         self.matrixTable = MatrixTableWidget(self)
         self.matrixTable.rowSelectionChanged.connect(self._onRowSelectionChanged)
@@ -101,31 +154,76 @@ class CustomerMatrixPage(QWidget):
         pass
 
     def _onSearchChanged(self, text: str):
-        """搜索文本变化"""
-        self.matrixTable.applyFilter(text)
+        """搜索文本变化（防抖）"""
+        self._searchTimer.start()
+
+    def _applyFilters(self):
+        """按搜索词和筛选栏筛选"""
+        self._searchTimer.stop()
+        self.matrixTable.applyFilter(MatrixFilter(
+            text=self.searchEdit.text(),
+            status=self.statusCombo.currentData(),
+            experiment_id=self.experimentCombo.currentData(),
+            customer_id=self.customerCombo.currentData(),
+        ))
+
+    def _updateFilterOptions(self):
+        """按矩阵数据更新客户、实验筛选项，保留当前选择"""
+        customers = {}
+        for row in self._matrix_data.rows:
+            customers.setdefault(row.customer_id, row.customer_name)
+        experiments = [(e.id, e.name) for e in self._matrix_data.experiments]
+        self._resetCombo(self.customerCombo, "全部客户", list(customers.items()))
+        self._resetCombo(self.experimentCombo, "全部实验", experiments)
+
+    @staticmethod
+    def _resetCombo(combo: ComboBox, all_text: str, items: list):
+        """重新填充下拉框 [(id, 名称)]，原选中项不存在时选回第一项"""
+        current = combo.currentData()
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItem(all_text, userData=None)
+        for item_id, name in items:
+            combo.addItem(name, userData=item_id)
+        index = combo.findData(current) if current is not None else 0
+        combo.setCurrentIndex(max(index, 0))
+        combo.blockSignals(False)
 
     def loadData(self):
         """加载矩阵数据"""
-        try:
-            self._matrix_data = experiment_api.get_matrix()
-            self.matrixTable.setData(self._matrix_data.rows, self._matrix_data.experiments)
-            self._selected_rows.clear()
-            self.floatingToolbar.setHasSelection(False)
-        except APIError as e:
-            InfoBar.error(
-                title="加载失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
-            )
+        async_api.fetch(experiment_api.get_matrix, owner=self, group="matrix").then(
+            self._onMatrixLoaded, self._onLoadFailed
+        )
+
+    def _onMatrixLoaded(self, matrix_data):
+        """矩阵数据加载完成"""
+        self._matrix_data = matrix_data
+        # 增量更新：选择保留，选中行被删除时表格会发出 rowSelectionChanged
+        self.matrixTable.setData(self._matrix_data.rows, self._matrix_data.experiments)
+        self._updateFilterOptions()
+        self._applyFilters()
+
+    def _onLoadFailed(self, error: Exception):
+        """矩阵数据加载失败"""
+        InfoBar.error(
+            title="加载失败",
+            content=error_message(error),
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=3000,
+            parent=self
+        )
 
     def refresh(self):
         """刷新数据"""
         self.loadData()
 
+    def _onCacheUpdated(self, path: str):
+        """本地缓存的矩阵经服务端确认后有变化，重新加载"""
+        if path == MATRIX_PATH:
+            self.loadData()
+
     def _onRowSelectionChanged(self, selected_rows: set):
         """行选择变化"""
         self._selected_rows = selected_rows
@@ -159,29 +257,36 @@ class CustomerMatrixPage(QWidget):
         )
         if dialog.exec():
             data = dialog.getData()
-            try:
-                experiment = experiment_api.create(data)
-                InfoBar.success(
-                    title="成功",
-                    content=f"实验 '{data.name}' 创建成功",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-                # 刷新数据
-                self.loadData()
-            except APIError as e:
-                InfoBar.error(
-                    title="创建失败",
-                    content=e.message,
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=3000,
-                    parent=self
-                )
+            async_api.submit(experiment_api.create, data, owner=self).then(
+                lambda experiment: self._onExperimentCreated(data.name),
+                self._onCreateFailed
+            )
+
+    def _onExperimentCreated(self, name: str):
+        """实验创建完成"""
+        InfoBar.success(
+            title="成功",
+            content=f"实验 '{name}' 创建成功",
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=2000,
+            parent=self
+        )
+        # 刷新数据
+        self.loadData()
+
+    def _onCreateFailed(self, error: Exception):
+        """实验创建失败"""
+        InfoBar.error(
+            title="创建失败",
+            content=error_message(error),
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=3000,
+            parent=self
+        )
 
     def resizeEvent(self, event):
         """窗口大小变化时调整工具栏位置"""
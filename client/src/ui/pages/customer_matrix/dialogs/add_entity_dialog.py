@@ -8,7 +8,7 @@ from qfluentwidgets import (
     ComboBox, PushButton, InfoBar
 )
 
-from api import customer_api, app_api, template_api, APIError
+from api import customer_api, app_api, template_api, async_api, error_message
 from models.experiment import CustomerCreateRequest, AppCreateRequest, TemplateCreateRequest
 
 
@@ -138,23 +138,7 @@ class AddEntityDialog(MessageBoxBase):
 
     def _loadCustomers(self):
         """加载客户列表"""
-        self._loading = True
-        try:
-            self._customers = customer_api.list()
-            self.customerCombo.clear()
-            self.customerCombo.addItem("请选择客户")
-            for c in self._customers:
-                self.customerCombo.addItem(c.name)
-            self.customerCombo.setCurrentIndex(0)
-            self._loadApps([])
-        except APIError as e:
-            InfoBar.error(
-                title="加载失败",
-                content=e.message,
-                parent=self
-            )
-        finally:
-            self._loading = False
+        self._loadCustomersAndSelect()
 
     def _loadApps(self, apps):
         """加载应用列表"""
@@ -184,9 +168,16 @@ class AddEntityDialog(MessageBoxBase):
 
     def _loadCustomersAndSelect(self, name_to_select: str = None):
         """加载客户列表并选中指定名称"""
+        async_api.fetch(customer_api.list, owner=self, group="customers").then(
+            lambda customers: self._onCustomersLoaded(customers, name_to_select),
+            self._onLoadFailed
+        )
+
+    def _onCustomersLoaded(self, customers, name_to_select: str = None):
+        """客户列表加载完成"""
         self._loading = True
         try:
-            self._customers = customer_api.list()
+            self._customers = customers
             self.customerCombo.clear()
             self.customerCombo.addItem("请选择客户")
             select_index = 0
@@ -195,22 +186,36 @@ class AddEntityDialog(MessageBoxBase):
                 if name_to_select and c.name == name_to_select:
                     select_index = i + 1  # +1 因为有占位符
             self.customerCombo.setCurrentIndex(select_index)
-            if select_index > 0:
-                # 触发加载该客户的应用
-                customer_id = self._customers[select_index - 1].id
-                apps = app_api.list(customer_id=customer_id)
-                self._loadApps(apps)
-            else:
-                self._loadApps([])
-        except APIError as e:
-            InfoBar.error(
-                title="加载失败",
-                content=e.message,
-                parent=self
-            )
+            self._loadApps([])
         finally:
             self._loading = False
 
+        if select_index > 0:
+            # 触发加载该客户的应用
+            self._fetchApps(self._customers[select_index - 1].id)
+
+    def _onLoadFailed(self, error: Exception):
+        """加载失败提示"""
+        InfoBar.error(
+            title="加载失败",
+            content=error_message(error),
+            parent=self
+        )
+
+    def _fetchApps(self, customer_id: int, name_to_select: str = None):
+        """异步加载客户的应用列表，新的选择会取消旧的加载"""
+        async_api.fetch(app_api.list, customer_id=customer_id, owner=self, group="apps").then(
+            lambda apps: self._loadAppsAndSelect(apps, name_to_select),
+            lambda error: self._loadApps([])
+        )
+
+    def _fetchTemplates(self, app_id: int, name_to_select: str = None):
+        """异步加载应用的模板列表，新的选择会取消旧的加载"""
+        async_api.fetch(template_api.list, app_id=app_id, owner=self, group="templates").then(
+            lambda templates: self._loadTemplatesAndSelect(templates, name_to_select),
+            lambda error: self._loadTemplates([])
+        )
+
     def _loadAppsAndSelect(self, apps, name_to_select: str = None):
         """加载应用列表并选中指定名称"""
         self._loading = True
@@ -224,16 +229,14 @@ class AddEntityDialog(MessageBoxBase):
                 if name_to_select and a.name == name_to_select:
                     select_index = i + 1
             self.appCombo.setCurrentIndex(select_index)
-            if select_index > 0:
-                # 触发加载该应用的模板
-                app_id = self._apps[select_index - 1].id
-                templates = template_api.list(app_id=app_id)
-                self._loadTemplates(templates)
-            else:
-                self._loadTemplates([])
+            self._loadTemplates([])
         finally:
             self._loading = False
 
+        if select_index > 0:
+            # 触发加载该应用的模板
+            self._fetchTemplates(self._apps[select_index - 1].id)
+
     def _loadTemplatesAndSelect(self, templates, name_to_select: str = None):
         """加载模板列表并选中指定名称"""
         self._loading = True
@@ -255,13 +258,10 @@ class AddEntityDialog(MessageBoxBase):
             return
         # index 0 是占位符
         if index > 0 and index <= len(self._customers):
-            customer_id = self._customers[index - 1].id
-            try:
-                apps = app_api.list(customer_id=customer_id)
-                self._loadApps(apps)
-            except APIError:
-                self._loadApps([])
+            self._fetchApps(self._customers[index - 1].id)
         else:
+            async_api.cancelGroup(self, "apps")
+            async_api.cancelGroup(self, "templates")
             self._loadApps([])
 
     def _onAppSelected(self, index):
@@ -270,15 +270,15 @@ class AddEntityDialog(MessageBoxBase):
             return
         # index 0 是占位符
         if index > 0 and index <= len(self._apps):
-            app_id = self._apps[index - 1].id
-            try:
-                templates = template_api.list(app_id=app_id)
-                self._loadTemplates(templates)
-            except APIError:
-                self._loadTemplates([])
+            self._fetchTemplates(self._apps[index - 1].id)
         else:
+            async_api.cancelGroup(self, "templates")
             self._loadTemplates([])
 
+    def _onCreateFailed(self, error: Exception):
+        """创建失败提示"""
+        InfoBar.error(title="创建失败", content=error_message(error), parent=self)
+
     def _createCustomer(self):
         """创建客户"""
         name = self.customerNameEdit.text().strip()
@@ -292,13 +292,16 @@ class AddEntityDialog(MessageBoxBase):
                 InfoBar.warning(title="提示", content="客户名称已存在", parent=self)
                 return
 
-        try:
-            customer_api.create(CustomerCreateRequest(name=name))
-            InfoBar.success(title="成功", content=f"客户 '{name}' 创建成功", parent=self)
-            self.customerNameEdit.clear()
-            self._loadCustomersAndSelect(name)
-        except APIError as e:
-            InfoBar.error(title="创建失败", content=e.message, parent=self)
+        async_api.submit(customer_api.create, CustomerCreateRequest(name=name), owner=self).then(
+            lambda customer: self._onCustomerCreated(name),
+            self._onCreateFailed
+        )
+
+    def _onCustomerCreated(self, name: str):
+        """客户创建完成"""
+        InfoBar.success(title="成功", content=f"客户 '{name}' 创建成功", parent=self)
+        self.customerNameEdit.clear()
+        self._loadCustomersAndSelect(name)
 
     def _createApp(self):
         """创建应用"""
@@ -318,15 +321,19 @@ class AddEntityDialog(MessageBoxBase):
                 InfoBar.warning(title="提示", content="该客户下已存在同名应用", parent=self)
                 return
 
-        try:
-            customer_id = self._customers[customer_idx - 1].id
-            app_api.create(AppCreateRequest(customer_id=customer_id, name=name))
-            InfoBar.success(title="成功", content=f"应用 '{name}' 创建成功", parent=self)
-            self.appNameEdit.clear()
-            apps = app_api.list(customer_id=customer_id)
-            self._loadAppsAndSelect(apps, name)
-        except APIError as e:
-            InfoBar.error(title="创建失败", content=e.message, parent=self)
+        customer_id = self._customers[customer_idx - 1].id
+        async_api.submit(
+            app_api.create, AppCreateRequest(customer_id=customer_id, name=name), owner=self
+        ).then(
+            lambda app: self._onAppCreated(customer_id, name),
+            self._onCreateFailed
+        )
+
+    def _onAppCreated(self, customer_id: int, name: str):
+        """应用创建完成"""
+        InfoBar.success(title="成功", content=f"应用 '{name}' 创建成功", parent=self)
+        self.appNameEdit.clear()
+        self._fetchApps(customer_id, name)
 
     def _createTemplate(self):
         """创建模板"""
@@ -342,25 +349,31 @@ class AddEntityDialog(MessageBoxBase):
 
         # 获取当前模板列表用于同名检查
         app_id = self._apps[app_idx - 1].id
-        try:
-            current_templates = template_api.list(app_id=app_id)
-        except APIError:
-            current_templates = []
+        async_api.fetch(template_api.list, app_id=app_id, owner=self).then(
+            lambda templates: self._submitTemplate(app_id, name, templates),
+            lambda error: self._submitTemplate(app_id, name, [])
+        )
 
+    def _submitTemplate(self, app_id: int, name: str, current_templates):
+        """同名检查通过后提交创建模板"""
         # 前端检查同名
         for t in current_templates:
             if t.name == name:
                 InfoBar.warning(title="提示", content="该应用下已存在同名模板", parent=self)
                 return
 
-        try:
-            template_api.create(TemplateCreateRequest(app_id=app_id, name=name))
-            InfoBar.success(title="成功", content=f"模板 '{name}' 创建成功", parent=self)
-            self.templateNameEdit.clear()
-            templates = template_api.list(app_id=app_id)
-            self._loadTemplatesAndSelect(templates, name)
-        except APIError as e:
-            InfoBar.error(title="创建失败", content=e.message, parent=self)
+        async_api.submit(
+            template_api.create, TemplateCreateRequest(app_id=app_id, name=name), owner=self
+        ).then(
+            lambda template: self._onTemplateCreated(app_id, name),
+            self._onCreateFailed
+        )
+
+    def _onTemplateCreated(self, app_id: int, name: str):
+        """模板创建完成"""
+        InfoBar.success(title="成功", content=f"模板 '{name}' 创建成功", parent=self)
+        self.templateNameEdit.clear()
+        self._fetchTemplates(app_id, name)
 
     def validate(self) -> bool:
         """验证 - 直接关闭"""
@@ -0,0 +1,242 @@
+"""客户矩阵筛选索引
+
+搜索框每次输入不再逐行扫描，而是查预先建好的倒排索引：
+- 每行的客户、APP、模板、实验名称（小写）及其拼音首字母拆成单字和二元组（n-gram），记录包含它的行
+- 搜索词按空格分为多个关键词，同时满足；每个关键词取其 n-gram 对应行集合的交集，
+  超过两个字时再用原文确认一次（二元组都出现不代表连续出现）
+- 客户、实验、状态筛选同样预先按值分组，与关键词结果取交集
+
+索引以 template_id 为行键，数据更新时只重新索引新增、删除和内容变化的行。
+更新先记下，由 prepare 应用：模型在数据变化后放到后台线程执行；
+尚未完成时（isReady 为 False）模型用 scan 逐行匹配，不在 GUI 线程上等待或重建索引。
+拼音首字母需要安装 pypinyin（可选依赖），未安装时只按原文匹配。
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set
+
+from models.experiment import MatrixRow
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:  # 可选依赖
+    lazy_pinyin = None
+
+_EMPTY: FrozenSet[int] = frozenset()
+# 字段分隔符，不会出现在关键词中，n-gram 不跨字段
+_SEPARATOR = "\n"
+
+
+@dataclass(frozen=True)
+class MatrixFilter:
+    """矩阵筛选条件，各条件同时满足"""
+    text: str = ""
+    status: Optional[str] = None         # 行内有该状态的实验
+    experiment_id: Optional[int] = None  # 行内有该实验
+    customer_id: Optional[int] = None
+
+    def isEmpty(self) -> bool:
+        return not self.text.strip() and self.status is None \
+            and self.experiment_id is None and self.customer_id is None
+
+
+class MatrixFilterIndex:
+    """矩阵行的筛选索引（线程安全），match 返回匹配行的 template_id"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Optional[List[MatrixRow]] = None
+        self._pending_lock = threading.Lock()
+        self._ready = True  # 没有待应用或正在应用的更新
+
+        self._rows: Dict[int, MatrixRow] = {}
+        self._texts: Dict[int, str] = {}        # 每行的搜索文本（用于确认多字关键词）
+        self._grams: Dict[str, Set[int]] = {}   # n-gram -> 行
+        self._by_customer: Dict[int, Set[int]] = {}
+        self._by_experiment: Dict[int, Set[int]] = {}
+        self._by_status: Dict[str, Set[int]] = {}
+        # 名称 -> (搜索文本, n-gram)
+        self._name_cache: Dict[str, tuple] = {}
+
+    def setRows(self, rows: List[MatrixRow]):
+        """设置数据（只记下，prepare 或下次筛选时应用）"""
+        with self._pending_lock:
+            self._pending = rows
+            self._ready = False
+
+    def isReady(self) -> bool:
+        """索引是否已包含最新数据（此时 match 不会阻塞）"""
+        with self._pending_lock:
+            return self._ready
+
+    def prepare(self):
+        """应用数据更新，可在后台线程调用"""
+        with self._lock:
+            self._applyPending()
+
+    def match(self, matrix_filter: MatrixFilter) -> Set[int]:
+        """返回匹配行的 template_id"""
+        with self._lock:
+            self._applyPending()
+
+            sets = []
+            if matrix_filter.customer_id is not None:
+                sets.append(self._by_customer.get(matrix_filter.customer_id, _EMPTY))
+            if matrix_filter.experiment_id is not None:
+                sets.append(self._by_experiment.get(matrix_filter.experiment_id, _EMPTY))
+            if matrix_filter.status is not None:
+                sets.append(self._by_status.get(matrix_filter.status, _EMPTY))
+            # 多字关键词先按二元组取候选，与其他条件取交集后再确认，减少逐行确认的次数
+            verify = []
+            for term in matrix_filter.text.lower().split():
+                grams = [term] if len(term) == 1 else [term[i:i + 2] for i in range(len(term) - 1)]
+                for gram in grams:
+                    sets.append(self._grams.get(gram, _EMPTY))
+                if len(term) > 2:
+                    verify.append(term)
+
+            if not sets:
+                return set(self._rows)
+            sets.sort(key=len)
+            if not sets[0]:
+                return set()
+            result = sets[0].intersection(*sets[1:])
+            texts = self._texts
+            for term in verify:
+                result = {key for key in result if term in texts[key]}
+            return result
+
+    def scan(self, rows: List[MatrixRow], matrix_filter: MatrixFilter) -> Set[int]:
+        """逐行匹配，结果与 match 相同，不使用也不更新索引（索引未就绪时使用）"""
+        terms = matrix_filter.text.lower().split()
+        result = set()
+        for row in rows:
+            if matrix_filter.customer_id is not None and row.customer_id != matrix_filter.customer_id:
+                continue
+            experiments = row.experiments.values()
+            if matrix_filter.experiment_id is not None \
+                    and all(experiment.id != matrix_filter.experiment_id for experiment in experiments):
+                continue
+            if matrix_filter.status is not None \
+                    and all(experiment.status != matrix_filter.status for experiment in experiments):
+                continue
+            if terms:
+                text = _SEPARATOR.join(self._splitName(name)[0] for name in self._names(row))
+                if not all(term in text for term in terms):
+                    continue
+            result.add(row.template_id)
+        return result
+
+    def _applyPending(self):
+        """按 template_id 比较，只重新索引有变化的行（需持有 _lock）"""
+        with self._pending_lock:
+            rows, self._pending = self._pending, None
+        if rows is None:
+            return
+
+        old_rows = self._rows
+        new_rows = {row.template_id: row for row in rows}
+        for key, row in old_rows.items():
+            new = new_rows.get(key)
+            if new is not row and (new is None or new != row):
+                self._removeRow(key, row)
+        for key, row in new_rows.items():
+            old = old_rows.get(key)
+            if old is not row and (old is None or old != row):
+                self._addRow(key, row)
+        self._rows = new_rows
+        with self._pending_lock:
+            self._ready = self._pending is None
+
+    def _addRow(self, key: int, row: MatrixRow):
+        texts = []
+        row_grams = set()
+        for name in self._names(row):
+            text, grams = self._splitName(name)
+            texts.append(text)
+            row_grams |= grams
+        self._texts[key] = _SEPARATOR.join(texts)
+
+        index = self._grams
+        for gram in row_grams:
+            posting = index.get(gram)
+            if posting is None:
+                index[gram] = {key}
+            else:
+                posting.add(key)
+
+        self._by_customer.setdefault(row.customer_id, set()).add(key)
+        for experiment in row.experiments.values():
+            self._by_experiment.setdefault(experiment.id, set()).add(key)
+            # ExperimentStatus 是 str 枚举，可直接用 "running" 等字符串查找
+            self._by_status.setdefault(experiment.status, set()).add(key)
+
+    def _removeRow(self, key: int, row: MatrixRow):
+        row_grams = set()
+        for name in self._names(row):
+            row_grams |= self._splitName(name)[1]
+        for gram in row_grams:
+            posting = self._grams.get(gram)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self._grams[gram]
+        self._texts.pop(key, None)
+
+        _discard(self._by_customer, row.customer_id, key)
+        for experiment in row.experiments.values():
+            _discard(self._by_experiment, experiment.id, key)
+            _discard(self._by_status, experiment.status, key)
+
+    @staticmethod
+    def _names(row: MatrixRow) -> List[str]:
+        names = [row.customer_name, row.app_name, row.template_name]
+        names += [experiment.name for experiment in row.experiments.values()]
+        return names
+
+    def _splitName(self, name: str) -> tuple:
+        """名称 -> (搜索文本, 单字和二元组集合)；含中文时附加拼音首字母"""
+        cached = self._name_cache.get(name)
+        if cached is not None:
+            return cached
+
+        parts = [name.lower()]
+        if lazy_pinyin is not None and not name.isascii():
+            initials = _toInitials(parts[0])
+            if initials != parts[0]:
+                parts.append(initials)
+        grams = set()
+        for part in parts:
+            grams.update(part)
+            grams.update(part[i:i + 2] for i in range(len(part) - 1))
+
+        cached = self._name_cache[name] = (_SEPARATOR.join(parts), frozenset(grams))
+        return cached
+
+
+def _discard(groups: Dict, value, key: int):
+    """从分组中移除行，分组为空时删除"""
+    keys = groups.get(value)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del groups[value]
+
+
+# 汉字 -> 拼音首字母
+_initials: Dict[str, str] = {}
+
+
+def _toInitials(text: str) -> str:
+    """拼音首字母（逐字转换并缓存，非汉字原样保留）"""
+    chars = []
+    for char in text:
+        if char.isascii():
+            chars.append(char)
+            continue
+        initial = _initials.get(char)
+        if initial is None:
+            initial = _initials[char] = (lazy_pinyin(char, style=Style.FIRST_LETTER) or [char])[0][:1] or char
+        chars.append(initial)
+    return "".join(chars)
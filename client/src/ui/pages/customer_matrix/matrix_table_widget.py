@@ -1,243 +1,393 @@
-"""矩阵卡片组件 - Fluent Design 卡片式UI"""
+"""矩阵列表组件 - Model/View 虚拟化渲染
 
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
-from qfluentwidgets import (
-    BodyLabel, CaptionLabel, CardWidget, CheckBox, SmoothScrollArea
-)
+每行不再创建卡片控件，而是由 MatrixModel 提供数据、MatrixDelegate 直接绘制，
+QListView 只绘制可见的行：行数再多，刷新和滚动的开销也只与可见行数相关。
+所有行高度相同（uniformItemSizes），布局不需要逐行计算尺寸。
+"""
 
-from models.experiment import MatrixRow, ExperimentBrief
+from typing import Dict, List, Optional, Set, Tuple
 
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QPoint
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QIcon, QPainter, QPainterPath, QPen, QPixmap
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from qfluentwidgets import RoundMenu, Action, SmoothScrollDelegate, getFont, isDarkTheme
 
-class ColorSquare(QLabel):
-    """装饰色方块 - 同字号大小的圆角正方形"""
+from api import async_api
+from models.experiment import MatrixRow, ExperimentBrief
+from .matrix_filter import MatrixFilter, MatrixFilterIndex
 
-    def __init__(self, color: str, size: int = 14, parent=None):
-        super().__init__(parent)
-        self.setFixedSize(size, size)
-        self.setStyleSheet(f"""
-            background-color: {color};
-            border-radius: 3px;
-        """)
+# 行数据角色
+RowRole = Qt.UserRole + 1          # MatrixRow
+SourceIndexRole = Qt.UserRole + 2  # 原始行索引（筛选前）
+SelectedRole = Qt.UserRole + 3     # 是否选中
 
 
-class ExperimentTag(QWidget):
-    """实验标签 - 带装饰色方块"""
+class MatrixModel(QAbstractListModel):
+    """矩阵行数据模型，筛选后只暴露匹配的行
 
-    clicked = Signal(int)  # experiment_id
+    每行以 template_id 为键。数据更新时按键比较新旧数据，只对新增、删除、变化的行
+    发出 rowsInserted / rowsRemoved / dataChanged，其他行不重绘，选择和滚动位置保持不变。
+    """
 
-    def __init__(self, experiment: ExperimentBrief, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self._experiment = experiment
-        self.setupUI()
-
-    def setupUI(self):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(8, 4, 8, 4)
-        layout.setSpacing(6)
-
-        # 装饰色方块
-        color = self._experiment.color or "#888888"
-        self.colorSquare = ColorSquare(color, 14, self)
-        layout.addWidget(self.colorSquare)
-
-        # 实验名
-        self.label = BodyLabel(self)
-        self.label.setText(self._experiment.name)
-        layout.addWidget(self.label)
+        self._rows: List[MatrixRow] = []
+        self._index = MatrixFilterIndex()
+        self._source_index: Dict[int, int] = {}  # template_id -> 原始行索引
+        self._visible: List[MatrixRow] = []      # 筛选后可见的行
+        self._selected: Set[int] = set()         # 选中行的 template_id
+        self._filter = MatrixFilter()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._visible)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._visible):
+            return None
+        row = self._visible[index.row()]
+        if role == RowRole:
+            return row
+        if role == SourceIndexRole:
+            return self._source_index.get(row.template_id)
+        if role == SelectedRole:
+            return row.template_id in self._selected
+        if role == Qt.DisplayRole:
+            return row.customer_name
+        return None
+
+    def rows(self) -> List[MatrixRow]:
+        return self._rows
+
+    def setRows(self, rows: List[MatrixRow]):
+        """替换全部数据（清空选择，滚动回到顶部）"""
+        self.beginResetModel()
+        self._setSource(rows)
+        self._selected = set()
+        self._visible = self._filterRows()
+        self.endResetModel()
+
+    def applyRows(self, rows: List[MatrixRow]):
+        """按 template_id 增量更新数据，保留选择（已删除的行除外）"""
+        old_visible = self._visible
+        self._setSource(rows)
+        self._selected &= self._source_index.keys()
+        new_visible = self._filterRows()
+
+        old_keys = [row.template_id for row in old_visible]
+        new_keys = [row.template_id for row in new_visible]
+        if old_keys == new_keys:
+            self._visible = new_visible
+            self._emitChanged(old_visible, new_visible)
+            return
 
-        self.setFixedHeight(28)
-        self.setCursor(Qt.PointingHandCursor)
-        self.setStyleSheet("""
-            ExperimentTag {
-                background-color: rgba(255, 255, 255, 0.06);
-                border-radius: 6px;
-            }
-            ExperimentTag:hover {
-                background-color: rgba(255, 255, 255, 0.12);
-            }
-        """)
+        old_set, new_set = set(old_keys), set(new_keys)
+        if [k for k in old_keys if k in new_set] != [k for k in new_keys if k in old_set]:
+            # 保留的行顺序有变化（如重命名后重新排序）：整体重新布局，滚动位置不变
+            self.layoutAboutToBeChanged.emit()
+            self._visible = new_visible
+            self.layoutChanged.emit()
+            return
 
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.clicked.emit(self._experiment.id)
-        super().mousePressEvent(event)
+        # 先从后往前删除，再从前往后插入，每段连续的行发一次信号
+        removed = [i for i, key in enumerate(old_keys) if key not in new_set]
+        for start, end in reversed(_runs(removed)):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._visible[start:end + 1]
+            self.endRemoveRows()
+
+        inserted = [i for i, key in enumerate(new_keys) if key not in old_set]
+        for start, end in _runs(inserted):
+            self.beginInsertRows(QModelIndex(), start, end)
+            self._visible[start:start] = new_visible[start:end + 1]
+            self.endInsertRows()
+
+        # 此时保留的行仍是旧数据，逐行比较
+        kept = self._visible
+        self._visible = new_visible
+        self._emitChanged(kept, new_visible)
+
+    def setFilter(self, matrix_filter: MatrixFilter):
+        """按关键词（客户、APP、模板、实验名称或拼音首字母）和客户、实验、状态筛选"""
+        if matrix_filter == self._filter:
+            return
+        self._filter = matrix_filter
+        self.beginResetModel()
+        self._visible = self._filterRows()
+        self.endResetModel()
+
+    def selectedRows(self) -> set:
+        """选中行的原始索引"""
+        return {self._source_index[key] for key in self._selected}
+
+    def setSelectedRows(self, selected: set):
+        self._selected = {self._rows[i].template_id for i in selected if i < len(self._rows)}
+        if self._visible:
+            self.dataChanged.emit(self.index(0), self.index(len(self._visible) - 1), [SelectedRole])
+
+    def toggleSelected(self, index: QModelIndex):
+        """切换一行的选中状态"""
+        key = self._visible[index.row()].template_id
+        if key in self._selected:
+            self._selected.discard(key)
+        else:
+            self._selected.add(key)
+        self.dataChanged.emit(index, index, [SelectedRole])
 
+    def _setSource(self, rows: List[MatrixRow]):
+        self._rows = rows
+        self._index.setRows(rows)
+        # 后台更新筛选索引，搜索时通常已就绪
+        async_api.fetch(self._index.prepare, owner=self)
+        self._source_index = {row.template_id: i for i, row in enumerate(rows)}
+
+    def _filterRows(self) -> List[MatrixRow]:
+        if self._filter.isEmpty():
+            return list(self._rows)
+        # 后台尚未建好索引时逐行匹配，避免在 GUI 线程上等待或同步重建索引
+        if self._index.isReady():
+            keys = self._index.match(self._filter)
+        else:
+            keys = self._index.scan(self._rows, self._filter)
+        return [row for row in self._rows if row.template_id in keys]
+
+    def _emitChanged(self, old_rows: List[MatrixRow], new_rows: List[MatrixRow]):
+        """对内容变化的行发出 dataChanged（两个列表按位置一一对应）"""
+        changed = [i for i, (old, new) in enumerate(zip(old_rows, new_rows)) if old is not new and old != new]
+        for start, end in _runs(changed):
+            self.dataChanged.emit(self.index(start), self.index(end))
+
+
+def _runs(indices: List[int]) -> List[Tuple[int, int]]:
+    """把升序索引合并为连续区间 [(start, end), ...]"""
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i - 1:
+            runs[-1] = (runs[-1][0], i)
+        else:
+            runs.append((i, i))
+    return runs
 
-class ExperimentTagsRow(QWidget):
-    """实验标签行 - 显示多个实验标签，过多时折叠"""
 
-    experimentClicked = Signal(int)
+class MatrixDelegate(QStyledItemDelegate):
+    """绘制一行矩阵卡片：客户名、APP / 模板、实验标签（超过 MAX_VISIBLE_TAGS 个时折叠为 +N）"""
 
     MAX_VISIBLE_TAGS = 3
+    ROW_HEIGHT = 54
+    TAG_HEIGHT = 28
 
-    def __init__(self, experiments: list, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self._experiments = experiments
-        self._expanded = False
-        self._tags = []
-        self._moreBtn = None
-        self.setupUI()
+        self.multiSelectMode = False
+        # 鼠标悬停的标签 (行, 标签序号)，由视图更新
+        self.hoverTag: Optional[Tuple[int, int]] = None
+        self._nameFont = getFont(14, QFont.DemiBold)
+        self._pathFont = getFont(12)
+        self._tagFont = getFont(14)
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    # ============ 布局 ============
+
+    def _contentRect(self, rect: QRect) -> QRect:
+        return rect.adjusted(12, 8, -12, -8)
+
+    def _checkRect(self, rect: QRect) -> QRect:
+        content = self._contentRect(rect)
+        return QRect(content.left(), content.center().y() - 9, 18, 18)
+
+    def _columns(self, rect: QRect) -> Tuple[QRect, QRect]:
+        """左侧文字区与右侧标签区（宽度 1 : 2）"""
+        content = self._contentRect(rect)
+        if self.multiSelectMode:
+            content.setLeft(content.left() + 20 + 12)
+        left_width = (content.width() - 12) // 3
+        left = QRect(content.left(), content.top(), left_width, content.height())
+        tags = QRect(left.right() + 1 + 12, content.top(), content.width() - left_width - 12, content.height())
+        return left, tags
+
+    def tagRects(self, rect: QRect, row: MatrixRow) -> List[Tuple[QRect, Optional[ExperimentBrief]]]:
+        """标签位置；实验为 None 的是 +N 折叠标签"""
+        experiments = list(row.experiments.values())
+        _, area = self._columns(rect)
+        fm = QFontMetrics(self._tagFont)
+        top = area.center().y() - self.TAG_HEIGHT // 2
+        x = area.left()
+        result = []
+        for experiment in experiments[:self.MAX_VISIBLE_TAGS]:
+            width = 8 + 14 + 6 + fm.horizontalAdvance(experiment.name) + 8
+            width = min(width, area.right() - x)
+            if width <= 8 + 14 + 8:
+                break
+            result.append((QRect(x, top, width, self.TAG_HEIGHT), experiment))
+            x += width + 8
+        if len(experiments) > self.MAX_VISIBLE_TAGS:
+            text = f"+{len(experiments) - self.MAX_VISIBLE_TAGS}"
+            result.append((QRect(x, top, fm.horizontalAdvance(text) + 20, self.TAG_HEIGHT), None))
+        return result
+
+    # ============ 绘制 ============
+
+    def paint(self, painter: QPainter, option, index: QModelIndex):
+        row: MatrixRow = index.data(RowRole)
+        if row is None:
+            return
+        dark = isDarkTheme()
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # 卡片背景
+        if index.data(SelectedRole) and self.multiSelectMode:
+            background = QColor(0, 120, 212, 38)
+        elif option.state & QStyle.State_MouseOver:
+            background = QColor(255, 255, 255, 21) if dark else QColor(255, 255, 255, 230)
+        else:
+            background = QColor(255, 255, 255, 13) if dark else QColor(255, 255, 255, 170)
+        painter.setPen(QPen(QColor(0, 0, 0, 48) if dark else QColor(0, 0, 0, 19), 1))
+        painter.setBrush(background)
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 6, 6)
+
+        text_color = QColor(255, 255, 255) if dark else QColor(0, 0, 0)
+        secondary_color = QColor(255, 255, 255, 128) if dark else QColor(0, 0, 0, 128)
+
+        # 多选框
+        if self.multiSelectMode:
+            self._paintCheckBox(painter, self._checkRect(rect), bool(index.data(SelectedRole)), dark)
+
+        # 左侧：客户名、APP / 模板
+        left, _ = self._columns(rect)
+        half = left.height() // 2
+        painter.setFont(self._nameFont)
+        painter.setPen(text_color)
+        name_rect = QRect(left.left(), left.top(), left.width(), half + 1)
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignBottom,
+                         painter.fontMetrics().elidedText(row.customer_name, Qt.ElideRight, left.width()))
+        painter.setFont(self._pathFont)
+        painter.setPen(secondary_color)
+        path_rect = QRect(left.left(), left.top() + half + 1, left.width(), left.height() - half - 1)
+        painter.drawText(path_rect, Qt.AlignLeft | Qt.AlignTop, painter.fontMetrics().elidedText(
+            f"{row.app_name} / {row.template_name}", Qt.ElideRight, left.width()))
 
-    def setupUI(self):
-        self._mainLayout = QHBoxLayout(self)
-        self._mainLayout.setContentsMargins(0, 0, 0, 0)
-        self._mainLayout.setSpacing(8)
-        self._renderTags()
-
-    def _renderTags(self):
-        # 清除现有内容
-        while self._mainLayout.count():
-            item = self._mainLayout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        self._tags.clear()
-
-        if not self._experiments:
-            # 无实验
-            label = CaptionLabel(self)
-            label.setText("-")
-            label.setStyleSheet("color: rgba(255, 255, 255, 0.25);")
-            self._mainLayout.addWidget(label)
-            self._mainLayout.addStretch()
+        # 右侧：实验标签
+        self._paintTags(painter, rect, row, index.row(), dark, text_color)
+        painter.restore()
+
+    def _paintCheckBox(self, painter: QPainter, rect: QRect, checked: bool, dark: bool):
+        if checked:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(0, 120, 212))
+            painter.drawRoundedRect(QRectF(rect), 4, 4)
+            path = QPainterPath()
+            path.moveTo(rect.left() + 4.5, rect.center().y() + 0.5)
+            path.lineTo(rect.left() + 7.5, rect.center().y() + 3.5)
+            path.lineTo(rect.right() - 3.5, rect.top() + 5.5)
+            painter.setPen(QPen(QColor(255, 255, 255), 1.6))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawPath(path)
+        else:
+            painter.setPen(QPen(QColor(255, 255, 255, 139) if dark else QColor(0, 0, 0, 110), 1))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 4, 4)
+
+    def _paintTags(self, painter: QPainter, rect: QRect, row: MatrixRow, view_row: int,
+                   dark: bool, text_color: QColor):
+        painter.setFont(self._tagFont)
+        fm = painter.fontMetrics()
+        tags = self.tagRects(rect, row)
+
+        if not tags:
+            _, area = self._columns(rect)
+            painter.setFont(self._pathFont)
+            painter.setPen(QColor(255, 255, 255, 64) if dark else QColor(0, 0, 0, 64))
+            painter.drawText(area, Qt.AlignLeft | Qt.AlignVCenter, "-")
             return
 
-        # 显示标签
-        visible_count = len(self._experiments) if self._expanded else min(self.MAX_VISIBLE_TAGS, len(self._experiments))
-
-        for i, exp in enumerate(self._experiments[:visible_count]):
-            tag = ExperimentTag(exp, self)
-            tag.clicked.connect(self.experimentClicked.emit)
-            self._mainLayout.addWidget(tag)
-            self._tags.append(tag)
-
-        # 如果还有更多，显示展开按钮
-        if len(self._experiments) > self.MAX_VISIBLE_TAGS and not self._expanded:
-            self._moreBtn = BodyLabel(self)
-            self._moreBtn.setText(f"+{len(self._experiments) - self.MAX_VISIBLE_TAGS}")
-            self._moreBtn.setCursor(Qt.PointingHandCursor)
-            self._moreBtn.setFixedHeight(28)
-            self._moreBtn.setStyleSheet("""
-                BodyLabel {
-                    color: #0078D4;
-                    padding: 0 10px;
-                    background-color: rgba(0, 120, 212, 0.12);
-                    border-radius: 6px;
-                }
-                BodyLabel:hover {
-                    background-color: rgba(0, 120, 212, 0.2);
-                }
-            """)
-            self._moreBtn.mousePressEvent = lambda e: self._toggleExpand()
-            self._mainLayout.addWidget(self._moreBtn)
-
-        self._mainLayout.addStretch()
-
-    def _toggleExpand(self):
-        self._expanded = not self._expanded
-        self._renderTags()
-
-
-class MatrixCard(CardWidget):
-    """矩阵卡片 - 一行数据"""
-
-    rowClicked = Signal(int)  # row_index (非多选模式下)
-    selectionToggled = Signal(int)  # row_index (多选模式下)
-    experimentClicked = Signal(int)  # experiment_id
-
-    def __init__(self, row_index: int, row_data: MatrixRow, parent=None):
-        super().__init__(parent)
-        self._row_index = row_index
-        self._row_data = row_data
-        self._selected = False
-        self._multi_select_mode = False
-        self.setupUI()
+        for i, (tag_rect, experiment) in enumerate(tags):
+            hovered = self.hoverTag == (view_row, i)
+            painter.setPen(Qt.NoPen)
+            if experiment is None:
+                # +N 折叠标签
+                painter.setBrush(QColor(0, 120, 212, 51 if hovered else 31))
+                painter.drawRoundedRect(QRectF(tag_rect), 6, 6)
+                painter.setPen(QColor("#0078D4"))
+                painter.drawText(tag_rect, Qt.AlignCenter, f"+{len(row.experiments) - self.MAX_VISIBLE_TAGS}")
+                continue
+
+            if dark:
+                painter.setBrush(QColor(255, 255, 255, 31 if hovered else 15))
+            else:
+                painter.setBrush(QColor(0, 0, 0, 20 if hovered else 10))
+            painter.drawRoundedRect(QRectF(tag_rect), 6, 6)
 
-    def setupUI(self):
-        self.setBorderRadius(6)
-
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(12, 8, 12, 8)
-        layout.setSpacing(12)
-
-        # 多选框（默认隐藏）
-        self.checkBox = CheckBox(self)
-        self.checkBox.setFixedWidth(20)
-        self.checkBox.stateChanged.connect(self._onCheckBoxChanged)
-        self.checkBox.setVisible(False)
-        layout.addWidget(self.checkBox)
-
-        # 左侧：客户名、APP/模板
-        leftWidget = QWidget(self)
-        leftLayout = QVBoxLayout(leftWidget)
-        leftLayout.setContentsMargins(0, 0, 0, 0)
-        leftLayout.setSpacing(2)
-
-        # 客户名
-        customerLabel = BodyLabel(leftWidget)
-        customerLabel.setText(self._row_data.customer_name)
-        customerLabel.setStyleSheet("font-weight: 600;")
-        leftLayout.addWidget(customerLabel)
-
-        # APP / 模板
-        pathLabel = CaptionLabel(leftWidget)
-        pathLabel.setText(f"{self._row_data.app_name} / {self._row_data.template_name}")
-        pathLabel.setStyleSheet("color: rgba(255, 255, 255, 0.5);")
-        leftLayout.addWidget(pathLabel)
-
-        layout.addWidget(leftWidget, 1)
+            # 装饰色方块
+            square = QRect(tag_rect.left() + 8, tag_rect.center().y() - 6, 14, 14)
+            painter.setBrush(QColor(experiment.color or "#888888"))
+            painter.drawRoundedRect(QRectF(square), 3, 3)
 
-        # 右侧：实验标签
-        experiments = list(self._row_data.experiments.values())
-        self._tagsRow = ExperimentTagsRow(experiments, self)
-        self._tagsRow.experimentClicked.connect(self.experimentClicked.emit)
-        layout.addWidget(self._tagsRow, 2)
+            # 实验名
+            text_rect = QRect(square.right() + 1 + 6, tag_rect.top(), tag_rect.right() - square.right() - 6 - 8,
+                              tag_rect.height())
+            painter.setPen(text_color)
+            painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                             fm.elidedText(experiment.name, Qt.ElideRight, text_rect.width()))
 
-        # 设置可点击
-        self.setCursor(Qt.PointingHandCursor)
 
-    def setMultiSelectMode(self, enabled: bool):
-        """设置多选模式"""
-        self._multi_select_mode = enabled
-        self.checkBox.setVisible(enabled)
-        if not enabled:
-            self.checkBox.setChecked(False)
-            self._selected = False
-            self._updateStyle()
-
-    def setSelected(self, selected: bool):
-        """设置选中状态"""
-        self._selected = selected
-        self.checkBox.blockSignals(True)
-        self.checkBox.setChecked(selected)
-        self.checkBox.blockSignals(False)
-        self._updateStyle()
-
-    def isSelected(self) -> bool:
-        return self._selected
-
-    def _onCheckBoxChanged(self, state):
-        """复选框状态变化"""
-        self._selected = state == Qt.Checked
-        self._updateStyle()
-        self.selectionToggled.emit(self._row_index)
-
-    def _updateStyle(self):
-        """更新样式"""
-        self.setProperty("selected", self._selected)
-        self.style().unpolish(self)
-        self.style().polish(self)
+class MatrixListView(QListView):
+    """矩阵列表视图：处理行点击、标签点击和悬停"""
+
+    rowPressed = Signal(QModelIndex, QPoint)  # 左键按下的行和位置（视口坐标）
+
+    def __init__(self, delegate: MatrixDelegate, parent=None):
+        super().__init__(parent)
+        self._delegate = delegate
+        self.setItemDelegate(delegate)
+        self.setUniformItemSizes(True)
+        self.setSpacing(3)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover, True)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setStyleSheet("QListView { border: none; background: transparent; }")
+        self.scrollDelegate = SmoothScrollDelegate(self)
+
+    def tagAt(self, pos: QPoint) -> Tuple[QModelIndex, int, Optional[ExperimentBrief]]:
+        """位置处的行和标签序号（不在标签上时序号为 -1）"""
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return index, -1, None
+        rect = self.visualRect(index)
+        for i, (tag_rect, experiment) in enumerate(self._delegate.tagRects(rect, index.data(RowRole))):
+            if tag_rect.contains(pos):
+                return index, i, experiment
+        return index, -1, None
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
-            if self._multi_select_mode:
-                # 多选模式下切换选中状态
-                self.checkBox.setChecked(not self.checkBox.isChecked())
-            else:
-                # 非多选模式下发出点击信号
-                self.rowClicked.emit(self._row_index)
+            pos = event.position().toPoint()
+            index = self.indexAt(pos)
+            if index.isValid():
+                self.rowPressed.emit(index, pos)
+                return
         super().mousePressEvent(event)
 
+    def mouseMoveEvent(self, event):
+        index, tag, _ = self.tagAt(event.position().toPoint())
+        hover = (index.row(), tag) if tag >= 0 else None
+        if hover != self._delegate.hoverTag:
+            self._delegate.hoverTag = hover
+            self.viewport().update()
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        if self._delegate.hoverTag is not None:
+            self._delegate.hoverTag = None
+            self.viewport().update()
+        super().leaveEvent(event)
+
 
 class MatrixTableWidget(QWidget):
     """卡片式矩阵表格"""
@@ -248,12 +398,7 @@ class MatrixTableWidget(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._rows = []
-        self._row_widgets = []
-        self._selected_rows = set()
-        self._filter_text = ""
         self._multi_select_mode = False
-
         self.setupUI()
 
     def setupUI(self):
@@ -261,117 +406,80 @@ class MatrixTableWidget(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
 
-        # 滚动区域
-        self.scrollArea = SmoothScrollArea(self)
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scrollArea.setStyleSheet("""
-            SmoothScrollArea {
-                border: none;
-                background: transparent;
-            }
-        """)
-
-        # 卡片容器
-        self.cardContainer = QWidget()
-        self.cardContainer.setStyleSheet("""
-            QWidget {
-                background: transparent;
-            }
-            MatrixCard[selected="true"] {
-                background-color: rgba(0, 120, 212, 0.15);
-            }
-        """)
-        self.cardLayout = QVBoxLayout(self.cardContainer)
-        self.cardLayout.setContentsMargins(0, 4, 0, 12)
-        self.cardLayout.setSpacing(6)
-
-        self.scrollArea.setWidget(self.cardContainer)
-        layout.addWidget(self.scrollArea)
+        self.model = MatrixModel(self)
+        self.delegate = MatrixDelegate(self)
+        self.listView = MatrixListView(self.delegate, self)
+        self.listView.setModel(self.model)
+        self.listView.rowPressed.connect(self._onRowPressed)
+        layout.addWidget(self.listView)
 
     def setData(self, rows: list, experiments: list = None):
-        """设置数据"""
-        self._rows = rows
-        self._selected_rows.clear()
-        self._renderCards()
+        """设置数据：首次加载整体重置，之后按行增量更新并保留选择和滚动位置"""
+        if not self.model.rows():
+            self.model.setRows(rows)
+            return
+        selected = self.model.selectedRows()
+        self.model.applyRows(rows)
+        if self.model.selectedRows() != selected:
+            self.rowSelectionChanged.emit(self.model.selectedRows())
 
     def getSelectedRows(self) -> set:
         """获取选中的行索引"""
-        return self._selected_rows.copy()
+        return self.model.selectedRows()
 
     def getSelectedRowData(self) -> list:
         """获取选中行的数据"""
-        return [self._rows[i] for i in self._selected_rows if i < len(self._rows)]
+        rows = self.model.rows()
+        return [rows[i] for i in self.model.selectedRows() if i < len(rows)]
 
     def setMultiSelectMode(self, enabled: bool):
         """设置多选模式"""
         self._multi_select_mode = enabled
+        self.delegate.multiSelectMode = enabled
         if not enabled:
-            self._selected_rows.clear()
-        for card in self._row_widgets:
-            card.setMultiSelectMode(enabled)
-        self._updateSelectionHighlight()
+            self.model.setSelectedRows(set())
+        self.listView.viewport().update()
 
     def clearSelection(self):
         """清空选择"""
-        self._selected_rows.clear()
-        self._updateSelectionHighlight()
+        self.model.setSelectedRows(set())
         self.rowSelectionChanged.emit(set())
 
-    def applyFilter(self, filter_text: str):
+    def applyFilter(self, matrix_filter: MatrixFilter):
         """应用筛选（外部调用）"""
-        self._filter_text = filter_text.lower()
-        self._applyFilters()
-
-    def _renderCards(self):
-        """渲染卡片"""
-        # 清除现有内容
-        self._clearCards()
-
-        # 渲染卡片
-        for row_idx, row_data in enumerate(self._rows):
-            card = MatrixCard(row_idx, row_data, self)
-            card.setMultiSelectMode(self._multi_select_mode)
-            card.rowClicked.connect(self.rowClicked.emit)
-            card.selectionToggled.connect(self._onSelectionToggled)
-            card.experimentClicked.connect(self.experimentClicked.emit)
-            self.cardLayout.addWidget(card)
-            self._row_widgets.append(card)
-
-        self.cardLayout.addStretch()
-
-    def _clearCards(self):
-        """清除所有卡片"""
-        while self.cardLayout.count():
-            item = self.cardLayout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        self._row_widgets.clear()
-
-    def _onSelectionToggled(self, row_idx: int):
-        """选择状态切换"""
-        if row_idx in self._selected_rows:
-            self._selected_rows.discard(row_idx)
+        self.model.setFilter(matrix_filter)
+
+    def _onRowPressed(self, index: QModelIndex, pos: QPoint):
+        """按下行：标签 → 实验，+N → 展开菜单，其余 → 选择/点击行"""
+        _, tag, experiment = self.listView.tagAt(pos)
+        if experiment is not None:
+            self.experimentClicked.emit(experiment.id)
+        elif tag >= 0:
+            self._showMoreExperiments(index, pos)
+        elif self._multi_select_mode:
+            self.model.toggleSelected(index)
+            self.rowSelectionChanged.emit(self.model.selectedRows())
         else:
-            self._selected_rows.add(row_idx)
-        self._updateSelectionHighlight()
-        self.rowSelectionChanged.emit(self._selected_rows.copy())
-
-    def _updateSelectionHighlight(self):
-        """更新选中高亮"""
-        for i, card in enumerate(self._row_widgets):
-            card.setSelected(i in self._selected_rows)
-
-    def _applyFilters(self):
-        """应用筛选"""
-        if not self._filter_text:
-            for card in self._row_widgets:
-                card.setVisible(True)
-            return
-
-        for i, card in enumerate(self._row_widgets):
-            if i < len(self._rows):
-                row_data = self._rows[i]
-                # 搜索客户名、APP、模板
-                search_text = f"{row_data.customer_name} {row_data.app_name} {row_data.template_name}".lower()
-                card.setVisible(self._filter_text in search_text)
+            self.rowClicked.emit(index.data(SourceIndexRole))
+
+    def _showMoreExperiments(self, index: QModelIndex, pos: QPoint):
+        """+N：弹出菜单列出折叠的实验"""
+        row: MatrixRow = index.data(RowRole)
+        menu = RoundMenu(parent=self)
+        for experiment in list(row.experiments.values())[MatrixDelegate.MAX_VISIBLE_TAGS:]:
+            action = Action(self._colorIcon(experiment.color or "#888888"), experiment.name, menu)
+            action.triggered.connect(lambda checked=False, eid=experiment.id: self.experimentClicked.emit(eid))
+            menu.addAction(action)
+        menu.exec(self.listView.viewport().mapToGlobal(pos))
+
+    @staticmethod
+    def _colorIcon(color: str) -> QIcon:
+        pixmap = QPixmap(14, 14)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(color))
+        painter.drawRoundedRect(QRectF(0, 0, 14, 14), 3, 3)
+        painter.end()
+        return QIcon(pixmap)
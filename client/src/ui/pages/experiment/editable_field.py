@@ -128,6 +128,7 @@ class EditableField(QWidget):
         self._content = content
         self._is_formatted = is_formatted
         self._placeholder = placeholder
+        self._loading = False
         self.setupUI()
 
     def setupUI(self):
@@ -171,7 +172,10 @@ class EditableField(QWidget):
 
     def _updateContentDisplay(self):
         """更新内容显示"""
-        if self._content:
+        if self._loading:
+            self.contentLabel.setText("加载中...")
+            self.contentLabel.setStyleSheet("color: rgba(255, 255, 255, 0.5);")
+        elif self._content:
             self.contentLabel.setText(self._content)
             self.contentLabel.setStyleSheet("")
         else:
@@ -209,6 +213,12 @@ class EditableField(QWidget):
         self._content = content
         self._updateContentDisplay()
 
+    def setLoading(self, loading: bool):
+        """内容加载中：显示提示并禁止编辑（避免用空内容覆盖尚未加载的数据）"""
+        self._loading = loading
+        self.editButton.setEnabled(not loading)
+        self._updateContentDisplay()
+
     def getContent(self) -> str:
         """获取内容"""
         return self._content
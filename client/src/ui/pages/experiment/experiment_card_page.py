@@ -1,54 +1,81 @@
 """实验卡片页面 - 瀑布流布局"""
 
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QFrame
-from PySide6.QtGui import QShowEvent
+from PySide6.QtGui import QFont, QFontMetrics, QShowEvent
 from qfluentwidgets import (
     SubtitleLabel, BodyLabel, CaptionLabel, CardWidget,
     PrimaryPushButton, PushButton, ComboBox, FluentIcon,
-    InfoBar, InfoBarPosition, SmoothScrollArea, FlowLayout
+    InfoBar, InfoBarPosition, FlowLayout, getFont
 )
 
-from api import experiment_api, APIError
+from api import experiment_api, async_api, error_message, EXPERIMENTS_PATH
 from models.experiment import ExperimentResponse
 from voidview_shared import ExperimentStatus
-from ..components.waterfall_layout import WaterfallLayout
+from ..components.waterfall_view import WaterfallView
+
+
+class CardMetrics(NamedTuple):
+    """卡片内容的宽度测量结果（与卡片宽度无关，按实验缓存）"""
+    title_segments: Tuple[int, ...]  # 标题按可换行位置拆分后各段的宽度
+    title_width: int
+    pill_widths: Tuple[int, ...]     # 模板胶囊宽度
+
+
+# 标题可换行的位置：中文逐字，其他按单词（含其后空格）
+_TITLE_SEGMENT = re.compile(r"[\u3000-\u9fff\uff00-\uffef]|[^\s\u3000-\u9fff\uff00-\uffef]+\s*|\s+")
 
 
 class ExperimentCard(CardWidget):
-    """实验卡片"""
+    """实验卡片
+
+    卡片可通过 setExperiment 重新绑定到其他实验（卡片墙复用控件）；
+    高度由 heightFor 按内容和宽度计算，不需要创建控件。
+    """
 
     cardClicked = Signal(int)  # experiment_id
 
-    def __init__(self, experiment: ExperimentResponse, parent=None):
+    # 布局参数（setupUI 与 heightFor 共用）
+    MARGINS = (16, 12, 16, 16)
+    SPACING = 4
+    DOT_SIZE = 12
+    HEADER_SPACING = 8
+    PILL_HEIGHT = 24
+    PILL_PADDING = 10
+    PILL_SPACING = 6
+
+    _titleMetrics: Optional[QFontMetrics] = None
+    _captionMetrics: Optional[QFontMetrics] = None
+
+    def __init__(self, experiment: Optional[ExperimentResponse] = None, parent=None):
         super().__init__(parent)
         self._experiment = experiment
+        self._pills = []
         self.setupUI()
+        if experiment is not None:
+            self.setExperiment(experiment)
 
     def setupUI(self):
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(16, 12, 16, 16)
-        layout.setSpacing(4)
+        layout.setContentsMargins(*self.MARGINS)
+        layout.setSpacing(self.SPACING)
 
         # 第一行：装饰色方块 + 标题
         headerLayout = QHBoxLayout()
-        headerLayout.setSpacing(8)
+        headerLayout.setSpacing(self.HEADER_SPACING)
 
         # 装饰色圆角矩形
-        color = self._experiment.color or "#0078D4"
-        colorDot = QFrame(self)
-        colorDot.setFixedSize(12, 12)
-        colorDot.setStyleSheet(f"""
-            background-color: {color};
-            border-radius: 4px;
-        """)
-        headerLayout.addWidget(colorDot)
+        self.colorDot = QFrame(self)
+        self.colorDot.setFixedSize(self.DOT_SIZE, self.DOT_SIZE)
+        headerLayout.addWidget(self.colorDot, 0, Qt.AlignTop)
 
         # 标题
-        nameLabel = SubtitleLabel(self)
-        nameLabel.setText(self._experiment.name)
-        nameLabel.setWordWrap(True)
-        headerLayout.addWidget(nameLabel, 1)
+        self.nameLabel = SubtitleLabel(self)
+        self.nameLabel.setWordWrap(True)
+        headerLayout.addWidget(self.nameLabel, 1)
 
         layout.addLayout(headerLayout)
 
@@ -63,53 +90,113 @@ class ExperimentCard(CardWidget):
         metaLayout.setSpacing(12)
 
         # 创建时间
-        timeLabel = CaptionLabel(self)
-        if self._experiment.created_at:
-            timeLabel.setText(self._experiment.created_at.strftime("%Y-%m-%d %H:%M"))
-        timeLabel.setStyleSheet("color: rgba(255, 255, 255, 0.5);")
-        metaLayout.addWidget(timeLabel)
+        self.timeLabel = CaptionLabel(self)
+        self.timeLabel.setStyleSheet("color: rgba(255, 255, 255, 0.5);")
+        metaLayout.addWidget(self.timeLabel)
 
         # 状态标签
-        statusText = self._getStatusText(self._experiment.status)
-        statusColor = self._getStatusColor(self._experiment.status)
-        statusLabel = CaptionLabel(self)
-        statusLabel.setText(statusText)
-        statusLabel.setStyleSheet(f"""
-            color: {statusColor};
-            font-weight: 500;
-        """)
-        metaLayout.addWidget(statusLabel)
+        self.statusLabel = CaptionLabel(self)
+        metaLayout.addWidget(self.statusLabel)
 
         metaLayout.addStretch()
         layout.addLayout(metaLayout)
 
-        # 模板列表（胶囊形状，高对比度）
-        if self._experiment.template_names:
-            templatesContainer = QWidget(self)
-            templatesLayout = FlowLayout(templatesContainer, needAni=False)
-            templatesLayout.setSpacing(6)
-            templatesLayout.setContentsMargins(0, 0, 0, 0)
-
-            for template_name in self._experiment.template_names:
-                # 使用 CaptionLabel 配合样式表实现高对比度胶囊
-                pill = CaptionLabel(templatesContainer)
-                pill.setText(template_name)
-                pill.setFixedHeight(24)
-                pill.setStyleSheet("""
-                    QLabel {
-                        color: rgba(255, 255, 255, 0.95);
-                        background-color: rgba(255, 255, 255, 0.15);
-                        padding: 2px 10px;
-                        border-radius: 12px;
-                    }
-                """)
-                templatesLayout.addWidget(pill)
-
-            layout.addWidget(templatesContainer)
+        # 模板列表（胶囊形状，高对比度），隐藏的胶囊不占位置
+        self.templatesContainer = QWidget(self)
+        self.templatesLayout = FlowLayout(self.templatesContainer, needAni=False, isTight=True)
+        self.templatesLayout.setSpacing(self.PILL_SPACING)
+        self.templatesLayout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.templatesContainer)
+        layout.addStretch()
 
         # 点击样式
         self.setCursor(Qt.PointingHandCursor)
 
+    def setExperiment(self, experiment: ExperimentResponse):
+        """绑定实验"""
+        self._experiment = experiment
+
+        color = experiment.color or "#0078D4"
+        self.colorDot.setStyleSheet(f"""
+            background-color: {color};
+            border-radius: 4px;
+        """)
+        self.nameLabel.setText(experiment.name)
+        self.timeLabel.setText(experiment.created_at.strftime("%Y-%m-%d %H:%M") if experiment.created_at else "")
+
+        self.statusLabel.setText(self._getStatusText(experiment.status))
+        self.statusLabel.setStyleSheet(f"""
+            color: {self._getStatusColor(experiment.status)};
+            font-weight: 500;
+        """)
+
+        template_names = experiment.template_names or []
+        while len(self._pills) < len(template_names):
+            # 使用 CaptionLabel 配合样式表实现高对比度胶囊
+            pill = CaptionLabel(self.templatesContainer)
+            pill.setFixedHeight(self.PILL_HEIGHT)
+            pill.setStyleSheet(f"""
+                QLabel {{
+                    color: rgba(255, 255, 255, 0.95);
+                    background-color: rgba(255, 255, 255, 0.15);
+                    padding: 2px {self.PILL_PADDING}px;
+                    border-radius: 12px;
+                }}
+            """)
+            self.templatesLayout.addWidget(pill)
+            self._pills.append(pill)
+        for i, pill in enumerate(self._pills):
+            if i < len(template_names):
+                pill.setText(template_names[i])
+                pill.show()
+            else:
+                pill.hide()
+        self.templatesContainer.setVisible(bool(template_names))
+
+    @classmethod
+    def measure(cls, experiment: ExperimentResponse) -> CardMetrics:
+        """测量标题和模板胶囊的宽度"""
+        if cls._titleMetrics is None:
+            cls._titleMetrics = QFontMetrics(getFont(20, QFont.DemiBold))
+            cls._captionMetrics = QFontMetrics(getFont(12))
+        segments = tuple(cls._titleMetrics.horizontalAdvance(s) for s in _TITLE_SEGMENT.findall(experiment.name))
+        pills = tuple(
+            cls._captionMetrics.horizontalAdvance(name) + 2 * cls.PILL_PADDING
+            for name in experiment.template_names or []
+        )
+        return CardMetrics(segments, sum(segments), pills)
+
+    @classmethod
+    def heightFor(cls, metrics: CardMetrics, width: int) -> int:
+        """按卡片宽度计算高度（标题按单词换行，模板胶囊按流式布局换行）"""
+        left, top, right, bottom = cls.MARGINS
+        content_width = width - left - right
+
+        # 标题行数
+        title_width = content_width - cls.DOT_SIZE - cls.HEADER_SPACING
+        lines = 1
+        if metrics.title_width > title_width:
+            line = 0
+            for segment in metrics.title_segments:
+                if line and line + segment > title_width:
+                    lines += 1
+                    line = 0
+                line += segment
+        title_height = max(cls.DOT_SIZE, lines * cls._titleMetrics.lineSpacing())
+
+        height = top + title_height + cls.SPACING + 1 + cls.SPACING + cls._captionMetrics.height() + bottom
+
+        # 模板胶囊行数
+        if metrics.pill_widths:
+            rows, x = 1, 0
+            for pill in metrics.pill_widths:
+                if x and x + pill > content_width:
+                    rows += 1
+                    x = 0
+                x += pill + cls.PILL_SPACING
+            height += cls.SPACING + rows * cls.PILL_HEIGHT + (rows - 1) * cls.PILL_SPACING
+        return height
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.cardClicked.emit(self._experiment.id)
@@ -134,6 +221,37 @@ class ExperimentCard(CardWidget):
         return color_map.get(status, "#888888")
 
 
+class ExperimentCardWall(WaterfallView):
+    """实验卡片墙（虚拟化，只为可见的实验创建卡片，滚出的卡片复用）"""
+
+    experimentClicked = Signal(int)  # experiment_id
+
+    def __init__(self, parent=None):
+        super().__init__(parent, columns=3, spacing=16)
+        self._experiments: List[ExperimentResponse] = []
+        self._metrics: List[Optional[CardMetrics]] = []
+
+    def setExperiments(self, experiments: List[ExperimentResponse]):
+        """设置实验列表"""
+        self._experiments = list(experiments)
+        self._metrics = [None] * len(self._experiments)
+        self.setItemCount(len(self._experiments))
+
+    def createItemWidget(self, parent: QWidget) -> QWidget:
+        card = ExperimentCard(parent=parent)
+        card.cardClicked.connect(self.experimentClicked)
+        return card
+
+    def bindItemWidget(self, widget: QWidget, index: int):
+        widget.setExperiment(self._experiments[index])
+
+    def itemHeight(self, index: int, column_width: int) -> int:
+        metrics = self._metrics[index]
+        if metrics is None:
+            metrics = self._metrics[index] = ExperimentCard.measure(self._experiments[index])
+        return ExperimentCard.heightFor(metrics, column_width)
+
+
 class ExperimentCardPage(QWidget):
     """实验卡片页面 - 瀑布流布局"""
 
@@ -147,6 +265,7 @@ class ExperimentCardPage(QWidget):
         self._total = 0
 
         self.setupUI()
+        async_api.cacheUpdated.connect(self._onCacheUpdated)
 
     def setupUI(self):
         layout = QVBoxLayout(self)
@@ -177,56 +296,56 @@ class ExperimentCardPage(QWidget):
 
         layout.addLayout(headerLayout)
 
-        # 滚动区域
-        self.scrollArea = SmoothScrollArea(self)
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scrollArea.setStyleSheet("""
-            SmoothScrollArea {
+        # 卡片墙
+        self.cardWall = ExperimentCardWall(self)
+        self.cardWall.setStyleSheet("""
+            ExperimentCardWall {
                 border: none;
                 background: transparent;
             }
         """)
-
-        # 卡片容器
-        self.cardContainer = QWidget()
-        self.cardContainer.setStyleSheet("background: transparent;")
-        self.waterfallLayout = WaterfallLayout(self.cardContainer, columns=3, spacing=16)
-        self.cardContainer.setLayout(self.waterfallLayout)
-
-        self.scrollArea.setWidget(self.cardContainer)
-        layout.addWidget(self.scrollArea)
+        self.cardWall.experimentClicked.connect(self.experimentClicked)
+        layout.addWidget(self.cardWall)
 
     def loadExperiments(self):
-        """加载实验列表"""
-        try:
-            status = self._getSelectedStatus()
-            result = experiment_api.list(
-                page=self._page,
-                page_size=self._pageSize,
-                status=status
-            )
-
-            self._experiments = result.items
-            self._total = result.total
-
-            self._renderCards()
-
-        except APIError as e:
-            InfoBar.error(
-                title="加载失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
-            )
+        """加载实验列表（状态筛选变化时取消上一次未完成的加载）"""
+        status = self._getSelectedStatus()
+        async_api.fetch(
+            experiment_api.list,
+            page=self._page,
+            page_size=self._pageSize,
+            status=status,
+            owner=self,
+            group="experiments"
+        ).then(self._onExperimentsLoaded, self._onLoadFailed)
+
+    def _onExperimentsLoaded(self, result):
+        """实验列表加载完成"""
+        self._experiments = result.items
+        self._total = result.total
+        self._renderCards()
+
+    def _onLoadFailed(self, error: Exception):
+        """加载失败提示"""
+        InfoBar.error(
+            title="加载失败",
+            content=error_message(error),
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=3000,
+            parent=self
+        )
 
     def refresh(self):
         """刷新数据"""
         self.loadExperiments()
 
+    def _onCacheUpdated(self, path: str):
+        """本地缓存的实验列表经服务端确认后有变化，重新加载（未显示时等 showEvent 加载）"""
+        if path == EXPERIMENTS_PATH and self.isVisible():
+            self.loadExperiments()
+
     def _getSelectedStatus(self) -> str:
         """获取选中状态"""
         idx = self.statusCombo.currentIndex()
@@ -242,33 +361,22 @@ class ExperimentCardPage(QWidget):
 
     def _renderCards(self):
         """渲染卡片"""
-        # 清除现有卡片
-        self._clearCards()
-
-        # 创建卡片
-        for exp in self._experiments:
-            card = ExperimentCard(exp, self)
-            card.cardClicked.connect(lambda eid: self.experimentClicked.emit(eid))
-            self.waterfallLayout.addWidget(card)
-
-    def _clearCards(self):
-        """清除所有卡片"""
-        self.waterfallLayout.clear()
+        self.cardWall.setExperiments(self._experiments)
 
     def resizeEvent(self, event):
         """窗口大小变化时调整列数"""
         super().resizeEvent(event)
-        if hasattr(self, 'waterfallLayout'):
+        if hasattr(self, 'cardWall'):
             # 根据宽度调整列数
             width = self.width()
             if width < 600:
-                self.waterfallLayout.setColumns(1)
+                self.cardWall.setColumns(1)
             elif width < 900:
-                self.waterfallLayout.setColumns(2)
+                self.cardWall.setColumns(2)
             elif width < 1200:
-                self.waterfallLayout.setColumns(3)
+                self.cardWall.setColumns(3)
             else:
-                self.waterfallLayout.setColumns(4)
+                self.cardWall.setColumns(4)
 
     def showEvent(self, event: QShowEvent):
         """页面显示时刷新数据"""
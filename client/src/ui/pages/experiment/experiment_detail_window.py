@@ -9,8 +9,8 @@ from qfluentwidgets import (
     PrimaryPushButton, InfoBar, MessageBoxBase, ComboBox
 )
 
-from api import experiment_api, template_api, customer_api, app_api, APIError
-from models.experiment import ExperimentResponse, ExperimentTemplateLinkRequest
+from api import experiment_api, template_api, customer_api, app_api, async_api, error_message
+from models.experiment import ExperimentFullResponse, ExperimentTemplateLinkRequest
 from .template_detail_panel import TemplateDetailPanel
 
 
@@ -279,17 +279,22 @@ class AddTemplateToExperimentDialog(MessageBoxBase):
 
     def _loadCustomers(self):
         """加载客户列表"""
+        async_api.fetch(customer_api.list, owner=self, group="customers").then(
+            self._onCustomersLoaded,
+            lambda error: InfoBar.error(title="加载失败", content=error_message(error), parent=self, duration=5000)
+        )
+
+    def _onCustomersLoaded(self, customers):
+        """客户列表加载完成"""
         self._loading = True
         try:
-            self._customers = customer_api.list()
+            self._customers = customers
             self.customerCombo.clear()
             self.customerCombo.addItem("请选择客户")
             for c in self._customers:
                 self.customerCombo.addItem(c.name)
             self.customerCombo.setCurrentIndex(0)
             self._loadApps([])
-        except APIError as e:
-            InfoBar.error(title="加载失败", content=e.message, parent=self, duration=5000)
         finally:
             self._loading = False
 
@@ -349,12 +354,11 @@ class AddTemplateToExperimentDialog(MessageBoxBase):
             return
         if index > 0 and index <= len(self._customers):
             customer_id = self._customers[index - 1].id
-            try:
-                apps = app_api.list(customer_id=customer_id)
-                self._loadApps(apps)
-            except APIError:
-                self._loadApps([])
+            async_api.fetch(app_api.list, customer_id=customer_id, owner=self, group="apps").then(
+                self._loadApps, lambda error: self._loadApps([])
+            )
         else:
+            async_api.cancelGroup(self, "apps")
             self._loadApps([])
 
     def _onAppSelected(self, index):
@@ -363,12 +367,11 @@ class AddTemplateToExperimentDialog(MessageBoxBase):
             return
         if index > 0 and index <= len(self._apps):
             app_id = self._apps[index - 1].id
-            try:
-                templates = template_api.list(app_id=app_id)
-                self._loadTemplates(templates)
-            except APIError:
-                self._loadTemplates([])
+            async_api.fetch(template_api.list, app_id=app_id, owner=self, group="templates").then(
+                self._loadTemplates, lambda error: self._loadTemplates([])
+            )
         else:
+            async_api.cancelGroup(self, "templates")
             self._loadTemplates([])
 
     def _onTemplateSelected(self, index):
@@ -392,16 +395,24 @@ class AddTemplateToExperimentDialog(MessageBoxBase):
             InfoBar.warning(title="提示", content="请选择一个模板", parent=self, duration=5000)
             return
 
-        try:
-            # 直接添加新模板（API会处理去重）
-            experiment_api.link_templates(
-                self._experiment_id,
-                ExperimentTemplateLinkRequest(template_ids=[self._selected_template_id])
-            )
-            InfoBar.success(title="成功", content="模板已添加到实验", parent=self)
-            self.accept()
-        except APIError as e:
-            InfoBar.error(title="添加失败", content=e.message, parent=self, duration=5000)
+        # 直接添加新模板（API会处理去重），完成前禁用按钮防止重复提交
+        self.addTemplateBtn.setEnabled(False)
+        async_api.submit(
+            experiment_api.link_templates,
+            self._experiment_id,
+            ExperimentTemplateLinkRequest(template_ids=[self._selected_template_id]),
+            owner=self
+        ).then(self._onTemplateLinked, self._onLinkFailed)
+
+    def _onTemplateLinked(self, result):
+        """模板关联完成"""
+        InfoBar.success(title="成功", content="模板已添加到实验", parent=self)
+        self.accept()
+
+    def _onLinkFailed(self, error: Exception):
+        """模板关联失败"""
+        self.addTemplateBtn.setEnabled(True)
+        InfoBar.error(title="添加失败", content=error_message(error), parent=self, duration=5000)
 
     def validate(self) -> bool:
         return True
@@ -413,7 +424,7 @@ class ExperimentDetailWindow(FluentWindow):
     def __init__(self, experiment_id: int, parent=None):
         super().__init__(parent)
         self._experiment_id = experiment_id
-        self._experiment: ExperimentResponse = None
+        self._experiment: ExperimentFullResponse = None
 
         # 设置为独立窗口（不随主窗口最小化）
         self.setWindowFlags(Qt.Window)
@@ -522,12 +533,16 @@ class ExperimentDetailWindow(FluentWindow):
         return page
 
     def _loadExperiment(self):
-        """加载实验数据"""
-        try:
-            self._experiment = experiment_api.get(self._experiment_id)
-            self._renderContent()
-        except APIError:
-            pass  # TODO: 错误处理
+        """加载实验数据（含各模板的备注和版本，一次请求）"""
+        async_api.fetch(experiment_api.get_full, self._experiment_id, owner=self, group="experiment").then(
+            self._onExperimentLoaded,
+            lambda error: InfoBar.error(title="加载失败", content=error_message(error), parent=self, duration=5000)
+        )
+
+    def _onExperimentLoaded(self, experiment: ExperimentFullResponse):
+        """实验数据加载完成"""
+        self._experiment = experiment
+        self._renderContent()
 
     def _renderContent(self):
         """渲染内容"""
@@ -554,10 +569,12 @@ class ExperimentDetailWindow(FluentWindow):
             template_name = self._experiment.template_names[index]
             template_id = self._experiment.template_ids[index] if index < len(self._experiment.template_ids) else None
             if template_id:
+                detail = self._experiment.templates[index] if index < len(self._experiment.templates) else None
                 self.templateDetailPanel.setTemplate(
                     experiment_id=self._experiment_id,
                     template_id=template_id,
-                    template_name=template_name
+                    template_name=template_name,
+                    detail=detail
                 )
 
     def _onAddTemplateRequested(self):
@@ -1,16 +1,16 @@
 """实验列表页面"""
 
 from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableWidgetItem, QLabel
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QAbstractItemView
 from qfluentwidgets import (
-    SubtitleLabel, TableWidget, PrimaryPushButton, PushButton,
+    SubtitleLabel, TableView, PrimaryPushButton, PushButton,
     LineEdit, ComboBox, InfoBar, InfoBarPosition, MessageBoxBase,
     BodyLabel
 )
 
-from api import experiment_api, customer_api, app_api, template_api, APIError
-from voidview_shared import ExperimentStatus
+from api import experiment_api, customer_api, app_api, template_api, async_api, error_message, EXPERIMENTS_PATH
 from models import ExperimentResponse
+from .experiment_table_model import ExperimentTableModel, ActionDelegate
 
 
 class ExperimentListPage(QWidget):
@@ -18,14 +18,11 @@ class ExperimentListPage(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._page = 1
-        self._pageSize = 20
-        self._total = 0
-        self._experiments = []
         self._customers = []
         self._apps = []
         self._templates = []
         self.setupUI()
+        async_api.cacheUpdated.connect(self._onCacheUpdated)
         self.loadInitialData()
 
     def setupUI(self):
@@ -117,12 +114,17 @@ class ExperimentListPage(QWidget):
 
         layout.addLayout(filterLayout)
 
-        # 实验表格
-        self.table = TableWidget(self)
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "实验名称", "模板", "状态", "参考类型", "创建时间", "操作"
-        ])
+        # 实验表格（无限滚动，按页在后台加载）
+        self.model = ExperimentTableModel(self)
+        self.model.totalChanged.connect(self._onTotalChanged)
+        self.model.loadFailed.connect(self._onLoadFailed)
+        self.model.rowsInserted.connect(self._onViewportChanged)
+        self.model.modelReset.connect(self._onViewportChanged)
+
+        self.table = TableView(self)
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.verticalHeader().hide()
         self.table.setBorderVisible(True)
         self.table.setBorderRadius(8)
@@ -135,6 +137,13 @@ class ExperimentListPage(QWidget):
         self.table.setColumnWidth(3, 100)
         self.table.setColumnWidth(4, 150)
 
+        # 操作列按钮由委托绘制
+        self.actionDelegate = ActionDelegate(self.table)
+        self.actionDelegate.detailClicked.connect(lambda row: self._onActionClicked(row, self.showDetail))
+        self.actionDelegate.deleteClicked.connect(lambda row: self._onActionClicked(row, self.deleteExperiment))
+        self.table.setItemDelegateForColumn(ExperimentTableModel.ACTION_COLUMN, self.actionDelegate)
+        self.table.verticalScrollBar().valueChanged.connect(self._onViewportChanged)
+
         layout.addWidget(self.table)
 
         # 分页信息
@@ -143,97 +152,64 @@ class ExperimentListPage(QWidget):
         layout.addWidget(self.pageInfoLabel)
 
     def loadInitialData(self):
-        """加载初始数据"""
-        try:
-            # 加载客户列表
-            self._customers = customer_api.list()
-            self.customerCombo.clear()
-            self.customerCombo.addItem("全部客户")
-            for c in self._customers:
-                self.customerCombo.addItem(c.name)
-
-            # 加载实验列表
-            self.loadExperiments()
-        except APIError as e:
-            InfoBar.error(
-                title="加载失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
-            )
-
-    def loadExperiments(self):
-        """加载实验列表"""
-        try:
-            # 获取筛选条件
-            template_id = self._getSelectedTemplateId()
-            status = self._getSelectedStatus()
-
-            result = experiment_api.list(
-                page=self._page,
-                page_size=self._pageSize,
-                template_id=template_id,
-                status=status
-            )
-
-            self._experiments = result.items
-            self._total = result.total
-
-            # 更新表格
-            self.table.setRowCount(len(self._experiments))
-
-            for row, exp in enumerate(self._experiments):
-                # 实验名称
-                self.table.setItem(row, 0, QTableWidgetItem(exp.name))
-
-                # 模板 (需要从 template_id 获取，暂时显示 ID)
-                self.table.setItem(row, 1, QTableWidgetItem(f"模板#{exp.template_id}"))
-
-                # 状态
-                statusText = self._getStatusText(exp.status)
-                self.table.setItem(row, 2, QTableWidgetItem(statusText))
-
-                # 参考类型
-                refText = self._getReferenceText(exp.reference_type)
-                self.table.setItem(row, 3, QTableWidgetItem(refText))
-
-                # 创建时间
-                createdAt = exp.created_at.strftime("%Y-%m-%d %H:%M") if exp.created_at else ""
-                self.table.setItem(row, 4, QTableWidgetItem(createdAt))
-
-                # 操作按钮
-                actionWidget = QWidget()
-                actionLayout = QHBoxLayout(actionWidget)
-                actionLayout.setContentsMargins(0, 0, 0, 0)
-
-                detailBtn = PushButton(actionWidget)
-                detailBtn.setText("详情")
-                detailBtn.clicked.connect(lambda checked, eid=exp.id: self.showDetail(eid))
-                actionLayout.addWidget(detailBtn)
-
-                deleteBtn = PushButton(actionWidget)
-                deleteBtn.setText("删除")
-                deleteBtn.clicked.connect(lambda checked, eid=exp.id: self.deleteExperiment(eid))
-                actionLayout.addWidget(deleteBtn)
-
-                self.table.setCellWidget(row, 5, actionWidget)
+        """加载初始数据（客户列表和实验列表并行加载）"""
+        async_api.fetch(customer_api.list, owner=self, group="customers").then(
+            self._onCustomersLoaded, self._onLoadFailed
+        )
+        self.loadExperiments()
 
-            # 更新分页信息
-            self.pageInfoLabel.setText(f"共 {self._total} 条记录")
+    def _onCustomersLoaded(self, customers):
+        """客户列表加载完成"""
+        self._customers = customers
+        self.customerCombo.clear()
+        self.customerCombo.addItem("全部客户")
+        for c in self._customers:
+            self.customerCombo.addItem(c.name)
+
+    def _onLoadFailed(self, error: Exception):
+        """加载失败提示"""
+        InfoBar.error(
+            title="加载失败",
+            content=error_message(error),
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=3000,
+            parent=self
+        )
 
-        except APIError as e:
-            InfoBar.error(
-                title="加载失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
-            )
+    def loadExperiments(self):
+        """按筛选条件从第一页重新加载实验列表"""
+        self.model.setFilters(template_id=self._getSelectedTemplateId(), status=self._getSelectedStatus())
+
+    def _onCacheUpdated(self, path: str):
+        """本地缓存的实验列表经服务端确认后有变化，刷新已加载的页"""
+        if path == EXPERIMENTS_PATH:
+            self.model.refresh()
+
+    def _onViewportChanged(self, *args):
+        """滚动或行数变化：预取视口附近的页"""
+        first = self.table.rowAt(0)
+        if first < 0:
+            first = 0
+        last = self.table.rowAt(self.table.viewport().height() - 1)
+        if last < 0:
+            last = self.model.rowCount() - 1
+        self.model.prefetch(first, last)
+
+    def _onTotalChanged(self, total: int):
+        """更新记录数"""
+        self.pageInfoLabel.setText(f"共 {total} 条记录")
+
+    def _onActionClicked(self, row: int, action):
+        """操作列按钮点击"""
+        experiment = self.model.experimentAt(row)
+        if experiment is not None:
+            action(experiment.id)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._onViewportChanged()
 
     def _getSelectedTemplateId(self) -> int:
         """获取选中的模板ID"""
@@ -250,71 +226,57 @@ class ExperimentListPage(QWidget):
             return statuses[idx]
         return None
 
-    def _getStatusText(self, status) -> str:
-        """获取状态文本"""
-        statusMap = {
-            ExperimentStatus.DRAFT: "草稿",
-            ExperimentStatus.RUNNING: "进行中",
-            ExperimentStatus.COMPLETED: "已完成",
-            ExperimentStatus.ARCHIVED: "已归档",
-        }
-        return statusMap.get(status, str(status))
-
-    def _getReferenceText(self, refType) -> str:
-        """获取参考类型文本"""
-        refMap = {
-            "supplier": "供应商对齐",
-            "self": "自对齐",
-            "new": "全新模板",
-        }
-        return refMap.get(str(refType.value) if hasattr(refType, 'value') else str(refType), str(refType))
-
     def onCustomerChanged(self, index):
         """客户选择改变"""
         if index > 0 and index <= len(self._customers):
             customer_id = self._customers[index - 1].id
-            try:
-                self._apps = app_api.list(customer_id=customer_id)
-                self.appCombo.clear()
-                self.appCombo.addItem("全部应用")
-                for a in self._apps:
-                    self.appCombo.addItem(a.name)
-            except APIError:
-                pass
-        else:
-            self.appCombo.clear()
-            self.appCombo.addItem("全部应用")
-            self._apps = []
+            async_api.fetch(app_api.list, customer_id=customer_id, owner=self, group="apps").then(
+                self._onAppsLoaded, lambda error: self.onAppChanged(0)
+            )
+            return
+
+        # 切回"全部客户"时丢弃仍在加载的应用列表
+        async_api.cancelGroup(self, "apps")
+        self.appCombo.clear()
+        self.appCombo.addItem("全部应用")
+        self._apps = []
+        self.onAppChanged(0)
 
+    def _onAppsLoaded(self, apps):
+        """应用列表加载完成"""
+        self._apps = apps
+        self.appCombo.clear()
+        self.appCombo.addItem("全部应用")
+        for a in self._apps:
+            self.appCombo.addItem(a.name)
         self.onAppChanged(0)
 
     def onAppChanged(self, index):
         """应用选择改变"""
         if index > 0 and index <= len(self._apps):
             app_id = self._apps[index - 1].id
-            try:
-                self._templates = template_api.list(app_id=app_id)
-                self.templateCombo.clear()
-                self.templateCombo.addItem("全部模板")
-                for t in self._templates:
-                    self.templateCombo.addItem(t.name)
-            except APIError:
-                pass
-        else:
-            self.templateCombo.clear()
-            self.templateCombo.addItem("全部模板")
-            self._templates = []
+            async_api.fetch(template_api.list, app_id=app_id, owner=self, group="templates").then(
+                self._onTemplatesLoaded, lambda error: self.onFilterChanged(0)
+            )
+            return
 
+        async_api.cancelGroup(self, "templates")
+        self.templateCombo.clear()
+        self.templateCombo.addItem("全部模板")
+        self._templates = []
+        self.onFilterChanged(0)
+
+    def _onTemplatesLoaded(self, templates):
+        """模板列表加载完成"""
+        self._templates = templates
+        self.templateCombo.clear()
+        self.templateCombo.addItem("全部模板")
+        for t in self._templates:
+            self.templateCombo.addItem(t.name)
         self.onFilterChanged(0)
 
     def onFilterChanged(self, index):
         """筛选条件改变"""
-        self._page = 1
-        self.loadExperiments()
-
-    def onPageChanged(self, page):
-        """页码改变"""
-        self._page = page
         self.loadExperiments()
 
     def showDetail(self, experiment_id: int):
@@ -335,56 +297,64 @@ class ExperimentListPage(QWidget):
 
         box = MessageBox("确认删除", "确定要删除该实验吗？此操作不可恢复。", self)
         if box.exec():
-            try:
-                experiment_api.delete(experiment_id)
-                InfoBar.success(
-                    title="成功",
-                    content="实验已删除",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-                self.loadExperiments()
-            except APIError as e:
-                InfoBar.error(
+            async_api.submit(experiment_api.delete, experiment_id, owner=self).then(
+                lambda result: self._onExperimentDeleted(),
+                lambda error: InfoBar.error(
                     title="删除失败",
-                    content=e.message,
+                    content=error_message(error),
                     orient=Qt.Horizontal,
                     isClosable=True,
                     position=InfoBarPosition.TOP,
                     duration=3000,
                     parent=self
                 )
+            )
+
+    def _onExperimentDeleted(self):
+        """实验删除完成"""
+        InfoBar.success(
+            title="成功",
+            content="实验已删除",
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=2000,
+            parent=self
+        )
+        # 刷新已加载的页，保持滚动位置
+        self.model.refresh()
 
     def showCreateDialog(self):
         """显示创建实验对话框"""
         dialog = CreateExperimentDialog(self._templates, self)
         if dialog.exec():
             data = dialog.getData()
-            try:
-                experiment_api.create(data)
-                InfoBar.success(
-                    title="成功",
-                    content=f"实验 '{data.name}' 创建成功",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-                self.loadExperiments()
-            except APIError as e:
-                InfoBar.error(
+            async_api.submit(experiment_api.create, data, owner=self).then(
+                lambda experiment: self._onExperimentCreated(data.name),
+                lambda error: InfoBar.error(
                     title="创建失败",
-                    content=e.message,
+                    content=error_message(error),
                     orient=Qt.Horizontal,
                     isClosable=True,
                     position=InfoBarPosition.TOP,
                     duration=3000,
                     parent=self
                 )
+            )
+
+    def _onExperimentCreated(self, name: str):
+        """实验创建完成"""
+        InfoBar.success(
+            title="成功",
+            content=f"实验 '{name}' 创建成功",
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=2000,
+            parent=self
+        )
+        # 刷新已加载的页，保持滚动位置
+        self.model.refresh()
 
     def showCustomerDialog(self):
         """显示客户管理对话框"""
@@ -602,24 +572,44 @@ class CustomerManageDialog(MessageBoxBase):
 
     def _loadCustomers(self):
         """加载客户列表"""
-        try:
-            self._customers = customer_api.list()
-            self.customerCombo.clear()
-            self.customerCombo.setPlaceholderText("选择客户")
-            for c in self._customers:
-                self.customerCombo.addItem(c.name)
-            self._loadApps([])
-            self._loadTemplates([])
-        except APIError as e:
-            InfoBar.error(
-                title="加载失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
-            )
+        async_api.fetch(customer_api.list, owner=self, group="customers").then(
+            self._onCustomersLoaded,
+            lambda error: self._showError("加载失败", error)
+        )
+
+    def _onCustomersLoaded(self, customers):
+        """客户列表加载完成"""
+        self._customers = customers
+        self.customerCombo.clear()
+        self.customerCombo.setPlaceholderText("选择客户")
+        for c in self._customers:
+            self.customerCombo.addItem(c.name)
+        self._loadApps([])
+        self._loadTemplates([])
+
+    def _showError(self, title: str, error: Exception):
+        """错误提示"""
+        InfoBar.error(
+            title=title,
+            content=error_message(error),
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=3000,
+            parent=self
+        )
+
+    def _showSuccess(self, content: str):
+        """成功提示"""
+        InfoBar.success(
+            title="成功",
+            content=content,
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=2000,
+            parent=self
+        )
 
     def _loadApps(self, apps):
         """加载应用列表"""
@@ -642,24 +632,22 @@ class CustomerManageDialog(MessageBoxBase):
         """选择客户"""
         if index >= 0 and index < len(self._customers):
             customer_id = self._customers[index].id
-            try:
-                apps = app_api.list(customer_id=customer_id)
-                self._loadApps(apps)
-            except APIError:
-                self._loadApps([])
+            async_api.fetch(app_api.list, customer_id=customer_id, owner=self, group="apps").then(
+                self._loadApps, lambda error: self._loadApps([])
+            )
         else:
+            async_api.cancelGroup(self, "apps")
             self._loadApps([])
 
     def onAppSelected(self, index):
         """选择应用"""
         if index >= 0 and index < len(self._apps):
             app_id = self._apps[index].id
-            try:
-                templates = template_api.list(app_id=app_id)
-                self._loadTemplates(templates)
-            except APIError:
-                self._loadTemplates([])
+            async_api.fetch(template_api.list, app_id=app_id, owner=self, group="templates").then(
+                self._loadTemplates, lambda error: self._loadTemplates([])
+            )
         else:
+            async_api.cancelGroup(self, "templates")
             self._loadTemplates([])
 
     def createCustomer(self):
@@ -677,30 +665,17 @@ class CustomerManageDialog(MessageBoxBase):
             )
             return
 
-        try:
-            from models import CustomerCreateRequest
-            customer_api.create(CustomerCreateRequest(name=name))
-            InfoBar.success(
-                title="成功",
-                content=f"客户 '{name}' 创建成功",
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=2000,
-                parent=self
-            )
-            self.customerNameEdit.clear()
-            self._loadCustomers()
-        except APIError as e:
-            InfoBar.error(
-                title="创建失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
-            )
+        from models import CustomerCreateRequest
+        async_api.submit(customer_api.create, CustomerCreateRequest(name=name), owner=self).then(
+            lambda customer: self._onCustomerCreated(name),
+            lambda error: self._showError("创建失败", error)
+        )
+
+    def _onCustomerCreated(self, name: str):
+        """客户创建完成"""
+        self._showSuccess(f"客户 '{name}' 创建成功")
+        self.customerNameEdit.clear()
+        self._loadCustomers()
 
     def createApp(self):
         """创建应用"""
@@ -742,33 +717,21 @@ class CustomerManageDialog(MessageBoxBase):
             )
             return
 
-        try:
-            from models import AppCreateRequest
-            customer_id = self._customers[customer_idx].id
-            app_api.create(AppCreateRequest(customer_id=customer_id, name=name))
-            InfoBar.success(
-                title="成功",
-                content=f"应用 '{name}' 创建成功",
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=2000,
-                parent=self
-            )
-            self.appNameEdit.clear()
-            # 刷新应用列表
-            apps = app_api.list(customer_id=customer_id)
-            self._loadApps(apps)
-        except APIError as e:
-            InfoBar.error(
-                title="创建失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
-            )
+        from models import AppCreateRequest
+        customer_id = self._customers[customer_idx].id
+        async_api.submit(app_api.create, AppCreateRequest(customer_id=customer_id, name=name), owner=self).then(
+            lambda app: self._onAppCreated(customer_id, name),
+            lambda error: self._showError("创建失败", error)
+        )
+
+    def _onAppCreated(self, customer_id: int, name: str):
+        """应用创建完成"""
+        self._showSuccess(f"应用 '{name}' 创建成功")
+        self.appNameEdit.clear()
+        # 刷新应用列表
+        async_api.fetch(app_api.list, customer_id=customer_id, owner=self, group="apps").then(
+            self._loadApps, lambda error: self._showError("加载失败", error)
+        )
 
     def createTemplate(self):
         """创建模板"""
@@ -810,33 +773,21 @@ class CustomerManageDialog(MessageBoxBase):
             )
             return
 
-        try:
-            from models import TemplateCreateRequest
-            app_id = self._apps[app_idx].id
-            template_api.create(TemplateCreateRequest(app_id=app_id, name=name))
-            InfoBar.success(
-                title="成功",
-                content=f"模板 '{name}' 创建成功",
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=2000,
-                parent=self
-            )
-            self.templateNameEdit.clear()
-            # 刷新模板列表
-            templates = template_api.list(app_id=app_id)
-            self._loadTemplates(templates)
-        except APIError as e:
-            InfoBar.error(
-                title="创建失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
-            )
+        from models import TemplateCreateRequest
+        app_id = self._apps[app_idx].id
+        async_api.submit(template_api.create, TemplateCreateRequest(app_id=app_id, name=name), owner=self).then(
+            lambda template: self._onTemplateCreated(app_id, name),
+            lambda error: self._showError("创建失败", error)
+        )
+
+    def _onTemplateCreated(self, app_id: int, name: str):
+        """模板创建完成"""
+        self._showSuccess(f"模板 '{name}' 创建成功")
+        self.templateNameEdit.clear()
+        # 刷新模板列表
+        async_api.fetch(template_api.list, app_id=app_id, owner=self, group="templates").then(
+            self._loadTemplates, lambda error: self._showError("加载失败", error)
+        )
 
     def validate(self) -> bool:
         """验证 - 直接关闭"""
@@ -0,0 +1,242 @@
+"""实验表格模型 - 无限滚动
+
+行数为服务端返回的总数，数据按页在后台加载：
+- 视图滚动时调用 prefetch，加载视口所在页及前后各 PREFETCH_PAGES 页
+- 距视口超过 KEEP_PAGES 页的数据释放，滚回来时重新加载（通常命中实体缓存）
+- 未加载的行显示占位文本，data() 从不等待网络
+"""
+
+from typing import Dict, List, Optional, Set
+
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex, QRect, QEvent
+from PySide6.QtGui import QColor, QPainter
+from qfluentwidgets import TableItemDelegate, isDarkTheme
+
+from api import experiment_api, async_api
+from models import ExperimentResponse
+from voidview_shared import ExperimentStatus
+
+
+class ExperimentTableModel(QAbstractTableModel):
+    """实验表格模型"""
+
+    totalChanged = Signal(int)
+    loadFailed = Signal(object)  # 异常
+
+    PAGE_SIZE = 100  # 服务端单页上限
+    PREFETCH_PAGES = 1
+    KEEP_PAGES = 5
+    HEADERS = ["实验名称", "模板", "状态", "参考类型", "创建时间", "操作"]
+    ACTION_COLUMN = 5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._total = 0
+        self._pages: Dict[int, List[ExperimentResponse]] = {}  # 页号（从 0 开始）-> 实验
+        self._loading: Set[int] = set()
+        self._failed: Set[int] = set()  # 加载失败的页，刷新或筛选变化前不再自动重试
+        self._filters = {}
+        # 筛选变化或刷新后递增，旧请求的结果丢弃
+        self._generation = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._total
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        experiment = self.experimentAt(index.row())
+        column = index.column()
+        if experiment is None:
+            return "加载中..." if column == 0 else ""
+        if column == 0:
+            return experiment.name
+        if column == 1:
+            return "、".join(experiment.template_names)
+        if column == 2:
+            return self.statusText(experiment.status)
+        if column == 3:
+            return self.referenceText(experiment.reference_type)
+        if column == 4:
+            return experiment.created_at.strftime("%Y-%m-%d %H:%M") if experiment.created_at else ""
+        return None
+
+    def total(self) -> int:
+        return self._total
+
+    def experimentAt(self, row: int) -> Optional[ExperimentResponse]:
+        """已加载的实验，未加载时返回 None"""
+        items = self._pages.get(row // self.PAGE_SIZE)
+        offset = row % self.PAGE_SIZE
+        if items is None or offset >= len(items):
+            return None
+        return items[offset]
+
+    def setFilters(self, template_id: int = None, status: str = None):
+        """设置筛选条件，从第一页重新加载"""
+        self.beginResetModel()
+        self._filters = {"template_id": template_id, "status": status}
+        self._generation += 1
+        self._pages.clear()
+        self._loading.clear()
+        self._failed.clear()
+        self._total = 0
+        self.endResetModel()
+        self.totalChanged.emit(0)
+        self._fetchPage(0)
+
+    def refresh(self):
+        """重新加载已加载的页，新数据返回前保留当前显示"""
+        self._generation += 1
+        self._loading.clear()
+        self._failed.clear()
+        for page in sorted(self._pages) or [0]:
+            self._fetchPage(page)
+
+    def prefetch(self, first_row: int, last_row: int):
+        """视口显示 [first_row, last_row]：加载附近的页，释放远处的页"""
+        if self._total == 0:
+            return
+        first_page = max(0, first_row) // self.PAGE_SIZE
+        last_page = max(first_row, last_row) // self.PAGE_SIZE
+        page_count = (self._total + self.PAGE_SIZE - 1) // self.PAGE_SIZE
+
+        for page in range(first_page - self.PREFETCH_PAGES, last_page + self.PREFETCH_PAGES + 1):
+            if 0 <= page < page_count and page not in self._pages \
+                    and page not in self._loading and page not in self._failed:
+                self._fetchPage(page)
+
+        for page in list(self._pages):
+            if page < first_page - self.KEEP_PAGES or page > last_page + self.KEEP_PAGES:
+                del self._pages[page]
+
+    def _fetchPage(self, page: int):
+        self._loading.add(page)
+        generation = self._generation
+        async_api.fetch(
+            experiment_api.list,
+            page=page + 1,
+            page_size=self.PAGE_SIZE,
+            owner=self,
+            group=("page", page),
+            **self._filters
+        ).then(
+            lambda result: self._onPageLoaded(generation, page, result),
+            lambda error: self._onPageFailed(generation, page, error)
+        )
+
+    def _onPageLoaded(self, generation: int, page: int, result):
+        if generation != self._generation:
+            return
+        self._loading.discard(page)
+        self._setTotal(result.total)
+        self._pages[page] = result.items
+
+        first = page * self.PAGE_SIZE
+        last = min(first + self.PAGE_SIZE, self._total) - 1
+        if last >= first:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+
+    def _onPageFailed(self, generation: int, page: int, error: Exception):
+        if generation != self._generation:
+            return
+        self._loading.discard(page)
+        self._failed.add(page)
+        self.loadFailed.emit(error)
+
+    def _setTotal(self, total: int):
+        """总数变化时插入或删除末尾的行"""
+        if total == self._total:
+            return
+        if total > self._total:
+            self.beginInsertRows(QModelIndex(), self._total, total - 1)
+            self._total = total
+            self.endInsertRows()
+        else:
+            self.beginRemoveRows(QModelIndex(), total, self._total - 1)
+            self._total = total
+            last_page = (total - 1) // self.PAGE_SIZE
+            for page in [page for page in self._pages if page > last_page]:
+                del self._pages[page]
+            self.endRemoveRows()
+        self.totalChanged.emit(total)
+
+    @staticmethod
+    def statusText(status) -> str:
+        """获取状态文本"""
+        statusMap = {
+            ExperimentStatus.DRAFT: "草稿",
+            ExperimentStatus.RUNNING: "进行中",
+            ExperimentStatus.COMPLETED: "已完成",
+            ExperimentStatus.ARCHIVED: "已归档",
+        }
+        return statusMap.get(status, str(status))
+
+    @staticmethod
+    def referenceText(refType) -> str:
+        """获取参考类型文本"""
+        refMap = {
+            "supplier": "供应商对齐",
+            "self": "自对齐",
+            "new": "全新模板",
+        }
+        return refMap.get(str(refType.value) if hasattr(refType, 'value') else str(refType), str(refType))
+
+
+class ActionDelegate(TableItemDelegate):
+    """操作列：绘制“详情”“删除”按钮（不为每行创建按钮控件）"""
+
+    detailClicked = Signal(int)  # 行
+    deleteClicked = Signal(int)
+
+    BUTTONS = ["详情", "删除"]
+    BUTTON_WIDTH = 56
+    BUTTON_HEIGHT = 28
+    BUTTON_SPACING = 8
+
+    def paint(self, painter: QPainter, option, index: QModelIndex):
+        super().paint(painter, option, index)
+        if index.model().experimentAt(index.row()) is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        dark = isDarkTheme()
+        painter.setPen(QColor(255, 255, 255, 40) if dark else QColor(0, 0, 0, 30))
+        painter.setBrush(QColor(255, 255, 255, 15) if dark else QColor(255, 255, 255, 180))
+        for rect in self._buttonRects(option.rect):
+            painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 5, 5)
+        painter.setPen(QColor(255, 255, 255) if dark else QColor(0, 0, 0))
+        for text, rect in zip(self.BUTTONS, self._buttonRects(option.rect)):
+            painter.drawText(rect, Qt.AlignCenter, text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton \
+                and model.experimentAt(index.row()) is not None:
+            detailRect, deleteRect = self._buttonRects(option.rect)
+            pos = event.position().toPoint()
+            if detailRect.contains(pos):
+                self.detailClicked.emit(index.row())
+                return True
+            if deleteRect.contains(pos):
+                self.deleteClicked.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def _buttonRects(self, rect: QRect) -> List[QRect]:
+        y = rect.y() + (rect.height() - self.BUTTON_HEIGHT) // 2
+        x = rect.x() + 8
+        rects = []
+        for _ in self.BUTTONS:
+            rects.append(QRect(x, y, self.BUTTON_WIDTH, self.BUTTON_HEIGHT))
+            x += self.BUTTON_WIDTH + self.BUTTON_SPACING
+        return rects
@@ -8,9 +8,10 @@ from qfluentwidgets import (
     TransparentToolButton, MessageBoxBase, LineEdit, InfoBar
 )
 
-from api import version_api, APIError
+from api import version_api, async_api, error_message
 from models.experiment import (
-    TemplateVersionResponse, TemplateVersionCreateRequest, TemplateVersionUpdateRequest
+    TemplateVersionHeader, TemplateVersionResponse, TemplateVersionCreateRequest, TemplateVersionUpdateRequest,
+    ExperimentTemplateDetail
 )
 from .template_info_pages import BasicInfoPage, VersionTabPage
 
@@ -286,12 +287,13 @@ class TemplateDetailPanel(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._versions: List[TemplateVersionResponse] = []  # 版本列表（从 API 加载）
+        self._versions: List[TemplateVersionHeader] = []  # 版本列表（预加载的只有概要）
         self._version_pages: List[VersionTabPage] = []  # 版本页面列表
         self._current_index = 0
         self._experiment_id: Optional[int] = None
         self._template_id: Optional[int] = None
         self._basic_notes: str = ""  # 基础信息备注
+        self._detail: Optional[ExperimentTemplateDetail] = None  # 实验详情中预加载的数据
         self.setupUI()
 
     def setupUI(self):
@@ -326,17 +328,50 @@ class TemplateDetailPanel(QWidget):
         """基础信息备注变化"""
         if self._experiment_id is None or self._template_id is None:
             return
-        try:
-            version_api.update_notes(self._experiment_id, self._template_id, notes)
+        # 保存期间可能已切换到其他模板，回调时只更新发起保存的那份数据
+        key, detail = (self._experiment_id, self._template_id), self._detail
+        async_api.submit(
+            version_api.update_notes, self._experiment_id, self._template_id, notes, owner=self
+        ).then(
+            lambda result: self._onBasicNotesSaved(key, detail, notes),
+            self._onSaveFailed
+        )
+
+    def _onBasicNotesSaved(self, key: tuple, detail: Optional[ExperimentTemplateDetail], notes: str):
+        """基础信息备注保存完成"""
+        if detail is not None:
+            detail.notes = notes
+        if key == (self._experiment_id, self._template_id):
             self._basic_notes = notes
-        except APIError as e:
-            InfoBar.error(title="保存失败", content=e.message, parent=self, duration=5000)
+
+    def _onSaveFailed(self, error: Exception):
+        """保存失败提示"""
+        InfoBar.error(title="保存失败", content=error_message(error), parent=self, duration=5000)
 
     def _onTabClicked(self, index: int):
         """标签点击"""
         self._current_index = index
         self.stackedWidget.setCurrentIndex(index)
         self.tabBar.setCurrentIndex(index)
+        if index > 0:
+            self._loadVersionContent(self._version_pages[index - 1])
+
+    def _loadVersionContent(self, page: VersionTabPage):
+        """预加载的版本只有概要，打开版本页时再获取模板配置"""
+        if not page.needsContent():
+            return
+        # 不分组：切换版本页不取消其他版本的加载；相同版本的请求由 fetch 合并
+        async_api.fetch(version_api.get, page.versionId(), owner=self).then(
+            self._onVersionContentLoaded,
+            lambda error: InfoBar.error(title="加载版本失败", content=error_message(error), parent=self, duration=5000)
+        )
+
+    def _onVersionContentLoaded(self, version: TemplateVersionResponse):
+        """模板配置加载完成（期间可能已切换模板，按版本 ID 查找页面）"""
+        self._replaceVersion(version)
+        for page in self._version_pages:
+            if page.versionId() == version.id and page.needsContent():
+                page.set_version(version)
 
     def _onAddVersion(self):
         """添加新版本"""
@@ -351,30 +386,35 @@ class TemplateDetailPanel(QWidget):
         dialog = AddVersionDialog(default_name, self)
         if dialog.exec():
             version_name = dialog.get_version_name()
-            try:
-                # 调用 API 创建版本
-                new_version = version_api.create(
-                    experiment_id=self._experiment_id,
-                    template_id=self._template_id,
-                    data=TemplateVersionCreateRequest(name=version_name)
-                )
-                self._versions.append(new_version)
-
-                # 创建版本页面
-                page = self._createVersionPage(new_version)
-                self._version_pages.append(page)
-                self.stackedWidget.addWidget(page)
-
-                # 添加标签
-                index = self.tabBar.addTab(f"版本 {version_name}")
-
-                # 切换到新标签
-                self._current_index = index
-                self.stackedWidget.setCurrentIndex(index)
-                self.tabBar.setCurrentIndex(index)
-
-            except APIError as e:
-                InfoBar.error(title="创建失败", content=e.message, parent=self, duration=5000)
+            # 调用 API 创建版本；切换模板后旧模板的创建结果不再加到当前标签栏
+            async_api.submit(
+                version_api.create,
+                experiment_id=self._experiment_id,
+                template_id=self._template_id,
+                data=TemplateVersionCreateRequest(name=version_name),
+                owner=self,
+                group="template"
+            ).then(
+                self._onVersionCreated,
+                lambda error: InfoBar.error(title="创建失败", content=error_message(error), parent=self, duration=5000)
+            )
+
+    def _onVersionCreated(self, new_version: TemplateVersionResponse):
+        """版本创建完成"""
+        self._versions.append(new_version)
+
+        # 创建版本页面
+        page = self._createVersionPage(new_version)
+        self._version_pages.append(page)
+        self.stackedWidget.addWidget(page)
+
+        # 添加标签
+        index = self.tabBar.addTab(f"版本 {new_version.name}")
+
+        # 切换到新标签
+        self._current_index = index
+        self.stackedWidget.setCurrentIndex(index)
+        self.tabBar.setCurrentIndex(index)
 
     def _createVersionPage(self, version: TemplateVersionResponse) -> VersionTabPage:
         """创建版本页面"""
@@ -386,53 +426,73 @@ class TemplateDetailPanel(QWidget):
 
     def _onVersionNotesChanged(self, version_id: int, notes: str):
         """版本备注变化"""
-        try:
-            version_api.update(version_id, TemplateVersionUpdateRequest(notes=notes))
-        except APIError as e:
-            InfoBar.error(title="保存失败", content=e.message, parent=self, duration=5000)
+        async_api.submit(
+            version_api.update, version_id, TemplateVersionUpdateRequest(notes=notes), owner=self
+        ).then(self._replaceVersion, self._onSaveFailed)
 
     def _onVersionTemplateChanged(self, version_id: int, template_content: str):
         """版本模板配置变化"""
-        try:
-            version_api.update(version_id, TemplateVersionUpdateRequest(template_content=template_content))
-        except APIError as e:
-            InfoBar.error(title="保存失败", content=e.message, parent=self, duration=5000)
+        async_api.submit(
+            version_api.update, version_id, TemplateVersionUpdateRequest(template_content=template_content), owner=self
+        ).then(self._replaceVersion, self._onSaveFailed)
+
+    def _replaceVersion(self, version: TemplateVersionResponse):
+        """用保存或加载后的版本替换列表中的旧数据（列表可能与预加载数据共享）"""
+        for i, existing in enumerate(self._versions):
+            if existing.id == version.id:
+                self._versions[i] = version
+                break
 
     def _loadVersions(self):
-        """从 API 加载版本列表"""
+        """加载备注和版本列表（有预加载数据时直接使用，否则从 API 加载）"""
         if self._experiment_id is None or self._template_id is None:
             return
 
-        try:
-            # 加载基础信息备注
-            self._basic_notes = version_api.get_notes(self._experiment_id, self._template_id)
-            self._basicInfoPage.set_data(self._experiment_id, self._template_id, self._basic_notes)
-
-            # 加载版本列表
-            self._versions = version_api.list(
-                experiment_id=self._experiment_id,
-                template_id=self._template_id
-            )
-
-            # 创建版本标签页
-            for version in self._versions:
-                page = self._createVersionPage(version)
-                self._version_pages.append(page)
-                self.stackedWidget.addWidget(page)
-                self.tabBar.addTab(f"版本 {version.name}")
-
-        except APIError as e:
-            InfoBar.error(title="加载版本失败", content=e.message, parent=self, duration=5000)
+        if self._detail is not None:
+            # 取消上一个模板未完成的加载
+            async_api.cancelGroup(self, "template")
+            self._showVersions(self._detail.notes, self._detail.versions)
+            return
 
-    def setTemplate(self, experiment_id: int, template_id: int, template_name: str):
-        """设置当前模板"""
+        experiment_id, template_id = self._experiment_id, self._template_id
+
+        def load():
+            notes = version_api.get_notes(experiment_id, template_id)
+            versions = version_api.list(experiment_id=experiment_id, template_id=template_id)
+            return notes, versions
+
+        async_api.fetch(load, owner=self, group="template").then(
+            lambda result: self._showVersions(*result),
+            lambda error: InfoBar.error(title="加载版本失败", content=error_message(error), parent=self, duration=5000)
+        )
+
+    def _showVersions(self, notes: str, versions: List[TemplateVersionHeader]):
+        """显示备注和版本标签页"""
+        self._basic_notes = notes
+        self._versions = versions
+        self._basicInfoPage.set_data(self._experiment_id, self._template_id, self._basic_notes)
+
+        # 创建版本标签页
+        for version in self._versions:
+            page = self._createVersionPage(version)
+            self._version_pages.append(page)
+            self.stackedWidget.addWidget(page)
+            self.tabBar.addTab(f"版本 {version.name}")
+
+    def setTemplate(self, experiment_id: int, template_id: int, template_name: str,
+                    detail: Optional[ExperimentTemplateDetail] = None):
+        """设置当前模板
+
+        detail 为实验详情中预加载的备注和版本，传入时不再单独请求。
+        """
         # 保存实验和模板 ID
         self._experiment_id = experiment_id
         self._template_id = template_id
+        self._detail = detail
 
-        # 清除现有版本标签页（保留基础信息）
-        while len(self._versions) > 0:
-            self._versions.pop()
+        # 清除现有版本标签页（保留基础信息）；版本列表可能属于预加载数据，不能原地清空
+        self._versions = []
+        while len(self._version_pages) > 0:
             self._version_pages.pop()
             # 移除最后一个标签（从后往前移除）
             self.tabBar.removeTab(len(self.tabBar._buttons) - 1)
@@ -446,5 +506,5 @@ class TemplateDetailPanel(QWidget):
         self.stackedWidget.setCurrentIndex(0)
         self.tabBar.setCurrentIndex(0)
 
-        # 从 API 加载版本列表
+        # 加载备注和版本列表
         self._loadVersions()
@@ -6,7 +6,7 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout
 from qfluentwidgets import SubtitleLabel
 
 from .editable_field import EditableField
-from models.experiment import TemplateVersionResponse
+from models.experiment import TemplateVersionHeader, TemplateVersionResponse
 
 
 class BasicInfoPage(QWidget):
@@ -63,7 +63,8 @@ class BasicInfoPage(QWidget):
 class VersionTabPage(QWidget):
     """版本标签页
 
-    显示特定版本的备注和模板配置
+    显示特定版本的备注和模板配置；只有版本概要时模板配置显示为加载中，
+    由面板按需获取完整版本后再次 set_version
     """
 
     notesChanged = Signal(int, str)  # (version_id, notes)
@@ -71,7 +72,7 @@ class VersionTabPage(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._version: Optional[TemplateVersionResponse] = None
+        self._version: Optional[TemplateVersionHeader] = None
         self.setupUI()
 
     def setupUI(self):
@@ -108,12 +109,22 @@ class VersionTabPage(QWidget):
 
         layout.addStretch()
 
-    def set_version(self, version: TemplateVersionResponse):
-        """设置版本数据"""
+    def set_version(self, version: TemplateVersionHeader):
+        """设置版本数据（概要或含模板配置的完整版本）"""
         self._version = version
-        # 从版本对象获取 notes 和 template_content
         self.notesField.setContent(version.notes or "")
-        self.templateField.setContent(version.template_content or "")
+        if isinstance(version, TemplateVersionResponse):
+            self.templateField.setLoading(False)
+            self.templateField.setContent(version.template_content or "")
+        else:
+            self.templateField.setLoading(True)
+
+    def versionId(self) -> Optional[int]:
+        return self._version.id if self._version else None
+
+    def needsContent(self) -> bool:
+        """是否还没有模板配置"""
+        return self._version is not None and not isinstance(self._version, TemplateVersionResponse)
 
     def _onNotesChanged(self, content: str):
         """备注变化"""
@@ -8,7 +8,7 @@ from qfluentwidgets import (
     SwitchButton, BodyLabel
 )
 
-from api import users_api, APIError
+from api import users_api, async_api, error_message
 from voidview_shared import UserRole
 
 
@@ -56,150 +56,127 @@ class UserListPage(QWidget):
 
     def loadUsers(self):
         """加载用户列表"""
-        try:
-            result = users_api.list_users()
-            users = result.get("items", [])
-
-            self.table.setRowCount(len(users))
-
-            for row, user in enumerate(users):
-                # 用户名
-                self.table.setItem(row, 0, QTableWidgetItem(user.username))
-
-                # 显示名称
-                self.table.setItem(row, 1, QTableWidgetItem(user.display_name))
-
-                # 角色
-                roleText = "管理员" if user.role == UserRole.ROOT else "测试人员"
-                self.table.setItem(row, 2, QTableWidgetItem(roleText))
-
-                # 状态开关
-                statusWidget = QWidget()
-                statusLayout = QHBoxLayout(statusWidget)
-                statusLayout.setContentsMargins(8, 4, 8, 4)
-
-                switch = SwitchButton()
-                switch.setChecked(user.is_active)
-                switch.checkedChanged.connect(
-                    lambda checked, uid=user.id: self.toggleUserStatus(uid, checked)
-                )
-                statusLayout.addWidget(switch)
-                statusLayout.addStretch()
-
-                self.table.setCellWidget(row, 3, statusWidget)
-
-                # 最后登录
-                lastLogin = user.last_login_at.strftime("%Y-%m-%d %H:%M") if user.last_login_at else "从未登录"
-                self.table.setItem(row, 4, QTableWidgetItem(lastLogin))
-
-                # 操作按钮
-                actionWidget = QWidget()
-                actionLayout = QHBoxLayout(actionWidget)
-                actionLayout.setContentsMargins(8, 4, 8, 4)
-
-                resetBtn = PushButton(actionWidget)
-                resetBtn.setText("重置密码")
-                resetBtn.clicked.connect(lambda checked, uid=user.id, uname=user.username: self.resetPassword(uid, uname))
-                actionLayout.addWidget(resetBtn)
-
-                self.table.setCellWidget(row, 5, actionWidget)
-
-        except APIError as e:
-            InfoBar.error(
-                title="加载失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
+        async_api.fetch(users_api.list_users, owner=self, group="users").then(
+            self._onUsersLoaded,
+            lambda error: self._showError("加载失败", error)
+        )
+
+    def _onUsersLoaded(self, result: dict):
+        """用户列表加载完成"""
+        users = result.get("items", [])
+
+        self.table.setRowCount(len(users))
+
+        for row, user in enumerate(users):
+            # 用户名
+            self.table.setItem(row, 0, QTableWidgetItem(user.username))
+
+            # 显示名称
+            self.table.setItem(row, 1, QTableWidgetItem(user.display_name))
+
+            # 角色
+            roleText = "管理员" if user.role == UserRole.ROOT else "测试人员"
+            self.table.setItem(row, 2, QTableWidgetItem(roleText))
+
+            # 状态开关
+            statusWidget = QWidget()
+            statusLayout = QHBoxLayout(statusWidget)
+            statusLayout.setContentsMargins(8, 4, 8, 4)
+
+            switch = SwitchButton()
+            switch.setChecked(user.is_active)
+            switch.checkedChanged.connect(
+                lambda checked, uid=user.id: self.toggleUserStatus(uid, checked)
             )
+            statusLayout.addWidget(switch)
+            statusLayout.addStretch()
+
+            self.table.setCellWidget(row, 3, statusWidget)
+
+            # 最后登录
+            lastLogin = user.last_login_at.strftime("%Y-%m-%d %H:%M") if user.last_login_at else "从未登录"
+            self.table.setItem(row, 4, QTableWidgetItem(lastLogin))
+
+            # 操作按钮
+            actionWidget = QWidget()
+            actionLayout = QHBoxLayout(actionWidget)
+            actionLayout.setContentsMargins(8, 4, 8, 4)
+
+            resetBtn = PushButton(actionWidget)
+            resetBtn.setText("重置密码")
+            resetBtn.clicked.connect(lambda checked, uid=user.id, uname=user.username: self.resetPassword(uid, uname))
+            actionLayout.addWidget(resetBtn)
+
+            self.table.setCellWidget(row, 5, actionWidget)
+
+    def _showSuccess(self, content: str):
+        """操作成功提示"""
+        InfoBar.success(
+            title="成功",
+            content=content,
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=2000,
+            parent=self
+        )
+
+    def _showError(self, title: str, error: Exception):
+        """操作失败提示"""
+        InfoBar.error(
+            title=title,
+            content=error_message(error),
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=3000,
+            parent=self
+        )
 
     def toggleUserStatus(self, user_id: int, active: bool):
         """切换用户状态"""
-        try:
-            result = users_api.toggle_active(user_id)
-            InfoBar.success(
-                title="成功",
-                content=result.get("message", "操作成功"),
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=2000,
-                parent=self
-            )
-        except APIError as e:
-            InfoBar.error(
-                title="操作失败",
-                content=e.message,
-                orient=Qt.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP,
-                duration=3000,
-                parent=self
-            )
-            # 刷新列表恢复状态
-            self.loadUsers()
+        async_api.submit(users_api.toggle_active, user_id, owner=self).then(
+            lambda result: self._showSuccess(result.get("message", "操作成功")),
+            self._onToggleFailed
+        )
+
+    def _onToggleFailed(self, error: Exception):
+        """切换用户状态失败"""
+        self._showError("操作失败", error)
+        # 刷新列表恢复状态
+        self.loadUsers()
 
     def resetPassword(self, user_id: int, username: str):
         """重置密码"""
         dialog = ResetPasswordDialog(username, self)
         if dialog.exec():
             new_password = dialog.getNewPassword()
-            try:
-                users_api.reset_password(user_id, new_password)
-                InfoBar.success(
-                    title="成功",
-                    content=f"已重置 {username} 的密码",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-            except APIError as e:
-                InfoBar.error(
-                    title="重置失败",
-                    content=e.message,
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=3000,
-                    parent=self
-                )
+            async_api.submit(users_api.reset_password, user_id, new_password, owner=self).then(
+                lambda result: self._showSuccess(f"已重置 {username} 的密码"),
+                lambda error: self._showError("重置失败", error)
+            )
 
     def showCreateDialog(self):
         """显示创建用户对话框"""
         dialog = CreateUserDialog(self)
         if dialog.exec():
             data = dialog.getData()
-            try:
-                users_api.create_user(
-                    username=data['username'],
-                    password=data['password'],
-                    display_name=data['display_name'],
-                    role=UserRole(data['role'])
-                )
-                InfoBar.success(
-                    title="成功",
-                    content=f"账号 {data['username']} 创建成功",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=2000,
-                    parent=self
-                )
-                self.loadUsers()
-            except APIError as e:
-                InfoBar.error(
-                    title="创建失败",
-                    content=e.message,
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP,
-                    duration=3000,
-                    parent=self
-                )
+            async_api.submit(
+                users_api.create_user,
+                username=data['username'],
+                password=data['password'],
+                display_name=data['display_name'],
+                role=UserRole(data['role']),
+                owner=self
+            ).then(
+                lambda user: self._onUserCreated(data['username']),
+                lambda error: self._showError("创建失败", error)
+            )
+
+    def _onUserCreated(self, username: str):
+        """用户创建完成"""
+        self._showSuccess(f"账号 {username} 创建成功")
+        self.loadUsers()
 
 
 class CreateUserDialog(MessageBoxBase):
@@ -7,7 +7,7 @@ from qfluentwidgets import (
     PushButton, InfoBar, InfoBarPosition
 )
 
-from app.config import user_config
+from core.config import user_config
 from api import api_client
 
 
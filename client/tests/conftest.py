@@ -0,0 +1,8 @@
+"""客户端测试公共配置：把 client/src 和 shared/src 加入导入路径"""
+
+import sys
+from pathlib import Path
+
+CLIENT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_DIR.parent / "shared" / "src"))
+sys.path.insert(0, str(CLIENT_DIR / "src"))
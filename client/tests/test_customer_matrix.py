@@ -0,0 +1,182 @@
+"""客户矩阵筛选索引和增量更新测试
+
+用法:
+    cd client && python -m pytest tests
+拼音首字母用例需要 pypinyin，MatrixModel 用例需要 PySide6 和 qfluentwidgets，未安装时跳过。
+"""
+
+import importlib.util
+import sys
+
+import pytest
+
+from conftest import CLIENT_DIR
+from models.experiment import ExperimentBrief, MatrixRow
+
+
+def _loadMatrixFilter():
+    """直接加载 matrix_filter 模块：ui 包的 __init__ 会导入 Qt 页面，筛选索引本身不依赖 Qt"""
+    name = "matrix_filter"
+    if name not in sys.modules:
+        path = CLIENT_DIR / "src" / "ui" / "pages" / "customer_matrix" / "matrix_filter.py"
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+matrix_filter = _loadMatrixFilter()
+MatrixFilter = matrix_filter.MatrixFilter
+MatrixFilterIndex = matrix_filter.MatrixFilterIndex
+
+
+def _row(template_id: int, customer: str, app: str, template: str, experiments=(), customer_id: int = 1) -> MatrixRow:
+    return MatrixRow(
+        customer_id=customer_id, customer_name=customer,
+        app_id=template_id * 10, app_name=app,
+        template_id=template_id, template_name=template,
+        experiments={e.id: e for e in experiments},
+    )
+
+
+ROWS = [
+    _row(1, "华为", "相机", "夜景模式", [ExperimentBrief(id=1, name="暗光测试", status="running")]),
+    _row(2, "华为", "相册", "人像美颜", [ExperimentBrief(id=2, name="Portrait v2", status="completed")]),
+    _row(3, "小米", "Camera", "Night Shot", customer_id=2),
+    _row(4, "小米", "Gallery", "Tonight Preset", customer_id=2),
+]
+
+
+def _index(rows=ROWS) -> MatrixFilterIndex:
+    index = MatrixFilterIndex()
+    index.setRows(rows)
+    index.prepare()
+    return index
+
+
+def _match(index: MatrixFilterIndex, text: str = "", **kwargs):
+    matrix_filter = MatrixFilter(text=text, **kwargs)
+    return index.match(matrix_filter)
+
+
+def test_substring_longer_than_two_chars():
+    index = _index()
+    assert _match(index, "night") == {3, 4}
+    assert _match(index, "shot ight") == {3}  # 关键词按空格拆分，各自匹配即可
+    assert _match(index, "nightshot") == set()
+    # "nig"、"igh"... 的二元组都出现在 "tonight preset" 中，但 "ghtp" 不连续出现
+    assert _match(index, "ghtp") == set()
+    assert _match(index, "夜景模") == {1}
+    assert _match(index, "景夜") == set()
+
+
+def test_terms_and_field_filters():
+    index = _index()
+    assert _match(index, "华为 相") == {1, 2}
+    assert _match(index, "华为 portrait") == {2}
+    assert _match(index, customer_id=2) == {3, 4}
+    assert _match(index, "night", customer_id=1) == set()
+    assert _match(index, status="running") == {1}
+    assert _match(index, experiment_id=2) == {2}
+
+
+def test_incremental_update():
+    index = _index()
+    renamed = _row(3, "小米", "Camera", "Day Shot", customer_id=2)
+    index.setRows([ROWS[0], renamed, ROWS[3]])
+    assert not index.isReady()
+    index.prepare()
+    assert index.isReady()
+    assert _match(index, "night") == {4}
+    assert _match(index, "day") == {3}
+    assert _match(index, "华为") == {1}
+
+
+def test_pinyin_initials():
+    pytest.importorskip("pypinyin")
+    index = _index()
+    assert _match(index, "hw") == {1, 2}
+    assert _match(index, "yjms") == {1}
+    assert _match(index, "xm night") == {3, 4}
+
+
+@pytest.mark.parametrize("matrix_filter", [
+    MatrixFilter(text="night"),
+    MatrixFilter(text="ghtp"),
+    MatrixFilter(text="华为 相"),
+    MatrixFilter(text="hw"),
+    MatrixFilter(text="n", customer_id=2),
+    MatrixFilter(status="completed"),
+    MatrixFilter(text="暗光", experiment_id=1),
+])
+def test_scan_matches_index(matrix_filter):
+    index = _index()
+    assert MatrixFilterIndex().scan(ROWS, matrix_filter) == index.match(matrix_filter)
+
+
+# ============ MatrixModel ============
+
+@pytest.fixture
+def table():
+    """MatrixModel 所在模块；需要 QApplication"""
+    pytest.importorskip("PySide6")
+    pytest.importorskip("qfluentwidgets")
+    from PySide6.QtWidgets import QApplication
+    from ui.pages.customer_matrix import matrix_table_widget
+    _app = QApplication.instance() or QApplication([])  # noqa: F841
+    return matrix_table_widget
+
+
+@pytest.fixture
+def model(table):
+    model = table.MatrixModel()
+    model.setRows(list(ROWS))
+    return model
+
+
+def _keys(model, table):
+    return [model.index(i).data(table.RowRole).template_id for i in range(model.rowCount())]
+
+
+def _record(model):
+    """记录模型发出的行变化信号"""
+    events = []
+    model.rowsRemoved.connect(lambda parent, start, end: events.append(("removed", start, end)))
+    model.rowsInserted.connect(lambda parent, start, end: events.append(("inserted", start, end)))
+    model.dataChanged.connect(lambda top, bottom, roles=(): events.append(("changed", top.row(), bottom.row())))
+    model.modelReset.connect(lambda: events.append(("reset",)))
+    model.layoutChanged.connect(lambda *args: events.append(("layout",)))
+    return events
+
+
+def test_apply_rows_keyed_diff(model, table):
+    model.setSelectedRows({0, 3})
+    events = _record(model)
+
+    renamed = _row(2, "华为", "相册", "人像美颜 v2", [ExperimentBrief(id=2, name="Portrait v2", status="completed")])
+    added = _row(5, "小米", "Gallery", "Zoom", customer_id=2)
+    model.applyRows([ROWS[0], renamed, ROWS[3], added])
+
+    assert events == [("removed", 2, 2), ("inserted", 3, 3), ("changed", 1, 1)]
+    assert _keys(model, table) == [1, 2, 4, 5]
+    # 选择按 template_id 保留，selectedRows 返回新的原始索引
+    assert model.selectedRows() == {0, 2}
+
+
+def test_apply_rows_unchanged_emits_nothing(model):
+    events = _record(model)
+    model.applyRows([row.model_copy() for row in ROWS])
+    assert events == []
+
+
+def test_apply_rows_with_filter(model, table):
+    model.setFilter(table.MatrixFilter(text="night"))
+    assert _keys(model, table) == [3, 4]
+    events = _record(model)
+
+    model.applyRows([ROWS[0], ROWS[1], ROWS[2], _row(4, "小米", "Gallery", "Tonight Preset 2", customer_id=2)])
+    assert events == [("changed", 1, 1)]
+    model.applyRows(list(ROWS[:3]))
+    assert events[-1] == ("removed", 1, 1)
+    assert _keys(model, table) == [3]
@@ -20,6 +20,14 @@ def run_server():
     subprocess.run([sys.executable, "-m", "uvicorn", "app.main:app", "--reload"], cwd=project_root / "server")
 
 
+def compact_storage():
+    """离线整理服务端 Excel 数据（需先停止服务端）"""
+    project_root = Path(__file__).parent.parent
+
+    print("Compacting VoidView storage...")
+    subprocess.run([sys.executable, "-m", "app.storage.compact"], cwd=project_root / "server")
+
+
 def check_shared_module() -> bool:
     """检查 voidview_shared 模块是否可用"""
     try:
@@ -82,12 +90,13 @@ Examples:
   python scripts/run.py client    Start the client (dev mode)
   python scripts/run.py exe       Start the client (packaged)
   python scripts/run.py docs      Open API documentation
+  python scripts/run.py compact   Purge orphan rows and rewrite storage files (server stopped)
         """
     )
 
     parser.add_argument(
         "command",
-        choices=["server", "client", "exe", "docs"],
+        choices=["server", "client", "exe", "docs", "compact"],
         help="Command to run"
     )
 
@@ -98,6 +107,7 @@ Examples:
         "client": run_client_dev,
         "exe": run_client_exe,
         "docs": open_docs,
+        "compact": compact_storage,
     }
 
     commands[args.command]()
@@ -0,0 +1,33 @@
+"""批量操作 API"""
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_user
+from app.services.batch_service import BatchService, BatchAborted
+from app.schemas.batch import BatchRequest, BatchResponse, BatchOperationResult, BatchError
+
+router = APIRouter(prefix="/batch", tags=["批量操作"])
+
+
+@router.post("", response_model=BatchResponse)
+async def execute_batch(
+    data: BatchRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """在一个事务中按顺序执行多个子操作，任一失败则全部回滚"""
+    service = BatchService()
+    error = None
+    try:
+        results = await service.execute(data.operations, current_user)
+    except BatchAborted as e:
+        results = e.results
+        error = BatchError(index=e.index, status_code=e.status_code, detail=e.detail)
+
+    return BatchResponse(
+        committed=error is None,
+        results=[
+            BatchOperationResult(index=i, resource=op.resource, action=op.action, data=result)
+            for i, (op, result) in enumerate(zip(data.operations, results))
+        ],
+        error=error
+    )
@@ -0,0 +1,32 @@
+"""调试 API"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+
+from app.api.deps import require_root
+from app.core.exceptions import NotFoundException
+from app.core.metrics import registry
+from app.core.profiling import list_profiles, get_profile_path
+
+router = APIRouter(prefix="/debug", tags=["调试"])
+
+
+@router.get("/metrics")
+async def get_metrics(current_user: dict = Depends(require_root)):
+    """运行时指标（JSON，含按桶估算的分位数）"""
+    return registry.snapshot()
+
+
+@router.get("/profiles")
+async def get_profiles(current_user: dict = Depends(require_root)):
+    """已保存的请求剖析文件"""
+    return list_profiles()
+
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str, current_user: dict = Depends(require_root)):
+    """下载剖析文件"""
+    path = get_profile_path(name)
+    if path is None:
+        raise NotFoundException("剖析文件不存在")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
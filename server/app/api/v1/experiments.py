@@ -20,6 +20,7 @@ from app.schemas.experiment import (
     ExperimentGroupCreate, ExperimentGroupResponse,
     ObjectiveMetricsCreate, ObjectiveMetricsResponse,
     TemplateVersionCreate, TemplateVersionUpdate, TemplateVersionResponse,
+    ExperimentFullResponse,
 )
 from app.core.exceptions import NotFoundException
 
@@ -49,7 +50,7 @@ async def list_customers(
     """获取客户列表"""
     service = CustomerService()
     customers = await service.list_all()
-    return [CustomerResponse.model_validate(_convert_datetime(c)) for c in customers]
+    return customers
 
 
 @router.post("/customers", response_model=CustomerResponse)
@@ -121,7 +122,7 @@ async def list_apps(
         apps = await service.list_by_customer(customer_id)
     else:
         apps = []
-    return [AppResponse.model_validate(_convert_datetime(a)) for a in apps]
+    return apps
 
 
 @router.post("/apps", response_model=AppResponse)
@@ -192,7 +193,7 @@ async def list_templates(
         templates = await service.list_by_app(app_id)
     else:
         templates = []
-    return [TemplateResponse.model_validate(_convert_datetime(t)) for t in templates]
+    return templates
 
 
 @router.post("/templates", response_model=TemplateResponse)
@@ -288,20 +289,18 @@ async def list_experiments(
         else:
             template_paths[tid] = f"未知/{t['name']}"
 
-    # 为每个实验添加模板完整路径
-    items = []
+    # 为每个实验添加模板完整路径；行数据已由存储层类型化，交给 response_model 统一校验一次
+    experiment_template_ids = excel_store.get_experiment_template_ids_map()
     for exp in experiments:
-        exp_data = _convert_datetime(exp)
-        template_ids = excel_store.get_experiment_template_ids(exp["id"])
-        exp_data["template_names"] = [template_paths.get(tid, f"未知模板({tid})") for tid in template_ids]
-        items.append(ExperimentResponse.model_validate(exp_data))
-
-    return ExperimentListResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+        template_ids = experiment_template_ids.get(exp["id"], [])
+        exp["template_names"] = [template_paths.get(tid, f"未知模板({tid})") for tid in template_ids]
+
+    return {
+        "items": experiments,
+        "total": total,
+        "page": page,
+        "page_size": page_size
+    }
 
 
 @router.get("/matrix", response_model=MatrixResponse)
@@ -396,6 +395,24 @@ async def get_experiment(
     return ExperimentResponse.model_validate(exp_data)
 
 
+@router.get("/{experiment_id}/full", response_model=ExperimentFullResponse)
+async def get_experiment_full(
+    experiment_id: int,
+    current_user: dict = Depends(get_current_user)
+):
+    """获取实验完整数据（关联模板路径、备注和版本列表），供详情窗口一次加载"""
+    service = ExperimentService()
+    experiment = await service.get_full(experiment_id)
+    if not experiment:
+        raise NotFoundException("实验不存在")
+
+    # 行数据已由存储层类型化，交给 response_model 统一校验一次
+    templates = experiment["templates"]
+    experiment["template_ids"] = [t["template_id"] for t in templates]
+    experiment["template_names"] = [t["path"] for t in templates]
+    return experiment
+
+
 @router.put("/{experiment_id}", response_model=ExperimentResponse)
 async def update_experiment(
     experiment_id: int,
@@ -526,7 +543,7 @@ async def list_template_versions(
     """获取实验-模板的版本列表"""
     service = TemplateVersionService()
     versions = await service.list_by_experiment_template(experiment_id, template_id)
-    return [TemplateVersionResponse.model_validate(_convert_datetime(v)) for v in versions]
+    return versions
 
 
 @router.post("/{experiment_id}/templates/{template_id}/versions", response_model=TemplateVersionResponse)
@@ -560,6 +577,19 @@ async def create_template_version(
     return TemplateVersionResponse.model_validate(_convert_datetime(version))
 
 
+@router.get("/versions/{version_id}", response_model=TemplateVersionResponse)
+async def get_template_version(
+    version_id: int,
+    current_user: dict = Depends(get_current_user)
+):
+    """获取模板版本（含模板配置）"""
+    service = TemplateVersionService()
+    version = await service.get_by_id(version_id)
+    if not version:
+        raise NotFoundException("模板版本不存在")
+    return version
+
+
 @router.put("/versions/{version_id}", response_model=TemplateVersionResponse)
 async def update_template_version(
     version_id: int,
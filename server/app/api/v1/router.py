@@ -5,12 +5,16 @@ from fastapi import APIRouter
 from .auth import router as auth_router
 from .users import router as users_router
 from .experiments import router as experiments_router
+from .batch import router as batch_router
+from .debug import router as debug_router
 
 api_router = APIRouter()
 
 api_router.include_router(auth_router)
 api_router.include_router(users_router)
 api_router.include_router(experiments_router)
+api_router.include_router(batch_router)
+api_router.include_router(debug_router)
 
 
 @api_router.get("/health")
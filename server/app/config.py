@@ -41,6 +41,26 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: list[str] = ["*"]
 
+    # 日志：进程内嵌入客户端运行时由客户端统一配置，服务端不再重新初始化
+    SETUP_LOGGING: bool = True
+
+    # 就绪信号（本地模式由客户端设置）：就绪后向 stdout 输出握手行 / 写入就绪文件
+    READY_HANDSHAKE: bool = False
+    READY_FILE: str = ""
+
+    # 响应压缩：响应体超过该字节数时按 Accept-Encoding 压缩（br 需安装 brotli），0 表示关闭
+    COMPRESSION_MIN_SIZE: int = 1024
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 5
+
+    # 请求性能剖析：请求头 X-Profile 单独开启（需 root 令牌），或按比例全局采样
+    PROFILE_SAMPLE_RATE: float = 0.0
+    # 允许任何请求通过 X-Profile 开启剖析（仅限本地调试，默认只接受 root 用户的请求）
+    PROFILE_ALLOW_HEADER: bool = False
+    PROFILE_MODE: str = "sample"  # sample: 采样调用栈（collapsed）；cprofile: cProfile 统计
+    PROFILE_INTERVAL_MS: float = 1.0
+    PROFILE_KEEP: int = 200
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -66,6 +86,8 @@ class Settings(BaseSettings):
         else:
             self._attachments_path = Path(self.ATTACHMENTS_PATH)
 
+        self._profiles_path = self._storage_path / "profiles"
+
     @property
     def storage_path(self) -> Path:
         return self._storage_path
@@ -78,6 +100,10 @@ class Settings(BaseSettings):
     def attachments_path(self) -> Path:
         return self._attachments_path
 
+    @property
+    def profiles_path(self) -> Path:
+        return self._profiles_path
+
 
 settings = Settings()
 
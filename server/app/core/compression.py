@@ -0,0 +1,136 @@
+"""响应压缩
+
+按 Accept-Encoding 协商，响应体超过 COMPRESSION_MIN_SIZE 时压缩：
+安装了 brotli 且客户端接受 br 时用 brotli，否则用 gzip。
+只处理一次性发送的响应体；流式响应（如剖析文件下载）原样透传。
+"""
+
+import gzip
+from typing import Optional
+
+from anyio import to_thread
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 可选依赖
+    brotli = None
+
+# 已压缩或不适合压缩的类型
+_SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip", "application/octet-stream")
+
+# 超过该大小的响应体放到线程池压缩，避免阻塞事件循环
+_THREAD_MIN_SIZE = 256 * 1024
+
+
+def _accepted_encodings(scope) -> dict:
+    """解析 Accept-Encoding，返回 {编码: q 值}"""
+    for name, value in scope.get("headers", []):
+        if name == b"accept-encoding":
+            result = {}
+            for item in value.decode("latin-1").split(","):
+                parts = item.strip().split(";")
+                encoding = parts[0].strip().lower()
+                if not encoding:
+                    continue
+                q = 1.0
+                for param in parts[1:]:
+                    key, _, number = param.strip().partition("=")
+                    if key == "q":
+                        try:
+                            q = float(number)
+                        except ValueError:
+                            q = 0.0
+                result[encoding] = q
+            return result
+    return {}
+
+
+def choose_encoding(scope) -> Optional[str]:
+    """选择压缩编码，不压缩时返回 None"""
+    accepted = _accepted_encodings(scope)
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """响应压缩 ASGI 中间件"""
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.minimum_size <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in headers or content_type.startswith(_SKIP_CONTENT_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= _THREAD_MIN_SIZE:
+                compressed = await to_thread.run_sync(compress, body, encoding)
+            else:
+                compressed = compress(body, encoding)
+
+            headers = []
+            vary = b"Accept-Encoding"
+            for name, value in start_message.get("headers", []):
+                if name == b"vary":
+                    vary = value + b", Accept-Encoding"
+                elif name != b"content-length":
+                    headers.append((name, value))
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+                (b"vary", vary),
+            ]
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
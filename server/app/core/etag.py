@@ -0,0 +1,94 @@
+"""ETag 条件请求
+
+GET 请求的 200 响应按响应体（压缩前）计算弱 ETag；请求带 If-None-Match 且匹配时
+返回 304 空响应体，客户端沿用本地缓存，省去传输和解析。
+只处理一次性发送的响应体；流式响应原样透传。
+"""
+
+import hashlib
+
+_HASHED_METHODS = ("GET", "HEAD")
+
+
+def compute_etag(body: bytes) -> str:
+    """响应体的弱 ETag（压缩编码不同时内容语义相同）"""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _if_none_match(scope) -> list:
+    """解析 If-None-Match，返回去掉弱标记的 ETag 列表"""
+    for name, value in scope.get("headers", []):
+        if name == b"if-none-match":
+            tags = []
+            for item in value.decode("latin-1").split(","):
+                item = item.strip()
+                if item.startswith("W/"):
+                    item = item[2:]
+                if item:
+                    tags.append(item)
+            return tags
+    return []
+
+
+def etag_matches(etag: str, tags: list) -> bool:
+    """弱比较：忽略 W/ 前缀"""
+    return "*" in tags or etag[2:] in tags
+
+
+class ETagMiddleware:
+    """ETag ASGI 中间件（需位于压缩中间件之内，按未压缩内容计算）"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in _HASHED_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+        if_none_match = _if_none_match(scope)
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                if message["status"] != 200 or b"etag" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            etag = compute_etag(message.get("body", b""))
+            if etag_matches(etag, if_none_match):
+                headers = [
+                    (name, value) for name, value in start_message.get("headers", [])
+                    if name not in (b"content-length", b"content-type")
+                ]
+                headers += [(b"etag", etag.encode("latin-1")), (b"content-length", b"0")]
+                await send({**start_message, "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            headers = list(start_message.get("headers", []))
+            headers.append((b"etag", etag.encode("latin-1")))
+            await send({**start_message, "headers": headers})
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,267 @@
+"""运行时指标
+
+进程内的轻量计数器/直方图，可导出为 Prometheus 文本格式或 JSON。
+包含按路由统计请求的 ASGI 中间件，以及存储层使用的计时器。
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 延迟直方图默认桶（秒）
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 字节数直方图默认桶
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+_INF_LABEL = 'le="+Inf"'
+
+
+def _format_labels(names: Tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """计数器"""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_number(value)}"
+                for key, value in items]
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [{**dict(zip(self.labels, key)), "value": value} for key, value in items]
+
+
+class Histogram:
+    """直方图（累计桶 + 总和 + 计数）"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # key -> [各桶计数..., 总和, 计数, 最大值]
+        self._values: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0] * len(self.buckets) + [0.0, 0, 0.0]
+            if index < len(self.buckets):
+                data[index] += 1
+            data[-3] += value
+            data[-2] += 1
+            data[-1] = max(data[-1], value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """对代码块计时（秒）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _items(self) -> List[Tuple[tuple, list]]:
+        with self._lock:
+            return sorted((key, list(data)) for key, data in self._values.items())
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, data in self._items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                le = f'le="{_format_number(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, _INF_LABEL)} {data[-2]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_number(data[-3])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {data[-2]}")
+        return lines
+
+    def snapshot(self) -> List[dict]:
+        result = []
+        for key, data in self._items():
+            count = data[-2]
+            result.append({
+                **dict(zip(self.labels, key)),
+                "count": count,
+                "sum": data[-3],
+                "mean": data[-3] / count if count else 0.0,
+                "max": data[-1],
+                "p50": self._quantile(data, 0.50),
+                "p95": self._quantile(data, 0.95),
+                "p99": self._quantile(data, 0.99),
+            })
+        return result
+
+    def _quantile(self, data: list, q: float) -> Optional[float]:
+        """按桶估算分位数（返回所在桶的上界，超出最大桶时返回最大值）"""
+        count = data[-2]
+        if not count:
+            return None
+        target = q * count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, data):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return bound
+        return data[-1]
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"指标已存在: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render_prometheus(self) -> str:
+        """Prometheus 文本格式（0.0.4）"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, dict]:
+        """JSON 友好的快照"""
+        return {
+            name: {"type": metric.type, "help": metric.help, "values": metric.snapshot()}
+            for name, metric in self._metrics.items()
+        }
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests_total = registry.counter(
+    "voidview_http_requests_total", "HTTP 请求数", ("method", "route", "status"))
+http_request_duration = registry.histogram(
+    "voidview_http_request_duration_seconds", "HTTP 请求耗时（秒）", ("method", "route"))
+http_response_size = registry.histogram(
+    "voidview_http_response_size_bytes", "HTTP 响应体大小（字节）", ("method", "route"), SIZE_BUCKETS)
+
+# 存储层
+storage_operation_duration = registry.histogram(
+    "voidview_storage_operation_seconds", "ExcelStore 公开方法耗时（秒）", ("operation",))
+storage_load_duration = registry.histogram(
+    "voidview_storage_load_seconds", "读取 Excel 文件字节耗时（秒）", ("file",))
+storage_parse_duration = registry.histogram(
+    "voidview_storage_parse_seconds", "openpyxl 解析工作簿耗时（秒）", ("file", "mode"))
+storage_save_duration = registry.histogram(
+    "voidview_storage_save_seconds", "保存工作簿耗时（秒）", ("file",))
+storage_save_bytes = registry.histogram(
+    "voidview_storage_save_bytes", "保存后的文件大小（字节）", ("file",), SIZE_BUCKETS)
+storage_lock_wait = registry.histogram(
+    "voidview_storage_lock_wait_seconds", "等待存储文件锁的耗时（秒）")
+
+
+def _route_template(scope) -> str:
+    """请求匹配到的完整路径模板
+
+    被 include_router 的路由，其 path 可能只是相对子路由的部分，
+    用实际路径减去代入参数后的后缀得到前缀，再拼上模板。
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    path = scope["path"]
+    path_format = getattr(route, "path_format", template)
+    try:
+        suffix = path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if suffix and path.endswith(suffix):
+        return path[:-len(suffix)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """按路由统计请求数、耗时和响应体大小的 ASGI 中间件
+
+    路由取匹配到的路径模板（如 /api/v1/experiments/{experiment_id}），
+    未匹配任何路由的请求统一记为 "unmatched"，避免标签基数膨胀。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route_path = _route_template(scope)
+            method = scope["method"]
+            http_requests_total.inc(method=method, route=route_path, status=str(status))
+            http_request_duration.observe(time.perf_counter() - start, method=method, route=route_path)
+            http_response_size.observe(size, method=method, route=route_path)
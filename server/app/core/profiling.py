@@ -0,0 +1,196 @@
+"""请求级性能剖析
+
+按需对单个请求做性能剖析，结果保存到存储目录下的 profiles/：
+- 请求头 `X-Profile: 1`（或 `sample` / `cprofile` 指定模式）单独开启；
+  只接受带 root 访问令牌的请求，配置 PROFILE_ALLOW_HEADER 后不检查令牌
+- 配置 PROFILE_SAMPLE_RATE > 0 时按比例随机开启
+
+sample 模式由后台线程定时采样处理线程的调用栈，输出 collapsed stack
+（每行 "帧;帧;帧 次数"，可直接交给 flamegraph.pl / speedscope）；
+cprofile 模式输出 cProfile 的 .prof 统计文件（pstats / snakeviz 可读）。
+
+处理器运行在事件循环线程上，剖析期间同一线程上并发的其他请求也会被计入；
+同一时刻只剖析一个请求，其余请求照常处理。
+"""
+
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from app.config import settings
+from app.core.security import decode_token
+from voidview_shared import UserRole
+
+PROFILE_HEADER = b"x-profile"
+AUTHORIZATION_HEADER = b"authorization"
+PROFILE_MODES = ("sample", "cprofile")
+PROFILE_SUFFIXES = {"sample": ".collapsed", "cprofile": ".prof"}
+
+# 同一时刻只允许一个剖析（cProfile 与采样线程都作用于整个线程）
+_profile_lock = threading.Lock()
+
+
+class StackSampler:
+    """定时采样指定线程的调用栈，累计为 collapsed stack"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def dump(self, path: Path):
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _is_root_request(headers) -> bool:
+    """请求是否带有效的 root 访问令牌（只校验签名和令牌内的角色，不查用户表）"""
+    for name, value in headers:
+        if name == AUTHORIZATION_HEADER:
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return False
+            payload = decode_token(token.strip())
+            return bool(payload) and payload.get("type") == "access" \
+                and payload.get("role") == UserRole.ROOT.value
+    return False
+
+
+def _requested_mode(scope) -> Optional[str]:
+    """根据请求头和全局采样比例决定剖析模式，不剖析时返回 None
+
+    X-Profile 只对 root 用户的请求生效（PROFILE_ALLOW_HEADER 时不限），其他请求忽略该头。
+    """
+    headers = scope.get("headers", [])
+    for name, value in headers:
+        if name == PROFILE_HEADER:
+            if not settings.PROFILE_ALLOW_HEADER and not _is_root_request(headers):
+                break
+            value = value.decode("latin-1").strip().lower()
+            if value in PROFILE_MODES:
+                return value
+            if value in ("1", "true", "yes"):
+                return settings.PROFILE_MODE
+            return None
+    if settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+        return settings.PROFILE_MODE
+    return None
+
+
+def _safe_name(path: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", path).strip("_") or "root"
+
+
+def list_profiles() -> List[dict]:
+    """已保存的剖析文件，新的在前"""
+    directory = settings.profiles_path
+    if not directory.exists():
+        return []
+    result = []
+    for path in directory.iterdir():
+        if path.suffix not in PROFILE_SUFFIXES.values():
+            continue
+        stat = path.stat()
+        result.append({
+            "name": path.name,
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+        })
+    result.sort(key=lambda item: item["name"], reverse=True)
+    return result
+
+
+def get_profile_path(name: str) -> Optional[Path]:
+    """按文件名取剖析文件路径，名称非法或文件不存在时返回 None"""
+    if Path(name).name != name or Path(name).suffix not in PROFILE_SUFFIXES.values():
+        return None
+    path = settings.profiles_path / name
+    return path if path.is_file() else None
+
+
+def _prune(keep: int):
+    """只保留最新的 keep 个剖析文件"""
+    for item in list_profiles()[keep:]:
+        (settings.profiles_path / item["name"]).unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """请求剖析 ASGI 中间件，被剖析的响应带 X-Profile-Id 头（即剖析文件名）"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = _requested_mode(scope)
+        if mode is None or not _profile_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self._profile(mode, scope, receive, send)
+        finally:
+            _profile_lock.release()
+
+    async def _profile(self, mode: str, scope, receive, send):
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        name = (f"{stamp}-{uuid.uuid4().hex[:6]}_{scope['method']}_{_safe_name(scope['path'])}"
+                f"{PROFILE_SUFFIXES[mode]}")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", name.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident(), settings.PROFILE_INTERVAL_MS / 1000)
+            profiler.start()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            settings.profiles_path.mkdir(parents=True, exist_ok=True)
+            if mode == "cprofile":
+                profiler.disable()
+                profiler.dump_stats(settings.profiles_path / name)
+            else:
+                profiler.stop()
+                profiler.dump(settings.profiles_path / name)
+            _prune(settings.PROFILE_KEEP)
@@ -0,0 +1,53 @@
+"""服务就绪状态
+
+存储预热完成后标记就绪：/ready 返回 200，并按配置发出就绪信号，
+供启动本服务的进程（客户端本地模式）立即感知，无需轮询：
+- READY_HANDSHAKE: 向 stdout 输出一行 "<SERVER_READY_MARKER> pid=<进程号>"
+- READY_FILE: 写入就绪文件（内容为 JSON：pid、就绪时间）
+"""
+
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from voidview_shared import SERVER_READY_MARKER
+
+from app.config import settings
+
+_ready = threading.Event()
+_ready_lock = threading.Lock()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_ready(timeout: Optional[float] = None) -> bool:
+    """等待服务就绪（进程内运行时由宿主进程调用），超时返回 False"""
+    return _ready.wait(timeout)
+
+
+def mark_ready():
+    """标记服务就绪并发出就绪信号（只发一次）"""
+    with _ready_lock:
+        if _ready.is_set():
+            return
+        _ready.set()
+
+    if settings.READY_FILE:
+        path = Path(settings.READY_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps({
+            "pid": os.getpid(),
+            "ready_at": datetime.now().isoformat(timespec="milliseconds"),
+        }), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    if settings.READY_HANDSHAKE:
+        sys.stdout.write(f"{SERVER_READY_MARKER} pid={os.getpid()}\n")
+        sys.stdout.flush()
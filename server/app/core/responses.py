@@ -0,0 +1,43 @@
+"""JSON 响应
+
+安装了 orjson 时用 orjson 序列化，否则退回标准库 json（紧凑输出）。
+
+较新的 FastAPI 对声明了 response_model 的接口直接经 Pydantic（Rust 实现）
+序列化为 JSON 字节，比 jsonable_encoder + orjson 更快；但只要指定了自定义
+响应类就会退回旧路径，因此只在不支持该路径的 FastAPI 上把 FastJSONResponse
+设为默认响应类。
+"""
+
+import inspect
+import json
+from typing import Any
+
+from fastapi import routing
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 可选依赖
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """序列化为 JSON 字节"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """用 orjson（可用时）序列化的 JSON 响应"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def default_response_class() -> Any:
+    """应用的默认响应类（支持直接序列化时保持 FastAPI 自身的默认值）"""
+    if "dump_json" in inspect.signature(routing.serialize_response).parameters:
+        return Default(JSONResponse)
+    return FastJSONResponse
@@ -1,35 +1,58 @@
 """FastAPI 应用入口 - Excel 存储版本"""
 
+import threading
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from voidview_shared import setup_logging, get_logger
 
 from app.config import settings
 from app.api.v1.router import api_router
+from app.core.compression import CompressionMiddleware
+from app.core.etag import ETagMiddleware
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.profiling import ProfilingMiddleware
+from app.core.readiness import is_ready, mark_ready
+from app.core.responses import default_response_class
 from app.services.user_service import UserService
 
 # 初始化日志
-setup_logging(
-    app_name="voidview-server",
-    level="DEBUG" if settings.DEBUG else "INFO",
-    rotation="10 MB",
-    retention="7 days",
-    compression="zip",
-    dev_mode=True,
-)
+if settings.SETUP_LOGGING:
+    setup_logging(
+        app_name="voidview-server",
+        level="DEBUG" if settings.DEBUG else "INFO",
+        rotation="10 MB",
+        retention="7 days",
+        compression="zip",
+        dev_mode=True,
+    )
 
 logger = get_logger()
 
 
+def _warm_up_storage(store):
+    """预热存储（后台线程），完成后标记服务就绪"""
+    start = time.perf_counter()
+    try:
+        store.warm_up()
+        logger.info(f"存储预热完成，耗时 {time.perf_counter() - start:.2f}s")
+    except Exception:
+        # 预热只是优化，失败时照常提供服务，错误由具体请求暴露
+        logger.exception("存储预热失败")
+    finally:
+        mark_ready()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     logger.info("VoidView 服务器启动中...")
 
-    # 初始化 Excel 存储（会自动创建默认 root 用户）
+    # 初始化 Excel 存储（首次访问时创建文件和默认 root 用户，并执行待运行的迁移）
     from app.storage import excel_store
     logger.info(f"Excel 数据目录: {excel_store.data_dir}")
 
@@ -39,6 +62,9 @@ async def lifespan(app: FastAPI):
     if root:
         logger.info("已创建默认 root 账号")
 
+    # 后台预热存储缓存，启动耗时与数据量无关
+    threading.Thread(target=_warm_up_storage, args=(excel_store,), name="storage-warm-up", daemon=True).start()
+
     logger.info("VoidView 服务器启动完成")
 
     yield
@@ -52,6 +78,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=default_response_class(),
     lifespan=lifespan
 )
 
@@ -64,6 +91,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ETag 条件请求（在压缩之内，按未压缩的响应体计算）
+app.add_middleware(ETagMiddleware)
+
+# 响应压缩（在剖析和指标之内，指标中记录的是压缩后的大小）
+app.add_middleware(CompressionMiddleware)
+
+# 按需剖析（root 用户的请求头 X-Profile 或 PROFILE_SAMPLE_RATE）
+app.add_middleware(ProfilingMiddleware)
+
+# 请求指标（最外层，包含其他中间件的耗时）
+app.add_middleware(MetricsMiddleware)
+
 # 注册 API 路由
 app.include_router(api_router, prefix="/api/v1")
 
@@ -82,3 +121,17 @@ async def root():
 async def health():
     """健康检查"""
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """就绪检查：存储预热完成后返回 200，之前返回 503"""
+    if is_ready():
+        return {"status": "ready"}
+    return JSONResponse({"status": "starting"}, status_code=503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 指标"""
+    return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
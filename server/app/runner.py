@@ -0,0 +1,49 @@
+"""服务启动入口
+
+先绑定并监听端口，再启动 uvicorn 和应用：就绪信号（/ready、握手行、就绪文件）
+发出时端口一定已经可以连接，早到的连接由内核排队，事件循环启动后立即处理。
+客户端本地模式使用该入口启动服务。
+
+用法（在 server 目录下）:
+    python -m app.runner --port 8000
+    READY_HANDSHAKE=true python -m app.runner --port 8000
+"""
+
+import argparse
+import socket
+import sys
+
+import uvicorn
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """绑定并开始监听"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    if sys.platform != "win32":
+        # Windows 上 SO_REUSEADDR 允许抢占已占用的端口，不设置
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run(host: str = "127.0.0.1", port: int = 8000, log_level: str = "info"):
+    """在预先监听的端口上运行服务"""
+    sock = bind_socket(host, port)
+    config = uvicorn.Config("app.main:app", host=host, port=port, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VoidView 服务器")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="服务器地址")
+    parser.add_argument("--port", type=int, default=8000, help="服务器端口")
+    parser.add_argument("--log-level", type=str, default="info", help="uvicorn 日志级别")
+    args = parser.parse_args()
+    run(args.host, args.port, args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,11 +21,16 @@ from .experiment import (
     # ObjectiveMetrics
     ObjectiveMetricsBase, ObjectiveMetricsCreate, ObjectiveMetricsUpdate, ObjectiveMetricsResponse,
     # TemplateVersion
-    TemplateVersionBase, TemplateVersionCreate, TemplateVersionUpdate, TemplateVersionResponse,
+    TemplateVersionBase, TemplateVersionCreate, TemplateVersionUpdate, TemplateVersionHeader, TemplateVersionResponse,
+    ExperimentTemplateDetail, ExperimentFullResponse,
     # Common
     ExperimentListResponse, PaginatedResponse, UserBriefResponse
 )
 
+from .batch import (
+    BatchOperation, BatchRequest, BatchOperationResult, BatchError, BatchResponse
+)
+
 __all__ = [
     # User
     "UserBase", "UserCreate", "UserUpdate", "UserResponse",
@@ -45,7 +50,11 @@ __all__ = [
     # ObjectiveMetrics
     "ObjectiveMetricsBase", "ObjectiveMetricsCreate", "ObjectiveMetricsUpdate", "ObjectiveMetricsResponse",
     # TemplateVersion
-    "TemplateVersionBase", "TemplateVersionCreate", "TemplateVersionUpdate", "TemplateVersionResponse",
+    "TemplateVersionBase", "TemplateVersionCreate", "TemplateVersionUpdate", "TemplateVersionHeader",
+    "TemplateVersionResponse",
+    "ExperimentTemplateDetail", "ExperimentFullResponse",
     # Common
-    "ExperimentListResponse", "PaginatedResponse", "UserBriefResponse"
+    "ExperimentListResponse", "PaginatedResponse", "UserBriefResponse",
+    # Batch
+    "BatchOperation", "BatchRequest", "BatchOperationResult", "BatchError", "BatchResponse"
 ]
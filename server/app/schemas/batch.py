@@ -0,0 +1,51 @@
+"""批量操作相关的 Pydantic 模型"""
+
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+BatchResource = Literal["customer", "app", "template", "experiment", "link", "version"]
+BatchAction = Literal["create", "update", "delete"]
+
+
+class BatchOperation(BaseModel):
+    """单个子操作
+
+    - id: update/delete 的目标ID（link 不需要，实验和模板ID放在 data 中）
+    - data: 与对应单个接口的请求体相同；version 的 create 需额外提供
+      experiment_id 和 template_id，link 使用 experiment_id / template_id(s) / notes
+
+    id 和 data 中的字符串 "$<序号>.<字段>" 会被替换为前面第 <序号> 个操作
+    结果中的字段值，例如 "$0.id" 表示第一个操作创建的记录ID。
+    """
+    resource: BatchResource
+    action: BatchAction
+    id: Optional[Union[int, str]] = None
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    """批量请求"""
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=500)
+
+
+class BatchOperationResult(BaseModel):
+    """子操作结果"""
+    index: int
+    resource: BatchResource
+    action: BatchAction
+    data: Optional[Dict[str, Any]] = None
+
+
+class BatchError(BaseModel):
+    """失败的子操作"""
+    index: int
+    status_code: int
+    detail: Any
+
+
+class BatchResponse(BaseModel):
+    """批量响应：全部成功才提交；任一失败则整体回滚，results 为失败前的结果"""
+    committed: bool
+    results: List[BatchOperationResult] = []
+    error: Optional[BatchError] = None
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional, List, Dict
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from voidview_shared import ExperimentStatus, GroupStatus, ReferenceType
 
@@ -359,13 +359,12 @@ class TemplateVersionUpdate(BaseModel):
     template_content: Optional[str] = None
 
 
-class TemplateVersionResponse(TemplateVersionBase):
-    """模板版本响应"""
+class TemplateVersionHeader(TemplateVersionBase):
+    """模板版本概要（不含模板配置，配置按需单独获取）"""
     id: int
     experiment_id: int
     template_id: int
     notes: str = ""
-    template_content: str = ""
     order_index: int
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -373,6 +372,37 @@ class TemplateVersionResponse(TemplateVersionBase):
     class Config:
         from_attributes = True
 
+    @field_validator("notes", mode="before")
+    @classmethod
+    def _empty_text(cls, value):
+        """Excel 中的空单元格读出为 None"""
+        return "" if value is None else value
+
+
+class TemplateVersionResponse(TemplateVersionHeader):
+    """模板版本响应"""
+    template_content: str = ""
+
+    @field_validator("template_content", mode="before")
+    @classmethod
+    def _empty_content(cls, value):
+        """notes 由父类处理，这里只补充 template_content"""
+        return cls._empty_text(value)
+
+
+class ExperimentTemplateDetail(BaseModel):
+    """实验关联模板详情"""
+    template_id: int
+    template_name: Optional[str] = None
+    path: str  # 客户/APP/模板
+    notes: str = ""
+    versions: List[TemplateVersionHeader] = []
+
+
+class ExperimentFullResponse(ExperimentResponse):
+    """实验完整数据（实验 + 关联模板 + 备注 + 版本）"""
+    templates: List[ExperimentTemplateDetail] = []
+
 
 # 更新 forward references
 CustomerWithAppsResponse.model_rebuild()
@@ -0,0 +1,220 @@
+"""批量操作服务"""
+
+import re
+from typing import Any, Dict, List
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from app.storage import excel_store
+from app.core.exceptions import BadRequestException, NotFoundException
+from app.schemas.batch import BatchOperation
+from app.schemas.experiment import (
+    CustomerCreate, CustomerUpdate, AppCreate, AppUpdate,
+    TemplateCreate, TemplateUpdate, ExperimentCreate, ExperimentUpdate,
+    TemplateVersionCreate, TemplateVersionUpdate,
+)
+from app.services.experiment_service import (
+    CustomerService, AppService, TemplateService, ExperimentService, TemplateVersionService,
+)
+
+# "$<序号>.<字段>" 引用前面操作的结果
+_REFERENCE = re.compile(r"^\$(\d+)\.(\w+)$")
+
+
+class LinkCreate(BaseModel):
+    """批量：关联模板到实验"""
+    experiment_id: int
+    template_ids: List[int]
+
+
+class LinkUpdate(BaseModel):
+    """批量：更新关联备注"""
+    experiment_id: int
+    template_id: int
+    notes: str = ""
+
+
+class LinkDelete(BaseModel):
+    """批量：解除关联"""
+    experiment_id: int
+    template_id: int
+
+
+class VersionCreate(TemplateVersionCreate):
+    """批量：创建模板版本"""
+    experiment_id: int
+    template_id: int
+
+
+class BatchAborted(Exception):
+    """子操作失败，整个批量回滚"""
+
+    def __init__(self, index: int, status_code: int, detail: Any, results: List[Dict]):
+        self.index = index
+        self.status_code = status_code
+        self.detail = detail
+        self.results = results
+        super().__init__(detail)
+
+
+class BatchService:
+    """批量操作服务
+
+    所有子操作在同一个存储事务中按顺序执行：工作簿各加载一次、最后统一保存一次，
+    任一子操作失败则全部回滚。子操作复用各实体服务，校验规则与单个接口一致。
+    各服务方法虽是 async，但内部没有 await 点，不会在持有存储锁期间让出事件循环。
+    """
+
+    def __init__(self, db=None):
+        self._handlers = {
+            ("customer", "create"): (CustomerCreate, self._create_customer),
+            ("customer", "update"): (CustomerUpdate, self._update_customer),
+            ("customer", "delete"): (None, self._delete_customer),
+            ("app", "create"): (AppCreate, self._create_app),
+            ("app", "update"): (AppUpdate, self._update_app),
+            ("app", "delete"): (None, self._delete_app),
+            ("template", "create"): (TemplateCreate, self._create_template),
+            ("template", "update"): (TemplateUpdate, self._update_template),
+            ("template", "delete"): (None, self._delete_template),
+            ("experiment", "create"): (ExperimentCreate, self._create_experiment),
+            ("experiment", "update"): (ExperimentUpdate, self._update_experiment),
+            ("experiment", "delete"): (None, self._delete_experiment),
+            ("link", "create"): (LinkCreate, self._create_link),
+            ("link", "update"): (LinkUpdate, self._update_link),
+            ("link", "delete"): (LinkDelete, self._delete_link),
+            ("version", "create"): (VersionCreate, self._create_version),
+            ("version", "update"): (TemplateVersionUpdate, self._update_version),
+            ("version", "delete"): (None, self._delete_version),
+        }
+
+    async def execute(self, operations: List[BatchOperation], current_user: Dict) -> List[Dict]:
+        """按顺序执行并提交，返回各操作结果；失败时抛出 BatchAborted（已回滚）"""
+        results: List[Dict] = []
+        with excel_store.transaction():
+            for index, operation in enumerate(operations):
+                try:
+                    results.append(await self._execute_one(operation, results, current_user))
+                except HTTPException as e:
+                    raise BatchAborted(index, e.status_code, e.detail, results)
+                except ValidationError as e:
+                    raise BatchAborted(index, 422, e.errors(include_url=False, include_context=False), results)
+        return results
+
+    async def _execute_one(self, operation: BatchOperation, results: List[Dict], current_user: Dict) -> Dict:
+        model, handler = self._handlers[(operation.resource, operation.action)]
+        target_id = self._resolve(operation.id, results)
+        data = self._resolve(operation.data, results)
+
+        if model is not None:
+            data = model.model_validate(data)
+        if operation.action in ("update", "delete") and operation.resource != "link":
+            if not isinstance(target_id, int):
+                raise BadRequestException("缺少目标ID")
+            return await handler(target_id, data, current_user)
+        return await handler(data, current_user)
+
+    def _resolve(self, value: Any, results: List[Dict]) -> Any:
+        """替换 "$<序号>.<字段>" 引用"""
+        if isinstance(value, str):
+            match = _REFERENCE.match(value)
+            if not match:
+                return value
+            index, field = int(match.group(1)), match.group(2)
+            if index >= len(results) or field not in results[index]:
+                raise BadRequestException(f"无效的引用: {value}")
+            return results[index][field]
+        if isinstance(value, list):
+            return [self._resolve(item, results) for item in value]
+        if isinstance(value, dict):
+            return {key: self._resolve(item, results) for key, item in value.items()}
+        return value
+
+    @staticmethod
+    def _changes(data: BaseModel) -> Dict:
+        """部分更新：只取请求中出现的字段，枚举转为值"""
+        return data.model_dump(exclude_unset=True, mode="json")
+
+    # ============ 客户 / 应用 / 模板 ============
+
+    async def _create_customer(self, data: CustomerCreate, current_user: Dict) -> Dict:
+        return await CustomerService().create(name=data.name, contact=data.contact, description=data.description)
+
+    async def _update_customer(self, customer_id: int, data: CustomerUpdate, current_user: Dict) -> Dict:
+        return await CustomerService().update(customer_id, **self._changes(data))
+
+    async def _delete_customer(self, customer_id: int, data: None, current_user: Dict) -> Dict:
+        await CustomerService().delete(customer_id)
+        return {"id": customer_id}
+
+    async def _create_app(self, data: AppCreate, current_user: Dict) -> Dict:
+        return await AppService().create(customer_id=data.customer_id, name=data.name, description=data.description)
+
+    async def _update_app(self, app_id: int, data: AppUpdate, current_user: Dict) -> Dict:
+        return await AppService().update(app_id, **self._changes(data))
+
+    async def _delete_app(self, app_id: int, data: None, current_user: Dict) -> Dict:
+        await AppService().delete(app_id)
+        return {"id": app_id}
+
+    async def _create_template(self, data: TemplateCreate, current_user: Dict) -> Dict:
+        return await TemplateService().create(app_id=data.app_id, name=data.name, description=data.description)
+
+    async def _update_template(self, template_id: int, data: TemplateUpdate, current_user: Dict) -> Dict:
+        return await TemplateService().update(template_id, **self._changes(data))
+
+    async def _delete_template(self, template_id: int, data: None, current_user: Dict) -> Dict:
+        await TemplateService().delete(template_id)
+        return {"id": template_id}
+
+    # ============ 实验 / 关联 ============
+
+    async def _create_experiment(self, data: ExperimentCreate, current_user: Dict) -> Dict:
+        experiment = await ExperimentService().create(
+            template_ids=data.template_ids,
+            name=data.name,
+            created_by=current_user["id"],
+            reference_type=data.reference_type.value
+        )
+        experiment["template_ids"] = list(data.template_ids)
+        return experiment
+
+    async def _update_experiment(self, experiment_id: int, data: ExperimentUpdate, current_user: Dict) -> Dict:
+        return await ExperimentService().update(experiment_id, **self._changes(data))
+
+    async def _delete_experiment(self, experiment_id: int, data: None, current_user: Dict) -> Dict:
+        await ExperimentService().delete(experiment_id)
+        return {"id": experiment_id}
+
+    async def _create_link(self, data: LinkCreate, current_user: Dict) -> Dict:
+        return await ExperimentService().link_templates(data.experiment_id, data.template_ids)
+
+    async def _update_link(self, data: LinkUpdate, current_user: Dict) -> Dict:
+        if not excel_store.update_experiment_template_notes(data.experiment_id, data.template_id, data.notes):
+            raise NotFoundException("实验-模板关联不存在")
+        return data.model_dump()
+
+    async def _delete_link(self, data: LinkDelete, current_user: Dict) -> Dict:
+        return await ExperimentService().unlink_template(data.experiment_id, data.template_id)
+
+    # ============ 模板版本 ============
+
+    async def _create_version(self, data: VersionCreate, current_user: Dict) -> Dict:
+        if not await ExperimentService().get_by_id(data.experiment_id):
+            raise NotFoundException("实验不存在")
+        if data.template_id not in excel_store.get_experiment_template_ids(data.experiment_id):
+            raise NotFoundException("该模板未关联到此实验")
+        return await TemplateVersionService().create(
+            experiment_id=data.experiment_id,
+            template_id=data.template_id,
+            name=data.name,
+            notes=data.notes or "",
+            template_content=data.template_content or ""
+        )
+
+    async def _update_version(self, version_id: int, data: TemplateVersionUpdate, current_user: Dict) -> Dict:
+        return await TemplateVersionService().update(version_id, **self._changes(data))
+
+    async def _delete_version(self, version_id: int, data: None, current_user: Dict) -> Dict:
+        await TemplateVersionService().delete(version_id)
+        return {"id": version_id}
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional, List, Dict
 
-from app.storage import excel_store
+from app.storage import excel_store, DuplicateKeyError
 from app.core.exceptions import BadRequestException, NotFoundException
 from voidview_shared import ExperimentStatus, GroupStatus
 
@@ -20,25 +20,24 @@ class CustomerService:
 
     async def get_by_name(self, name: str) -> Optional[Dict]:
         """根据名称获取客户"""
-        customers = excel_store.list_customers()
-        for c in customers:
-            if c["name"] == name:
-                return c
-        return None
+        return excel_store.get_customer_by_name(name)
 
     async def create(self, name: str, contact: str = None, description: str = None) -> Dict:
         """创建客户"""
-        existing = await self.get_by_name(name)
-        if existing:
+        try:
+            return excel_store.create_customer(name=name, contact=contact, description=description)
+        except DuplicateKeyError:
             raise BadRequestException("客户名称已存在")
-        return excel_store.create_customer(name=name, contact=contact, description=description)
 
     async def update(self, customer_id: int, **kwargs) -> Dict:
         """更新客户"""
         customer = await self.get_by_id(customer_id)
         if not customer:
             raise NotFoundException("客户不存在")
-        result = excel_store.update_customer(customer_id, **kwargs)
+        try:
+            result = excel_store.update_customer(customer_id, **kwargs)
+        except DuplicateKeyError:
+            raise BadRequestException("客户名称已存在")
         if not result:
             raise NotFoundException("客户不存在")
         return result
@@ -65,25 +64,24 @@ class AppService:
 
     async def get_by_name(self, customer_id: int, name: str) -> Optional[Dict]:
         """根据名称和应用ID获取应用"""
-        apps = excel_store.list_apps(customer_id=customer_id)
-        for a in apps:
-            if a["name"] == name:
-                return a
-        return None
+        return excel_store.get_app_by_name(customer_id, name)
 
     async def create(self, customer_id: int, name: str, description: str = None) -> Dict:
         """创建应用"""
-        existing = await self.get_by_name(customer_id, name)
-        if existing:
+        try:
+            return excel_store.create_app(customer_id=customer_id, name=name, description=description)
+        except DuplicateKeyError:
             raise BadRequestException("该客户下已存在同名应用")
-        return excel_store.create_app(customer_id=customer_id, name=name, description=description)
 
     async def update(self, app_id: int, **kwargs) -> Dict:
         """更新应用"""
         app = await self.get_by_id(app_id)
         if not app:
             raise NotFoundException("应用不存在")
-        result = excel_store.update_app(app_id, **kwargs)
+        try:
+            result = excel_store.update_app(app_id, **kwargs)
+        except DuplicateKeyError:
+            raise BadRequestException("该客户下已存在同名应用")
         if not result:
             raise NotFoundException("应用不存在")
         return result
@@ -110,25 +108,24 @@ class TemplateService:
 
     async def get_by_name(self, app_id: int, name: str) -> Optional[Dict]:
         """根据名称和应用ID获取模板"""
-        templates = excel_store.list_templates(app_id=app_id)
-        for t in templates:
-            if t["name"] == name:
-                return t
-        return None
+        return excel_store.get_template_by_name(app_id, name)
 
     async def create(self, app_id: int, name: str, description: str = None) -> Dict:
         """创建模板"""
-        existing = await self.get_by_name(app_id, name)
-        if existing:
+        try:
+            return excel_store.create_template(app_id=app_id, name=name, description=description)
+        except DuplicateKeyError:
             raise BadRequestException("该应用下已存在同名模板")
-        return excel_store.create_template(app_id=app_id, name=name, description=description)
 
     async def update(self, template_id: int, **kwargs) -> Dict:
         """更新模板"""
         template = await self.get_by_id(template_id)
         if not template:
             raise NotFoundException("模板不存在")
-        result = excel_store.update_template(template_id, **kwargs)
+        try:
+            result = excel_store.update_template(template_id, **kwargs)
+        except DuplicateKeyError:
+            raise BadRequestException("该应用下已存在同名模板")
         if not result:
             raise NotFoundException("模板不存在")
         return result
@@ -166,6 +163,10 @@ class ExperimentService:
         exp = await self.get_by_id_with_templates(experiment_id)
         return exp
 
+    async def get_full(self, experiment_id: int) -> Optional[Dict]:
+        """根据ID获取实验（含关联模板路径、备注和版本，一次读取）"""
+        return excel_store.get_experiment_full(experiment_id)
+
     async def create(
         self,
         template_ids: List[int],
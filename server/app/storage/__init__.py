@@ -1,5 +1,5 @@
 """存储层"""
 
-from .excel_store import excel_store, get_color_for_experiment, PRESET_COLORS
+from .excel_store import excel_store, get_color_for_experiment, PRESET_COLORS, DuplicateKeyError
 
-__all__ = ["excel_store", "get_color_for_experiment", "PRESET_COLORS"]
+__all__ = ["excel_store", "get_color_for_experiment", "PRESET_COLORS", "DuplicateKeyError"]
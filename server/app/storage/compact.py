@@ -0,0 +1,22 @@
+"""离线整理 Excel 数据
+
+清理孤儿数据（已删除客户/应用/模板/实验遗留的下属行）并紧凑重写文件。
+运行前请先停止服务端。
+
+用法（在 server 目录下）:
+    python -m app.storage.compact
+"""
+
+from app.storage import excel_store
+
+
+def main():
+    print(f"数据目录: {excel_store.data_dir}")
+    purged = excel_store.compact()
+    for sheet, count in purged.items():
+        print(f"  {sheet}: 清理 {count} 行")
+    print(f"整理完成，共清理 {sum(purged.values())} 行")
+
+
+if __name__ == "__main__":
+    main()
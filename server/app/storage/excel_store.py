@@ -4,18 +4,29 @@
 - users.xlsx: 用户数据
 - entities.xlsx: 客户/APP/模板数据（三个 sheet）
 - experiments.xlsx: 实验数据（experiments, experiment_templates, experiment_groups）
+- meta.json: 元数据（各表的ID序列）
 """
 
+import functools
+import io
+import os
 import threading
+import time
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator, Callable
 import json
 
 from openpyxl import Workbook, load_workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
 from app.config import settings, PROJECT_ROOT
+from app.core.metrics import (
+    storage_operation_duration, storage_load_duration, storage_parse_duration,
+    storage_save_duration, storage_save_bytes, storage_lock_wait,
+)
 
 
 # 预设颜色列表
@@ -30,6 +41,159 @@ def get_color_for_experiment(experiment_id: int) -> str:
     return PRESET_COLORS[experiment_id % len(PRESET_COLORS)]
 
 
+# sheet -> 所在文件
+SHEET_FILES = {
+    "users": "users.xlsx",
+    "customers": "entities.xlsx",
+    "apps": "entities.xlsx",
+    "templates": "entities.xlsx",
+    "experiments": "experiments.xlsx",
+    "experiment_templates": "experiments.xlsx",
+    "experiment_groups": "experiments.xlsx",
+    "objective_metrics": "experiments.xlsx",
+    "template_versions": "experiments.xlsx",
+}
+
+# sheet -> 表头（新建文件和迁移时使用）
+SHEET_HEADERS = {
+    "users": ["id", "username", "password_hash", "display_name", "role",
+              "is_active", "must_change_password", "created_at", "created_by", "last_login_at"],
+    "customers": ["id", "name", "contact", "description", "created_at"],
+    "apps": ["id", "customer_id", "name", "description", "created_at"],
+    "templates": ["id", "app_id", "name", "description", "created_at"],
+    "experiments": ["id", "name", "status", "reference_type", "color",
+                    "created_at", "created_by", "updated_at"],
+    "experiment_templates": ["experiment_id", "template_id", "notes"],
+    "experiment_groups": ["id", "experiment_id", "name", "encoder_version", "transcode_params",
+                          "input_url", "output_url", "status", "order_index", "created_at", "updated_at"],
+    "objective_metrics": ["id", "group_id", "bitrate", "vmaf", "psnr", "ssim",
+                          "machine_type", "concurrent_streams", "cpu_usage", "gpu_usage",
+                          "detailed_report_url", "created_at", "updated_at"],
+    "template_versions": ["id", "experiment_id", "template_id", "name", "notes", "template_content",
+                          "order_index", "created_at", "updated_at"],
+}
+
+# 唯一索引定义：sheet -> 组成唯一键的列
+UNIQUE_INDEXES = {
+    "customers": ("name",),
+    "apps": ("customer_id", "name"),
+    "templates": ("app_id", "name"),
+}
+
+# 数据文件结构版本，记录在 meta.json 中：新建的文件即为最新结构，
+# 旧数据在首次访问时按版本迁移一次，之后启动只需比较版本号
+# 1: 初始结构  2: 新增 template_versions 表及 notes / template_content 列
+SCHEMA_VERSION = 2
+
+# 启动后后台预热的 sheet（行缓存）
+WARM_UP_SHEETS = [
+    ("entities.xlsx", "customers"),
+    ("entities.xlsx", "apps"),
+    ("entities.xlsx", "templates"),
+    ("experiments.xlsx", "experiments"),
+    ("experiments.xlsx", "experiment_templates"),
+    ("experiments.xlsx", "template_versions"),
+]
+
+
+def _to_int(value: Any) -> Any:
+    """整数列：兼容 Excel 中被改成浮点或文本的数字"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+def _to_bool(value: Any) -> Any:
+    """布尔列：兼容文本形式的 TRUE/FALSE"""
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return bool(value)
+    return value
+
+
+def _to_datetime(value: Any) -> Any:
+    """时间列：ISO 字符串解析为 datetime，无法解析时保留原值"""
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _converter_for(column: Optional[str]) -> Optional[Callable[[Any], Any]]:
+    """根据列名推断类型转换函数"""
+    if not column:
+        return None
+    if column in ("is_active", "must_change_password"):
+        return _to_bool
+    if column in ("id", "created_by", "order_index", "concurrent_streams") or column.endswith("_id"):
+        return _to_int
+    if column.endswith("_at"):
+        return _to_datetime
+    return None
+
+
+class SheetSchema:
+    """Sheet 列结构：列名 -> 列下标（从0开始），以及各列的类型转换"""
+
+    def __init__(self, headers: Iterable[Optional[str]]):
+        self.headers = list(headers)
+        self.columns = {name: idx for idx, name in enumerate(self.headers) if name is not None}
+        self._converters = [
+            (idx, name, conv) for idx, name in enumerate(self.headers)
+            if (conv := _converter_for(name)) is not None
+        ]
+
+    @classmethod
+    def from_worksheet(cls, ws: Worksheet) -> "SheetSchema":
+        """读取表头构建列结构"""
+        header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        return cls(header)
+
+    def to_dict(self, values: Optional[tuple]) -> Optional[Dict[str, Any]]:
+        """行值转字典，首列为空视为空行返回 None"""
+        if not values or values[0] is None:
+            return None
+
+        if len(values) < len(self.headers):
+            values = tuple(values) + (None,) * (len(self.headers) - len(values))
+        record = dict(zip(self.headers, values))
+        for idx, name, conv in self._converters:
+            value = values[idx]
+            if value is not None:
+                record[name] = conv(value)
+        return record
+
+    def to_values(self, record: Dict[str, Any]) -> list:
+        """字典按表头顺序转为行值，缺失列为 None"""
+        return [record.get(name) if name is not None else None for name in self.headers]
+
+
+class DuplicateKeyError(ValueError):
+    """违反唯一索引"""
+
+    def __init__(self, sheet: str, key: tuple):
+        super().__init__(f"{sheet} 唯一键冲突: {key}")
+        self.sheet = sheet
+        self.key = key
+
+
+class _Transaction:
+    """写事务：同一线程内共享已加载的工作簿，结束时统一保存"""
+
+    def __init__(self):
+        self.workbooks: Dict[str, Workbook] = {}
+        self.dirty: set = set()
+        # 事务内维护的唯一索引：sheet -> {key: id}
+        self.indexes: Dict[str, Dict[tuple, int]] = {}
+        # 事务内分配过ID，提交时写一次 meta.json
+        self.meta_dirty = False
+
+
 def _get_data_dir() -> Path:
     """获取数据目录路径"""
     if settings.DEBUG:
@@ -62,13 +226,34 @@ class ExcelStore:
         self.data_dir = _get_data_dir()
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        self._file_lock = threading.Lock()
-
-        # 初始化文件
-        self._init_files()
+        # 可重入：写事务持有锁期间内部的加载/保存会再次获取
+        self._file_lock = threading.RLock()
+        self._local = threading.local()
+        # 唯一索引缓存：sheet -> (文件版本, {key: id})
+        self._index_cache: Dict[str, Tuple[tuple, Dict[tuple, int]]] = {}
+        # 已类型化的数据行缓存：(文件名, sheet) -> (文件版本, [行字典])，只在事务外读取时使用
+        self._record_cache: Dict[Tuple[str, str], Tuple[tuple, List[Dict[str, Any]]]] = {}
+        # 已加载 sheet 的列结构缓存，随工作簿释放
+        self._schemas: "weakref.WeakKeyDictionary[Worksheet, SheetSchema]" = weakref.WeakKeyDictionary()
+        # 元数据（ID序列、结构版本等），首次使用时从 meta.json 加载
+        self._meta: Optional[Dict[str, Any]] = None
+        # 数据文件延迟到第一次访问时初始化，导入模块不读写 Excel
+        self._files_ready = False
+
+    def _ensure_files(self):
+        """首次访问时初始化数据文件并执行待运行的迁移"""
+        if self._files_ready:
+            return
+        with self._file_lock:
+            if not self._files_ready:
+                self._init_files()
+                self._files_ready = True
 
     def _init_files(self):
         """初始化 Excel 文件"""
+        meta = self._load_meta()
+        migrate = meta.get("schema_version", 1) < SCHEMA_VERSION
+
         # 用户文件
         users_file = self.data_dir / "users.xlsx"
         if not users_file.exists():
@@ -83,21 +268,45 @@ class ExcelStore:
         experiments_file = self.data_dir / "experiments.xlsx"
         if not experiments_file.exists():
             self._create_experiments_file(experiments_file)
-        else:
+        elif migrate:
             # 迁移：检查是否需要添加 template_versions 表
             self._migrate_add_template_versions(experiments_file)
 
+        if meta.get("schema_version") != SCHEMA_VERSION:
+            meta["schema_version"] = SCHEMA_VERSION
+            self._save_meta()
+
+    def _needs_template_versions_migration(self, filepath: Path) -> bool:
+        """只读检查表头，判断是否需要执行 template_versions 迁移（不解析数据行）"""
+        wb = load_workbook(filepath, read_only=True)
+        try:
+            if "template_versions" not in wb.sheetnames:
+                return True
+            required = {
+                "experiment_templates": {"notes"},
+                "template_versions": {"notes", "template_content"},
+            }
+            for sheet, columns in required.items():
+                header = next(wb[sheet].iter_rows(min_row=1, max_row=1, values_only=True), ())
+                if not columns <= set(header):
+                    return True
+            return False
+        finally:
+            wb.close()
+
     def _migrate_add_template_versions(self, filepath: Path):
         """迁移：添加 template_versions 表"""
         with self._file_lock:
+            if not self._needs_template_versions_migration(filepath):
+                return
+
             wb = load_workbook(filepath)
             changed = False
 
             # 添加 template_versions 表
             if "template_versions" not in wb.sheetnames:
                 ws = wb.create_sheet("template_versions")
-                headers = ["id", "experiment_id", "template_id", "name", "notes", "template_content", "order_index", "created_at", "updated_at"]
-                for col, header in enumerate(headers, 1):
+                for col, header in enumerate(SHEET_HEADERS["template_versions"], 1):
                     ws.cell(row=1, column=col, value=header)
                 changed = True
 
@@ -133,9 +342,7 @@ class ExcelStore:
         ws.title = "users"
 
         # 表头
-        headers = ["id", "username", "password_hash", "display_name", "role",
-                   "is_active", "must_change_password", "created_at", "created_by", "last_login_at"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(SHEET_HEADERS["users"], 1):
             ws.cell(row=1, column=col, value=header)
 
         # 默认 root 用户 (密码: root123)
@@ -156,20 +363,17 @@ class ExcelStore:
         # 客户表
         ws_customers = wb.active
         ws_customers.title = "customers"
-        headers = ["id", "name", "contact", "description", "created_at"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(SHEET_HEADERS["customers"], 1):
             ws_customers.cell(row=1, column=col, value=header)
 
         # 应用表
         ws_apps = wb.create_sheet("apps")
-        headers = ["id", "customer_id", "name", "description", "created_at"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(SHEET_HEADERS["apps"], 1):
             ws_apps.cell(row=1, column=col, value=header)
 
         # 模板表
         ws_templates = wb.create_sheet("templates")
-        headers = ["id", "app_id", "name", "description", "created_at"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(SHEET_HEADERS["templates"], 1):
             ws_templates.cell(row=1, column=col, value=header)
 
         wb.save(filepath)
@@ -181,645 +385,929 @@ class ExcelStore:
         # 实验表
         ws_experiments = wb.active
         ws_experiments.title = "experiments"
-        headers = ["id", "name", "status", "reference_type", "color",
-                   "created_at", "created_by", "updated_at"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(SHEET_HEADERS["experiments"], 1):
             ws_experiments.cell(row=1, column=col, value=header)
 
         # 实验-模板关联表
         ws_links = wb.create_sheet("experiment_templates")
-        headers = ["experiment_id", "template_id", "notes"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(SHEET_HEADERS["experiment_templates"], 1):
             ws_links.cell(row=1, column=col, value=header)
 
         # 实验组表
         ws_groups = wb.create_sheet("experiment_groups")
-        headers = ["id", "experiment_id", "name", "encoder_version", "transcode_params",
-                   "input_url", "output_url", "status", "order_index", "created_at", "updated_at"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(SHEET_HEADERS["experiment_groups"], 1):
             ws_groups.cell(row=1, column=col, value=header)
 
         # 客观指标表
         ws_metrics = wb.create_sheet("objective_metrics")
-        headers = ["id", "group_id", "bitrate", "vmaf", "psnr", "ssim",
-                   "machine_type", "concurrent_streams", "cpu_usage", "gpu_usage",
-                   "detailed_report_url", "created_at", "updated_at"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(SHEET_HEADERS["objective_metrics"], 1):
             ws_metrics.cell(row=1, column=col, value=header)
 
         # 模板版本表
         ws_versions = wb.create_sheet("template_versions")
-        headers = ["id", "experiment_id", "template_id", "name", "notes", "template_content", "order_index", "created_at", "updated_at"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(SHEET_HEADERS["template_versions"], 1):
             ws_versions.cell(row=1, column=col, value=header)
 
         wb.save(filepath)
 
     # ============ 通用方法 ============
 
-    def _load_workbook(self, filename: str) -> Workbook:
-        """加载工作簿"""
-        filepath = self.data_dir / filename
+    @contextmanager
+    def transaction(self):
+        """写事务
+
+        持有文件锁直到事务结束；事务内加载的工作簿只加载一次，
+        所有修改在退出时统一保存，出现异常则全部丢弃。可嵌套，
+        内层事务并入最外层。
+        """
+        with self._locked():
+            tx = getattr(self._local, "tx", None)
+            if tx is not None:
+                yield tx
+                return
+
+            tx = _Transaction()
+            self._local.tx = tx
+            try:
+                yield tx
+                self._commit(tx)
+            finally:
+                self._local.tx = None
+
+    def _commit(self, tx: _Transaction):
+        """保存事务中修改过的工作簿，并发布事务内的唯一索引"""
+        # 先保存ID序列再保存数据：中途失败最多留下未使用的ID，不会出现序列落后于文件中的ID
+        if tx.meta_dirty:
+            self._save_meta()
+        for filename in tx.dirty:
+            self._write_workbook(tx.workbooks[filename], filename)
+
+        # 发布索引：只要对应文件未被修改或已随本事务保存，索引即与文件一致
+        for sheet, index in tx.indexes.items():
+            self._index_cache[sheet] = (self._file_version("entities.xlsx"), index)
+
+    def _file_version(self, filename: str) -> tuple:
+        """文件版本标识（修改时间 + 大小），用于判断缓存是否过期"""
+        stat = (self.data_dir / filename).stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """获取文件锁，并记录等待耗时"""
+        self._ensure_files()
+        start = time.perf_counter()
         with self._file_lock:
-            return load_workbook(filepath)
+            storage_lock_wait.observe(time.perf_counter() - start)
+            yield
 
-    def _save_workbook(self, wb: Workbook, filename: str):
-        """保存工作簿"""
+    def _open_workbook(self, filename: str, read_only: bool = False) -> Workbook:
+        """读取文件并解析为工作簿，分别记录读取和解析耗时
+
+        read_only 模式下解析在遍历时才发生，这里只包含打开和读取目录的开销。
+        """
+        with storage_load_duration.time(file=filename):
+            data = (self.data_dir / filename).read_bytes()
+        with storage_parse_duration.time(file=filename, mode="read_only" if read_only else "full"):
+            return load_workbook(io.BytesIO(data), read_only=read_only)
+
+    def _write_workbook(self, wb: Workbook, filename: str):
+        """保存工作簿，记录耗时和文件大小"""
         filepath = self.data_dir / filename
-        with self._file_lock:
+        with storage_save_duration.time(file=filename):
             wb.save(filepath)
+        # 修改时间精度不足时文件版本可能不变，保存后主动丢弃该文件的行缓存
+        for key in [key for key in self._record_cache if key[0] == filename]:
+            del self._record_cache[key]
+        storage_save_bytes.observe(filepath.stat().st_size, file=filename)
+
+    def _load_workbook(self, filename: str) -> Workbook:
+        """加载工作簿（事务内复用已加载的工作簿）"""
+        tx = getattr(self._local, "tx", None)
+        if tx is not None:
+            if filename not in tx.workbooks:
+                tx.workbooks[filename] = self._open_workbook(filename)
+            return tx.workbooks[filename]
+
+        with self._locked():
+            return self._open_workbook(filename)
+
+    @contextmanager
+    def _read_workbook(self, filename: str) -> Iterator[Workbook]:
+        """只读加载工作簿
+
+        事务外使用 openpyxl 的 read_only 流式模式，不构建单元格对象图，
+        按需逐行解析。流式读取期间持有文件锁，防止被并发保存覆盖。
+        事务内直接复用事务中的工作簿，以读到未提交的修改。
+        """
+        tx = getattr(self._local, "tx", None)
+        if tx is not None:
+            yield self._load_workbook(filename)
+            return
+
+        with self._locked():
+            wb = self._open_workbook(filename, read_only=True)
+            try:
+                yield wb
+            finally:
+                wb.close()
+
+    def _save_workbook(self, wb: Workbook, filename: str):
+        """保存工作簿（事务内延迟到提交时保存）"""
+        tx = getattr(self._local, "tx", None)
+        if tx is not None:
+            tx.workbooks[filename] = wb
+            tx.dirty.add(filename)
+            return
+
+        with self._locked():
+            self._write_workbook(wb, filename)
+
+    def _load_meta(self) -> Dict[str, Any]:
+        """加载元数据"""
+        if self._meta is None:
+            meta_file = self.data_dir / "meta.json"
+            if meta_file.exists():
+                self._meta = json.loads(meta_file.read_text(encoding="utf-8"))
+            else:
+                self._meta = {}
+            self._meta.setdefault("sequences", {})
+        return self._meta
+
+    def _save_meta(self):
+        """保存元数据（先写临时文件再替换，避免写一半）"""
+        meta_file = self.data_dir / "meta.json"
+        tmp_file = meta_file.with_suffix(".json.tmp")
+        tmp_file.write_text(json.dumps(self._meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_file, meta_file)
+
+    def _allocate_ids(self, sheet: str, count: int = 1, ws: Worksheet = None) -> int:
+        """分配ID，返回连续 count 个ID中的第一个
+
+        每张表维护持久化的单调序列，删除后ID不会被复用。
+        序列不存在时（旧数据）扫描一次现有最大ID作为起点。
+        事务内只更新内存中的序列，提交时写一次 meta.json；事务回滚时已分配的ID作废，不再使用。
+        """
+        with self._locked():
+            sequences = self._load_meta()["sequences"]
+            last_id = sequences.get(sheet)
+            if last_id is None:
+                if ws is None:
+                    ws = self._load_workbook(SHEET_FILES[sheet])[sheet]
+                last_id = 0
+                for (value,) in ws.iter_rows(min_row=2, max_col=1, values_only=True):
+                    if value and isinstance(value, int):
+                        last_id = max(last_id, value)
+
+            sequences[sheet] = last_id + count
+            tx = getattr(self._local, "tx", None)
+            if tx is not None:
+                tx.meta_dirty = True
+            else:
+                self._save_meta()
+            return last_id + 1
 
     def _get_next_id(self, ws: Worksheet) -> int:
         """获取下一个ID"""
-        max_id = 0
-        for row in range(2, ws.max_row + 1):
-            value = ws.cell(row=row, column=1).value
-            if value and isinstance(value, int):
-                max_id = max(max_id, value)
-        return max_id + 1
+        return self._allocate_ids(ws.title, ws=ws)
+
+    def _schema(self, ws: Worksheet) -> SheetSchema:
+        """获取 sheet 的列结构（每个已加载的 sheet 只读取一次表头）"""
+        schema = self._schemas.get(ws)
+        if schema is None:
+            schema = SheetSchema.from_worksheet(ws)
+            self._schemas[ws] = schema
+        return schema
+
+    def _iter_records(self, ws: Worksheet) -> Iterator[Dict[str, Any]]:
+        """逐行产出数据行字典（跳过空行）"""
+        to_dict = self._schema(ws).to_dict
+        for values in ws.iter_rows(min_row=2, values_only=True):
+            record = to_dict(values)
+            if record is not None:
+                yield record
+
+    def _records(self, filename: str, sheet: str) -> List[Dict[str, Any]]:
+        """sheet 的全部数据行（已做类型转换）
+
+        事务外按文件版本缓存，文件未变化时不再读取和解析 Excel；
+        返回的是缓存中的字典，调用方不得修改（需要修改时先复制）。
+        事务内直接读取事务中的工作簿，以读到未提交的修改。
+        """
+        if getattr(self._local, "tx", None) is not None:
+            return list(self._iter_records(self._load_workbook(filename)[sheet]))
+
+        with self._locked():
+            version = self._file_version(filename)
+            cached = self._record_cache.get((filename, sheet))
+            if cached and cached[0] == version:
+                return cached[1]
+
+            with self._read_workbook(filename) as wb:
+                records = list(self._iter_records(wb[sheet]))
+            self._record_cache[(filename, sheet)] = (version, records)
+            return records
 
     def _row_to_dict(self, ws: Worksheet, row: int) -> Optional[Dict[str, Any]]:
         """行转字典"""
         if row > ws.max_row:
             return None
 
-        values = []
-        for col in range(1, ws.max_column + 1):
-            values.append(ws.cell(row=row, column=col).value)
+        values = next(ws.iter_rows(min_row=row, max_row=row, values_only=True), None)
+        return self._schema(ws).to_dict(values)
 
-        if not values or values[0] is None:
-            return None
+    def _insert_row(self, ws: Worksheet, record: Dict[str, Any]) -> Dict[str, Any]:
+        """在末尾追加一行，按表头顺序写入，返回新行字典"""
+        schema = self._schema(ws)
+        values = schema.to_values(record)
+        new_row = ws.max_row + 1
+        for col, value in enumerate(values, 1):
+            ws.cell(row=new_row, column=col, value=value)
+        return schema.to_dict(values)
+
+    def _update_row(self, ws: Worksheet, row: int, values: Dict[str, Any]) -> None:
+        """更新一行中已存在的列，未知列忽略"""
+        columns = self._schema(ws).columns
+        for key, value in values.items():
+            if key in columns:
+                ws.cell(row=row, column=columns[key] + 1, value=value)
+
+    def _build_unique_index(self, ws: Worksheet) -> Dict[tuple, int]:
+        """扫描 sheet 构建唯一索引（与 SQL 一致，含空值的键不参与唯一约束）"""
+        key_fields = UNIQUE_INDEXES[ws.title]
+
+        index = {}
+        for record in self._iter_records(ws):
+            key = tuple(record.get(f) for f in key_fields)
+            if None not in key:
+                index[key] = record["id"]
+        return index
+
+    def _unique_index(self, sheet: str) -> Dict[tuple, int]:
+        """获取事务内的唯一索引，缓存未过期时无需读取工作簿（须在事务内调用）"""
+        tx = self._local.tx
+        if sheet not in tx.indexes:
+            cached = self._index_cache.get(sheet)
+            if cached and "entities.xlsx" not in tx.dirty and cached[0] == self._file_version("entities.xlsx"):
+                tx.indexes[sheet] = dict(cached[1])
+            else:
+                ws = self._load_workbook("entities.xlsx")[sheet]
+                tx.indexes[sheet] = self._build_unique_index(ws)
+        return tx.indexes[sheet]
+
+    def _invalidate_unique_index(self, sheet: str):
+        """行被删除后丢弃事务内的索引，由下次访问重建"""
+        tx = getattr(self._local, "tx", None)
+        if tx is not None:
+            tx.indexes.pop(sheet, None)
+        self._index_cache.pop(sheet, None)
+
+    def _insert_unique(self, ws: Worksheet, key: tuple, id_value: int):
+        """登记唯一键，冲突时抛出 DuplicateKeyError（须在事务内调用）"""
+        if None in key:
+            return
+        index = self._unique_index(ws.title)
+        if key in index:
+            raise DuplicateKeyError(ws.title, key)
+        index[key] = id_value
+
+    def _update_unique(self, ws: Worksheet, row: int, kwargs: dict):
+        """更新前校验并改写唯一键（须在事务内调用）"""
+        key_fields = UNIQUE_INDEXES[ws.title]
+        if not any(field in kwargs for field in key_fields):
+            return
 
-        headers = [ws.cell(row=1, column=col).value for col in range(1, ws.max_column + 1)]
-        return dict(zip(headers, values))
+        current = self._row_to_dict(ws, row)
+        old_key = tuple(current.get(f) for f in key_fields)
+        new_key = tuple(kwargs.get(f, old) for f, old in zip(key_fields, old_key))
+        if new_key == old_key:
+            return
+
+        id_value = current["id"]
+        index = self._unique_index(ws.title)
+        if None not in new_key and index.get(new_key, id_value) != id_value:
+            raise DuplicateKeyError(ws.title, new_key)
+        index.pop(old_key, None)
+        if None not in new_key:
+            index[new_key] = id_value
+
+    def _lookup_unique(self, sheet: str, key: tuple) -> Optional[int]:
+        """通过唯一索引查找ID"""
+        cached = self._index_cache.get(sheet)
+        if cached and cached[0] == self._file_version("entities.xlsx"):
+            return cached[1].get(key)
+
+        with self.transaction():
+            return self._unique_index(sheet).get(key)
 
     def _find_row_by_id(self, ws: Worksheet, id_value: int) -> int:
         """根据ID查找行号，返回0表示未找到"""
-        for row in range(2, ws.max_row + 1):
-            if ws.cell(row=row, column=1).value == id_value:
+        for row, (value,) in enumerate(ws.iter_rows(min_row=2, max_col=1, values_only=True), start=2):
+            if value == id_value:
                 return row
         return 0
 
+    def _find_by_id(self, ws: Worksheet, id_value: int) -> Optional[Dict[str, Any]]:
+        """根据ID获取数据行（单次顺序扫描，兼容只读工作簿）"""
+        for values in ws.iter_rows(min_row=2, values_only=True):
+            if values and values[0] == id_value:
+                return self._schema(ws).to_dict(values)
+        return None
+
+    def _delete_rows_where(self, ws: Worksheet, predicate) -> List[Dict[str, Any]]:
+        """删除满足条件的数据行，返回被删除的行（连续行合并为一次删除）"""
+        to_dict = self._schema(ws).to_dict
+
+        deleted = []
+        rows = []
+        for row, values in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+            record = to_dict(values)
+            if record is not None and predicate(record):
+                deleted.append(record)
+                rows.append(row)
+
+        # 自底向上删除，避免行号偏移
+        while rows:
+            end = rows.pop()
+            start = end
+            while rows and rows[-1] == start - 1:
+                start = rows.pop()
+            ws.delete_rows(start, end - start + 1)
+        return deleted
+
+    def _cascade_delete_entities(self, customer_ids: set = (), app_ids: set = (),
+                                 template_ids: set = ()) -> None:
+        """在当前事务内级联删除客户/应用/模板及其下属数据
+
+        客户 -> 应用 -> 模板 -> 实验-模板关联、模板版本
+        """
+        wb = self._load_workbook("entities.xlsx")
+        customer_ids, app_ids, template_ids = set(customer_ids), set(app_ids), set(template_ids)
+
+        if customer_ids:
+            self._delete_rows_where(wb["customers"], lambda r: r["id"] in customer_ids)
+            self._invalidate_unique_index("customers")
+        deleted_apps = self._delete_rows_where(
+            wb["apps"], lambda r: r["id"] in app_ids or r["customer_id"] in customer_ids
+        )
+        app_ids |= {a["id"] for a in deleted_apps}
+        if deleted_apps:
+            self._invalidate_unique_index("apps")
+        deleted_templates = self._delete_rows_where(
+            wb["templates"], lambda r: r["id"] in template_ids or r["app_id"] in app_ids
+        )
+        template_ids |= {t["id"] for t in deleted_templates}
+        if deleted_templates:
+            self._invalidate_unique_index("templates")
+        self._save_workbook(wb, "entities.xlsx")
+
+        if not template_ids:
+            return
+
+        wb_experiments = self._load_workbook("experiments.xlsx")
+        links = self._delete_rows_where(
+            wb_experiments["experiment_templates"], lambda r: r["template_id"] in template_ids
+        )
+        versions = self._delete_rows_where(
+            wb_experiments["template_versions"], lambda r: r["template_id"] in template_ids
+        )
+        if links or versions:
+            self._save_workbook(wb_experiments, "experiments.xlsx")
+
     # ============ 用户方法 ============
 
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """根据用户名获取用户"""
-        wb = self._load_workbook("users.xlsx")
-        ws = wb["users"]
+        with self._read_workbook("users.xlsx") as wb:
+            ws = wb["users"]
 
-        for row in range(2, ws.max_row + 1):
-            if ws.cell(row=row, column=2).value == username:
-                return self._row_to_dict(ws, row)
-        return None
+            for user in self._iter_records(ws):
+                if user.get("username") == username:
+                    return user
+            return None
 
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """根据ID获取用户"""
-        wb = self._load_workbook("users.xlsx")
-        ws = wb["users"]
-
-        row = self._find_row_by_id(ws, user_id)
-        if row:
-            return self._row_to_dict(ws, row)
-        return None
+        with self._read_workbook("users.xlsx") as wb:
+            return self._find_by_id(wb["users"], user_id)
 
     def list_users(self) -> List[Dict]:
         """获取所有用户"""
-        wb = self._load_workbook("users.xlsx")
-        ws = wb["users"]
-
-        users = []
-        for row in range(2, ws.max_row + 1):
-            user = self._row_to_dict(ws, row)
-            if user:
-                users.append(user)
-        return users
+        with self._read_workbook("users.xlsx") as wb:
+            return list(self._iter_records(wb["users"]))
 
     def create_user(self, username: str, password_hash: str, display_name: str,
                     role: str, created_by: int = None) -> Dict:
         """创建用户"""
-        wb = self._load_workbook("users.xlsx")
-        ws = wb["users"]
-
-        new_id = self._get_next_id(ws)
-        new_row = ws.max_row + 1
-
-        ws.cell(row=new_row, column=1, value=new_id)
-        ws.cell(row=new_row, column=2, value=username)
-        ws.cell(row=new_row, column=3, value=password_hash)
-        ws.cell(row=new_row, column=4, value=display_name)
-        ws.cell(row=new_row, column=5, value=role)
-        ws.cell(row=new_row, column=6, value=True)
-        ws.cell(row=new_row, column=7, value=True)
-        ws.cell(row=new_row, column=8, value=datetime.now().isoformat())
-        ws.cell(row=new_row, column=9, value=created_by)
-        ws.cell(row=new_row, column=10, value=None)
+        with self.transaction():
+            wb = self._load_workbook("users.xlsx")
+            ws = wb["users"]
+
+            user = self._insert_row(ws, {
+                "id": self._get_next_id(ws),
+                "username": username,
+                "password_hash": password_hash,
+                "display_name": display_name,
+                "role": role,
+                "is_active": True,
+                "must_change_password": True,
+                "created_at": datetime.now().isoformat(),
+                "created_by": created_by,
+                "last_login_at": None,
+            })
 
-        self._save_workbook(wb, "users.xlsx")
-        return self._row_to_dict(ws, new_row)
+            self._save_workbook(wb, "users.xlsx")
+            return user
 
     def update_user(self, user_id: int, **kwargs) -> Optional[Dict]:
         """更新用户"""
-        wb = self._load_workbook("users.xlsx")
-        ws = wb["users"]
+        with self.transaction():
+            wb = self._load_workbook("users.xlsx")
+            ws = wb["users"]
 
-        row = self._find_row_by_id(ws, user_id)
-        if not row:
-            return None
+            row = self._find_row_by_id(ws, user_id)
+            if not row:
+                return None
 
-        headers = [ws.cell(row=1, column=col).value for col in range(1, ws.max_column + 1)]
-        for key, value in kwargs.items():
-            if key in headers:
-                col = headers.index(key) + 1
-                ws.cell(row=row, column=col, value=value)
+            self._update_row(ws, row, kwargs)
 
-        self._save_workbook(wb, "users.xlsx")
-        return self._row_to_dict(ws, row)
+            self._save_workbook(wb, "users.xlsx")
+            return self._row_to_dict(ws, row)
 
     def delete_user(self, user_id: int) -> bool:
         """删除用户"""
-        wb = self._load_workbook("users.xlsx")
-        ws = wb["users"]
+        with self.transaction():
+            wb = self._load_workbook("users.xlsx")
+            ws = wb["users"]
 
-        row = self._find_row_by_id(ws, user_id)
-        if not row:
-            return False
+            row = self._find_row_by_id(ws, user_id)
+            if not row:
+                return False
 
-        ws.delete_rows(row)
-        self._save_workbook(wb, "users.xlsx")
-        return True
+            ws.delete_rows(row)
+            self._save_workbook(wb, "users.xlsx")
+            return True
 
     # ============ 客户方法 ============
 
     def list_customers(self) -> List[Dict]:
         """获取所有客户"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["customers"]
-
-        customers = []
-        for row in range(2, ws.max_row + 1):
-            customer = self._row_to_dict(ws, row)
-            if customer:
-                customers.append(customer)
-        return customers
+        return [dict(customer) for customer in self._records("entities.xlsx", "customers")]
 
     def get_customer_by_id(self, customer_id: int) -> Optional[Dict]:
         """根据ID获取客户"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["customers"]
+        with self._read_workbook("entities.xlsx") as wb:
+            return self._find_by_id(wb["customers"], customer_id)
 
-        row = self._find_row_by_id(ws, customer_id)
-        if row:
-            return self._row_to_dict(ws, row)
-        return None
+    def get_customer_by_name(self, name: str) -> Optional[Dict]:
+        """根据名称获取客户（走唯一索引）"""
+        customer_id = self._lookup_unique("customers", (name,))
+        return self.get_customer_by_id(customer_id) if customer_id else None
 
     def create_customer(self, name: str, contact: str = None, description: str = None) -> Dict:
         """创建客户"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["customers"]
-
-        new_id = self._get_next_id(ws)
-        new_row = ws.max_row + 1
-
-        ws.cell(row=new_row, column=1, value=new_id)
-        ws.cell(row=new_row, column=2, value=name)
-        ws.cell(row=new_row, column=3, value=contact)
-        ws.cell(row=new_row, column=4, value=description)
-        ws.cell(row=new_row, column=5, value=datetime.now().isoformat())
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            ws = wb["customers"]
+
+            new_id = self._get_next_id(ws)
+            self._insert_unique(ws, (name,), new_id)
+            customer = self._insert_row(ws, {
+                "id": new_id,
+                "name": name,
+                "contact": contact,
+                "description": description,
+                "created_at": datetime.now().isoformat(),
+            })
 
-        self._save_workbook(wb, "entities.xlsx")
-        return self._row_to_dict(ws, new_row)
+            self._save_workbook(wb, "entities.xlsx")
+            return customer
 
     def update_customer(self, customer_id: int, **kwargs) -> Optional[Dict]:
         """更新客户"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["customers"]
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            ws = wb["customers"]
 
-        row = self._find_row_by_id(ws, customer_id)
-        if not row:
-            return None
+            row = self._find_row_by_id(ws, customer_id)
+            if not row:
+                return None
 
-        headers = [ws.cell(row=1, column=col).value for col in range(1, ws.max_column + 1)]
-        for key, value in kwargs.items():
-            if key in headers:
-                col = headers.index(key) + 1
-                ws.cell(row=row, column=col, value=value)
+            self._update_unique(ws, row, kwargs)
+            self._update_row(ws, row, kwargs)
 
-        self._save_workbook(wb, "entities.xlsx")
-        return self._row_to_dict(ws, row)
+            self._save_workbook(wb, "entities.xlsx")
+            return self._row_to_dict(ws, row)
 
     def delete_customer(self, customer_id: int) -> bool:
-        """删除客户"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["customers"]
+        """删除客户（级联删除下属数据，单次事务写入）"""
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            ws = wb["customers"]
 
-        row = self._find_row_by_id(ws, customer_id)
-        if not row:
-            return False
+            if not self._find_row_by_id(ws, customer_id):
+                return False
 
-        ws.delete_rows(row)
-        self._save_workbook(wb, "entities.xlsx")
-        return True
+            self._cascade_delete_entities(customer_ids={customer_id})
+            return True
 
     # ============ 应用方法 ============
 
     def list_apps(self, customer_id: int = None) -> List[Dict]:
         """获取应用列表"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["apps"]
-
-        apps = []
-        for row in range(2, ws.max_row + 1):
-            app = self._row_to_dict(ws, row)
-            if app and (customer_id is None or app.get("customer_id") == customer_id):
-                apps.append(app)
-        return apps
+        return [
+            dict(app) for app in self._records("entities.xlsx", "apps")
+            if customer_id is None or app.get("customer_id") == customer_id
+        ]
 
     def get_app_by_id(self, app_id: int) -> Optional[Dict]:
         """根据ID获取应用"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["apps"]
+        with self._read_workbook("entities.xlsx") as wb:
+            return self._find_by_id(wb["apps"], app_id)
 
-        row = self._find_row_by_id(ws, app_id)
-        if row:
-            return self._row_to_dict(ws, row)
-        return None
+    def get_app_by_name(self, customer_id: int, name: str) -> Optional[Dict]:
+        """根据客户ID和名称获取应用（走唯一索引）"""
+        app_id = self._lookup_unique("apps", (customer_id, name))
+        return self.get_app_by_id(app_id) if app_id else None
 
     def create_app(self, customer_id: int, name: str, description: str = None) -> Dict:
         """创建应用"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["apps"]
-
-        new_id = self._get_next_id(ws)
-        new_row = ws.max_row + 1
-
-        ws.cell(row=new_row, column=1, value=new_id)
-        ws.cell(row=new_row, column=2, value=customer_id)
-        ws.cell(row=new_row, column=3, value=name)
-        ws.cell(row=new_row, column=4, value=description)
-        ws.cell(row=new_row, column=5, value=datetime.now().isoformat())
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            ws = wb["apps"]
+
+            new_id = self._get_next_id(ws)
+            self._insert_unique(ws, (customer_id, name), new_id)
+            app = self._insert_row(ws, {
+                "id": new_id,
+                "customer_id": customer_id,
+                "name": name,
+                "description": description,
+                "created_at": datetime.now().isoformat(),
+            })
 
-        self._save_workbook(wb, "entities.xlsx")
-        return self._row_to_dict(ws, new_row)
+            self._save_workbook(wb, "entities.xlsx")
+            return app
 
     def update_app(self, app_id: int, **kwargs) -> Optional[Dict]:
         """更新应用"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["apps"]
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            ws = wb["apps"]
 
-        row = self._find_row_by_id(ws, app_id)
-        if not row:
-            return None
+            row = self._find_row_by_id(ws, app_id)
+            if not row:
+                return None
 
-        headers = [ws.cell(row=1, column=col).value for col in range(1, ws.max_column + 1)]
-        for key, value in kwargs.items():
-            if key in headers:
-                col = headers.index(key) + 1
-                ws.cell(row=row, column=col, value=value)
+            self._update_unique(ws, row, kwargs)
+            self._update_row(ws, row, kwargs)
 
-        self._save_workbook(wb, "entities.xlsx")
-        return self._row_to_dict(ws, row)
+            self._save_workbook(wb, "entities.xlsx")
+            return self._row_to_dict(ws, row)
 
     def delete_app(self, app_id: int) -> bool:
-        """删除应用"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["apps"]
+        """删除应用（级联删除下属数据，单次事务写入）"""
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            ws = wb["apps"]
 
-        row = self._find_row_by_id(ws, app_id)
-        if not row:
-            return False
+            if not self._find_row_by_id(ws, app_id):
+                return False
 
-        ws.delete_rows(row)
-        self._save_workbook(wb, "entities.xlsx")
-        return True
+            self._cascade_delete_entities(app_ids={app_id})
+            return True
 
     # ============ 模板方法 ============
 
     def list_templates(self, app_id: int = None) -> List[Dict]:
         """获取模板列表"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["templates"]
-
-        templates = []
-        for row in range(2, ws.max_row + 1):
-            template = self._row_to_dict(ws, row)
-            if template and (app_id is None or template.get("app_id") == app_id):
-                templates.append(template)
-        return templates
+        return [
+            dict(template) for template in self._records("entities.xlsx", "templates")
+            if app_id is None or template.get("app_id") == app_id
+        ]
 
     def get_template_by_id(self, template_id: int) -> Optional[Dict]:
         """根据ID获取模板"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["templates"]
+        with self._read_workbook("entities.xlsx") as wb:
+            return self._find_by_id(wb["templates"], template_id)
 
-        row = self._find_row_by_id(ws, template_id)
-        if row:
-            return self._row_to_dict(ws, row)
-        return None
+    def get_template_by_name(self, app_id: int, name: str) -> Optional[Dict]:
+        """根据应用ID和名称获取模板（走唯一索引）"""
+        template_id = self._lookup_unique("templates", (app_id, name))
+        return self.get_template_by_id(template_id) if template_id else None
 
     def create_template(self, app_id: int, name: str, description: str = None) -> Dict:
         """创建模板"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["templates"]
-
-        new_id = self._get_next_id(ws)
-        new_row = ws.max_row + 1
-
-        ws.cell(row=new_row, column=1, value=new_id)
-        ws.cell(row=new_row, column=2, value=app_id)
-        ws.cell(row=new_row, column=3, value=name)
-        ws.cell(row=new_row, column=4, value=description)
-        ws.cell(row=new_row, column=5, value=datetime.now().isoformat())
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            ws = wb["templates"]
+
+            new_id = self._get_next_id(ws)
+            self._insert_unique(ws, (app_id, name), new_id)
+            template = self._insert_row(ws, {
+                "id": new_id,
+                "app_id": app_id,
+                "name": name,
+                "description": description,
+                "created_at": datetime.now().isoformat(),
+            })
 
-        self._save_workbook(wb, "entities.xlsx")
-        return self._row_to_dict(ws, new_row)
+            self._save_workbook(wb, "entities.xlsx")
+            return template
 
     def update_template(self, template_id: int, **kwargs) -> Optional[Dict]:
         """更新模板"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["templates"]
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            ws = wb["templates"]
 
-        row = self._find_row_by_id(ws, template_id)
-        if not row:
-            return None
+            row = self._find_row_by_id(ws, template_id)
+            if not row:
+                return None
 
-        headers = [ws.cell(row=1, column=col).value for col in range(1, ws.max_column + 1)]
-        for key, value in kwargs.items():
-            if key in headers:
-                col = headers.index(key) + 1
-                ws.cell(row=row, column=col, value=value)
+            self._update_unique(ws, row, kwargs)
+            self._update_row(ws, row, kwargs)
 
-        self._save_workbook(wb, "entities.xlsx")
-        return self._row_to_dict(ws, row)
+            self._save_workbook(wb, "entities.xlsx")
+            return self._row_to_dict(ws, row)
 
     def delete_template(self, template_id: int) -> bool:
-        """删除模板"""
-        wb = self._load_workbook("entities.xlsx")
-        ws = wb["templates"]
+        """删除模板（级联删除下属数据，单次事务写入）"""
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            ws = wb["templates"]
 
-        row = self._find_row_by_id(ws, template_id)
-        if not row:
-            return False
+            if not self._find_row_by_id(ws, template_id):
+                return False
 
-        ws.delete_rows(row)
-        self._save_workbook(wb, "entities.xlsx")
-        return True
+            self._cascade_delete_entities(template_ids={template_id})
+            return True
 
     # ============ 实验方法 ============
 
     def list_experiments(self, template_id: int = None, status: str = None,
                          page: int = 1, page_size: int = 20) -> tuple[List[Dict], int]:
         """获取实验列表"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["experiments"]
-        ws_links = wb["experiment_templates"]
-
-        # 获取所有实验
-        all_experiments = []
-        for row in range(2, ws.max_row + 1):
-            exp = self._row_to_dict(ws, row)
-            if exp:
-                all_experiments.append(exp)
+        start = (page - 1) * page_size
+        end = start + page_size
 
-        # 如果指定了 template_id，需要过滤
+        # 如果指定了 template_id，先取关联的实验ID
+        linked_exp_ids = None
         if template_id:
-            # 获取关联的实验ID
-            linked_exp_ids = set()
-            for row in range(2, ws_links.max_row + 1):
-                if ws_links.cell(row=row, column=2).value == template_id:
-                    linked_exp_ids.add(ws_links.cell(row=row, column=1).value)
-
-            all_experiments = [e for e in all_experiments if e["id"] in linked_exp_ids]
-
-        # 如果指定了状态
-        if status:
-            all_experiments = [e for e in all_experiments if e.get("status") == status]
-
-        total = len(all_experiments)
+            linked_exp_ids = {
+                link["experiment_id"] for link in self._records("experiments.xlsx", "experiment_templates")
+                if link.get("template_id") == template_id
+            }
 
-        # 分页
-        start = (page - 1) * page_size
-        end = start + page_size
-        experiments = all_experiments[start:end]
+        # 过滤并只复制当前页
+        experiments = []
+        total = 0
+        for exp in self._records("experiments.xlsx", "experiments"):
+            if linked_exp_ids is not None and exp["id"] not in linked_exp_ids:
+                continue
+            if status and exp.get("status") != status:
+                continue
+            if start <= total < end:
+                experiments.append(dict(exp))
+            total += 1
 
         return experiments, total
 
     def get_experiment_by_id(self, experiment_id: int) -> Optional[Dict]:
         """根据ID获取实验"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["experiments"]
-
-        row = self._find_row_by_id(ws, experiment_id)
-        if row:
-            return self._row_to_dict(ws, row)
-        return None
+        with self._read_workbook("experiments.xlsx") as wb:
+            return self._find_by_id(wb["experiments"], experiment_id)
 
     def get_experiment_template_ids(self, experiment_id: int) -> List[int]:
         """获取实验关联的模板ID列表"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["experiment_templates"]
+        return [
+            link["template_id"] for link in self._records("experiments.xlsx", "experiment_templates")
+            if link["experiment_id"] == experiment_id
+        ]
 
-        template_ids = []
-        for row in range(2, ws.max_row + 1):
-            if ws.cell(row=row, column=1).value == experiment_id:
-                template_ids.append(ws.cell(row=row, column=2).value)
-        return template_ids
+    def get_experiment_template_ids_map(self) -> Dict[int, List[int]]:
+        """获取所有实验关联的模板ID列表：experiment_id -> [template_id]"""
+        result: Dict[int, List[int]] = {}
+        for link in self._records("experiments.xlsx", "experiment_templates"):
+            result.setdefault(link["experiment_id"], []).append(link["template_id"])
+        return result
+
+    def get_experiment_full(self, experiment_id: int) -> Optional[Dict]:
+        """获取实验及其全部关联数据（同一快照）
+
+        返回实验字典，附加 templates 列表（按关联顺序），每项包含
+        模板完整路径、关联备注和按 order_index 排序的版本概要（不含 template_content，
+        模板配置可能很大，由 get_template_version_by_id 按需获取）。
+        两个文件各只读一遍。
+        """
+        with self._read_workbook("entities.xlsx") as wb_entities, \
+                self._read_workbook("experiments.xlsx") as wb_experiments:
+            experiment = self._find_by_id(wb_experiments["experiments"], experiment_id)
+            if not experiment:
+                return None
+            if not experiment.get("color"):
+                experiment["color"] = get_color_for_experiment(experiment_id)
+
+            links = [
+                link for link in self._iter_records(wb_experiments["experiment_templates"])
+                if link["experiment_id"] == experiment_id
+            ]
+            template_ids = {link["template_id"] for link in links}
+
+            versions: Dict[int, List[Dict]] = {}
+            for version in self._iter_records(wb_experiments["template_versions"]):
+                if version.get("experiment_id") == experiment_id and version.get("template_id") in template_ids:
+                    version.pop("template_content", None)
+                    versions.setdefault(version["template_id"], []).append(version)
+
+            templates = {t["id"]: t for t in self._iter_records(wb_entities["templates"])
+                         if t["id"] in template_ids}
+            apps = {a["id"]: a for a in self._iter_records(wb_entities["apps"])}
+            customers = {c["id"]: c for c in self._iter_records(wb_entities["customers"])}
+
+        experiment["templates"] = []
+        for link in links:
+            template_id = link["template_id"]
+            template = templates.get(template_id)
+            if template:
+                app = apps.get(template.get("app_id"))
+                customer = customers.get(app.get("customer_id")) if app else None
+                if app and customer:
+                    path = f"{customer['name']}/{app['name']}/{template['name']}"
+                elif app:
+                    path = f"未知客户/{app['name']}/{template['name']}"
+                else:
+                    path = f"未知/{template['name']}"
+            else:
+                path = f"未知模板({template_id})"
+
+            template_versions = versions.get(template_id, [])
+            template_versions.sort(key=lambda x: x.get("order_index", 0))
+            experiment["templates"].append({
+                "template_id": template_id,
+                "template_name": template["name"] if template else None,
+                "path": path,
+                "notes": link.get("notes") or "",
+                "versions": template_versions,
+            })
+        return experiment
 
     def create_experiment(self, name: str, template_ids: List[int], created_by: int,
                           status: str = "draft", reference_type: str = "new") -> Dict:
         """创建实验"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["experiments"]
-        ws_links = wb["experiment_templates"]
-
-        new_id = self._get_next_id(ws)
-        color = get_color_for_experiment(new_id)
-        new_row = ws.max_row + 1
+        with self.transaction():
+            wb = self._load_workbook("experiments.xlsx")
+            ws = wb["experiments"]
+            ws_links = wb["experiment_templates"]
 
-        ws.cell(row=new_row, column=1, value=new_id)
-        ws.cell(row=new_row, column=2, value=name)
-        ws.cell(row=new_row, column=3, value=status)
-        ws.cell(row=new_row, column=4, value=reference_type)
-        ws.cell(row=new_row, column=5, value=color)
-        ws.cell(row=new_row, column=6, value=datetime.now().isoformat())
-        ws.cell(row=new_row, column=7, value=created_by)
-        ws.cell(row=new_row, column=8, value=None)
+            new_id = self._get_next_id(ws)
+            experiment = self._insert_row(ws, {
+                "id": new_id,
+                "name": name,
+                "status": status,
+                "reference_type": reference_type,
+                "color": get_color_for_experiment(new_id),
+                "created_at": datetime.now().isoformat(),
+                "created_by": created_by,
+                "updated_at": None,
+            })
 
-        # 添加模板关联
-        for template_id in template_ids:
-            link_row = ws_links.max_row + 1
-            ws_links.cell(row=link_row, column=1, value=new_id)
-            ws_links.cell(row=link_row, column=2, value=template_id)
+            # 添加模板关联
+            for template_id in template_ids:
+                self._insert_row(ws_links, {"experiment_id": new_id, "template_id": template_id})
 
-        self._save_workbook(wb, "experiments.xlsx")
-        return self._row_to_dict(ws, new_row)
+            self._save_workbook(wb, "experiments.xlsx")
+            return experiment
 
     def update_experiment(self, experiment_id: int, **kwargs) -> Optional[Dict]:
         """更新实验"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["experiments"]
-
-        row = self._find_row_by_id(ws, experiment_id)
-        if not row:
-            return None
+        with self.transaction():
+            wb = self._load_workbook("experiments.xlsx")
+            ws = wb["experiments"]
 
-        headers = [ws.cell(row=1, column=col).value for col in range(1, ws.max_column + 1)]
-        for key, value in kwargs.items():
-            if key in headers:
-                col = headers.index(key) + 1
-                ws.cell(row=row, column=col, value=value)
+            row = self._find_row_by_id(ws, experiment_id)
+            if not row:
+                return None
 
-        # 更新 updated_at
-        updated_at_col = headers.index("updated_at") + 1
-        ws.cell(row=row, column=updated_at_col, value=datetime.now().isoformat())
+            # 同时更新 updated_at
+            self._update_row(ws, row, {**kwargs, "updated_at": datetime.now().isoformat()})
 
-        self._save_workbook(wb, "experiments.xlsx")
-        return self._row_to_dict(ws, row)
+            self._save_workbook(wb, "experiments.xlsx")
+            return self._row_to_dict(ws, row)
 
     def delete_experiment(self, experiment_id: int) -> bool:
-        """删除实验"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["experiments"]
-        ws_links = wb["experiment_templates"]
-
-        row = self._find_row_by_id(ws, experiment_id)
-        if not row:
-            return False
+        """删除实验（同时删除模板关联和模板版本）"""
+        with self.transaction():
+            wb = self._load_workbook("experiments.xlsx")
+            ws = wb["experiments"]
 
-        # 删除实验
-        ws.delete_rows(row)
+            row = self._find_row_by_id(ws, experiment_id)
+            if not row:
+                return False
 
-        # 删除关联
-        rows_to_delete = []
-        for row in range(2, ws_links.max_row + 1):
-            if ws_links.cell(row=row, column=1).value == experiment_id:
-                rows_to_delete.append(row)
+            # 删除实验
+            ws.delete_rows(row)
 
-        for row in reversed(rows_to_delete):
-            ws_links.delete_rows(row)
+            # 删除关联和版本
+            self._delete_rows_where(wb["experiment_templates"], lambda r: r["experiment_id"] == experiment_id)
+            self._delete_rows_where(wb["template_versions"], lambda r: r["experiment_id"] == experiment_id)
 
-        self._save_workbook(wb, "experiments.xlsx")
-        return True
+            self._save_workbook(wb, "experiments.xlsx")
+            return True
 
     def link_experiment_templates(self, experiment_id: int, template_ids: List[int]):
         """关联实验和模板"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws_links = wb["experiment_templates"]
+        with self.transaction():
+            wb = self._load_workbook("experiments.xlsx")
+            ws_links = wb["experiment_templates"]
 
-        existing = set()
-        for row in range(2, ws_links.max_row + 1):
-            if ws_links.cell(row=row, column=1).value == experiment_id:
-                existing.add(ws_links.cell(row=row, column=2).value)
+            existing = {
+                link["template_id"] for link in self._iter_records(ws_links)
+                if link["experiment_id"] == experiment_id
+            }
 
-        for template_id in template_ids:
-            if template_id not in existing:
-                new_row = ws_links.max_row + 1
-                ws_links.cell(row=new_row, column=1, value=experiment_id)
-                ws_links.cell(row=new_row, column=2, value=template_id)
+            for template_id in template_ids:
+                if template_id not in existing:
+                    self._insert_row(ws_links, {"experiment_id": experiment_id, "template_id": template_id})
+                    existing.add(template_id)
 
-        self._save_workbook(wb, "experiments.xlsx")
+            self._save_workbook(wb, "experiments.xlsx")
 
     def unlink_experiment_template(self, experiment_id: int, template_id: int):
         """解除实验和模板的关联"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws_links = wb["experiment_templates"]
-
-        rows_to_delete = []
-        for row in range(2, ws_links.max_row + 1):
-            if (ws_links.cell(row=row, column=1).value == experiment_id and
-                ws_links.cell(row=row, column=2).value == template_id):
-                rows_to_delete.append(row)
+        with self.transaction():
+            wb = self._load_workbook("experiments.xlsx")
 
-        for row in reversed(rows_to_delete):
-            ws_links.delete_rows(row)
+            self._delete_rows_where(
+                wb["experiment_templates"],
+                lambda r: r["experiment_id"] == experiment_id and r["template_id"] == template_id
+            )
 
-        self._save_workbook(wb, "experiments.xlsx")
+            self._save_workbook(wb, "experiments.xlsx")
 
     def get_experiment_template_notes(self, experiment_id: int, template_id: int) -> Optional[str]:
         """获取实验-模板关联的备注"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws_links = wb["experiment_templates"]
-
-        headers = [ws_links.cell(row=1, column=col).value for col in range(1, ws_links.max_column + 1)]
-        notes_col = headers.index("notes") + 1 if "notes" in headers else None
+        with self._read_workbook("experiments.xlsx") as wb:
+            ws_links = wb["experiment_templates"]
 
-        for row in range(2, ws_links.max_row + 1):
-            if (ws_links.cell(row=row, column=1).value == experiment_id and
-                ws_links.cell(row=row, column=2).value == template_id):
-                if notes_col:
-                    return ws_links.cell(row=row, column=notes_col).value or ""
-                return ""
+            for link in self._iter_records(ws_links):
+                if link["experiment_id"] == experiment_id and link["template_id"] == template_id:
+                    return link.get("notes") or ""
 
-        return None
+            return None
 
     def update_experiment_template_notes(self, experiment_id: int, template_id: int, notes: str) -> bool:
         """更新实验-模板关联的备注"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws_links = wb["experiment_templates"]
-
-        headers = [ws_links.cell(row=1, column=col).value for col in range(1, ws_links.max_column + 1)]
-
-        # 确保 notes 列存在
-        if "notes" not in headers:
-            notes_col = ws_links.max_column + 1
-            ws_links.cell(row=1, column=notes_col, value="notes")
-        else:
-            notes_col = headers.index("notes") + 1
-
-        for row in range(2, ws_links.max_row + 1):
-            if (ws_links.cell(row=row, column=1).value == experiment_id and
-                ws_links.cell(row=row, column=2).value == template_id):
-                ws_links.cell(row=row, column=notes_col, value=notes)
-                self._save_workbook(wb, "experiments.xlsx")
-                return True
+        with self.transaction():
+            wb = self._load_workbook("experiments.xlsx")
+            ws_links = wb["experiment_templates"]
 
-        return False
+            # 确保 notes 列存在
+            if "notes" not in self._schema(ws_links).columns:
+                ws_links.cell(row=1, column=ws_links.max_column + 1, value="notes")
+                self._schemas.pop(ws_links, None)
+
+            for row, (exp_id, tmpl_id) in enumerate(
+                ws_links.iter_rows(min_row=2, max_col=2, values_only=True), start=2
+            ):
+                if exp_id == experiment_id and tmpl_id == template_id:
+                    self._update_row(ws_links, row, {"notes": notes})
+                    self._save_workbook(wb, "experiments.xlsx")
+                    return True
+
+            return False
 
     # ============ 矩阵数据方法 ============
 
     def get_matrix_data(self) -> tuple[List[Dict], List[Dict]]:
         """获取矩阵数据"""
-        wb_entities = self._load_workbook("entities.xlsx")
-        wb_experiments = self._load_workbook("experiments.xlsx")
-
-        # 获取所有模板
-        ws_templates = wb_entities["templates"]
-        ws_apps = wb_entities["apps"]
-        ws_customers = wb_entities["customers"]
-        ws_experiments = wb_experiments["experiments"]
-        ws_links = wb_experiments["experiment_templates"]
+        with self._read_workbook("entities.xlsx") as wb_entities, \
+                self._read_workbook("experiments.xlsx") as wb_experiments:
+            return self._build_matrix(wb_entities, wb_experiments)
 
+    def _build_matrix(self, wb_entities: Workbook, wb_experiments: Workbook) -> tuple[List[Dict], List[Dict]]:
+        """由已加载的工作簿构建矩阵行和实验列表"""
         # 构建索引
-        apps = {r["id"]: r for r in [self._row_to_dict(ws_apps, row) for row in range(2, ws_apps.max_row + 1)] if r}
-        customers = {r["id"]: r for r in [self._row_to_dict(ws_customers, row) for row in range(2, ws_customers.max_row + 1)] if r}
+        apps = {a["id"]: a for a in self._iter_records(wb_entities["apps"])}
+        customers = {c["id"]: c for c in self._iter_records(wb_entities["customers"])}
 
         # 获取所有实验
         experiments = []
-        for row in range(2, ws_experiments.max_row + 1):
-            exp = self._row_to_dict(ws_experiments, row)
-            if exp:
-                if not exp.get("color"):
-                    exp["color"] = get_color_for_experiment(exp["id"])
-                experiments.append(exp)
+        for exp in self._iter_records(wb_experiments["experiments"]):
+            if not exp.get("color"):
+                exp["color"] = get_color_for_experiment(exp["id"])
+            experiments.append(exp)
 
         # 构建实验-模板关联索引
         exp_template_links = {}  # template_id -> [experiment_ids]
-        for row in range(2, ws_links.max_row + 1):
-            exp_id = ws_links.cell(row=row, column=1).value
-            template_id = ws_links.cell(row=row, column=2).value
-            if template_id not in exp_template_links:
-                exp_template_links[template_id] = []
-            exp_template_links[template_id].append(exp_id)
+        for link in self._iter_records(wb_experiments["experiment_templates"]):
+            exp_template_links.setdefault(link["template_id"], []).append(link["experiment_id"])
 
         # 构建实验索引
         exp_index = {e["id"]: e for e in experiments}
 
         # 构建矩阵行
         rows = []
-        for row in range(2, ws_templates.max_row + 1):
-            template = self._row_to_dict(ws_templates, row)
-            if not template:
-                continue
-
+        for template in self._iter_records(wb_entities["templates"]):
             app = apps.get(template.get("app_id"))
             if not app:
                 continue
@@ -857,16 +1345,10 @@ class ExcelStore:
 
     def list_template_versions(self, experiment_id: int, template_id: int) -> List[Dict]:
         """获取实验-模板的版本列表"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["template_versions"]
-
-        versions = []
-        for row in range(2, ws.max_row + 1):
-            version = self._row_to_dict(ws, row)
-            if (version and
-                version.get("experiment_id") == experiment_id and
-                version.get("template_id") == template_id):
-                versions.append(version)
+        versions = [
+            dict(version) for version in self._records("experiments.xlsx", "template_versions")
+            if version.get("experiment_id") == experiment_id and version.get("template_id") == template_id
+        ]
 
         # 按 order_index 排序
         versions.sort(key=lambda x: x.get("order_index", 0))
@@ -874,72 +1356,62 @@ class ExcelStore:
 
     def get_template_version_by_id(self, version_id: int) -> Optional[Dict]:
         """根据ID获取模板版本"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["template_versions"]
-
-        row = self._find_row_by_id(ws, version_id)
-        if row:
-            return self._row_to_dict(ws, row)
-        return None
+        with self._read_workbook("experiments.xlsx") as wb:
+            return self._find_by_id(wb["template_versions"], version_id)
 
     def create_template_version(
         self, experiment_id: int, template_id: int, name: str, order_index: int = 0,
         notes: str = "", template_content: str = ""
     ) -> Dict:
         """创建模板版本"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["template_versions"]
-
-        new_id = self._get_next_id(ws)
-        new_row = ws.max_row + 1
-
-        ws.cell(row=new_row, column=1, value=new_id)
-        ws.cell(row=new_row, column=2, value=experiment_id)
-        ws.cell(row=new_row, column=3, value=template_id)
-        ws.cell(row=new_row, column=4, value=name)
-        ws.cell(row=new_row, column=5, value=notes)
-        ws.cell(row=new_row, column=6, value=template_content)
-        ws.cell(row=new_row, column=7, value=order_index)
-        ws.cell(row=new_row, column=8, value=datetime.now().isoformat())
-        ws.cell(row=new_row, column=9, value=None)
+        with self.transaction():
+            wb = self._load_workbook("experiments.xlsx")
+            ws = wb["template_versions"]
+
+            version = self._insert_row(ws, {
+                "id": self._get_next_id(ws),
+                "experiment_id": experiment_id,
+                "template_id": template_id,
+                "name": name,
+                "notes": notes,
+                "template_content": template_content,
+                "order_index": order_index,
+                "created_at": datetime.now().isoformat(),
+                "updated_at": None,
+            })
 
-        self._save_workbook(wb, "experiments.xlsx")
-        return self._row_to_dict(ws, new_row)
+            self._save_workbook(wb, "experiments.xlsx")
+            return version
 
     def update_template_version(self, version_id: int, **kwargs) -> Optional[Dict]:
         """更新模板版本"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["template_versions"]
-
-        row = self._find_row_by_id(ws, version_id)
-        if not row:
-            return None
+        with self.transaction():
+            wb = self._load_workbook("experiments.xlsx")
+            ws = wb["template_versions"]
 
-        headers = [ws.cell(row=1, column=col).value for col in range(1, ws.max_column + 1)]
-        for key, value in kwargs.items():
-            if key in headers:
-                col = headers.index(key) + 1
-                ws.cell(row=row, column=col, value=value)
+            row = self._find_row_by_id(ws, version_id)
+            if not row:
+                return None
 
-        # 更新 updated_at
-        updated_at_col = headers.index("updated_at") + 1
-        ws.cell(row=row, column=updated_at_col, value=datetime.now().isoformat())
+            # 同时更新 updated_at
+            self._update_row(ws, row, {**kwargs, "updated_at": datetime.now().isoformat()})
 
-        self._save_workbook(wb, "experiments.xlsx")
-        return self._row_to_dict(ws, row)
+            self._save_workbook(wb, "experiments.xlsx")
+            return self._row_to_dict(ws, row)
 
     def delete_template_version(self, version_id: int) -> bool:
         """删除模板版本"""
-        wb = self._load_workbook("experiments.xlsx")
-        ws = wb["template_versions"]
+        with self.transaction():
+            wb = self._load_workbook("experiments.xlsx")
+            ws = wb["template_versions"]
 
-        row = self._find_row_by_id(ws, version_id)
-        if not row:
-            return False
+            row = self._find_row_by_id(ws, version_id)
+            if not row:
+                return False
 
-        ws.delete_rows(row)
-        self._save_workbook(wb, "experiments.xlsx")
-        return True
+            ws.delete_rows(row)
+            self._save_workbook(wb, "experiments.xlsx")
+            return True
 
     def get_next_version_order_index(self, experiment_id: int, template_id: int) -> int:
         """获取下一个版本的排序索引"""
@@ -948,6 +1420,87 @@ class ExcelStore:
             return 0
         return max(v.get("order_index", 0) for v in versions) + 1
 
+    # ============ 维护方法 ============
+
+    def warm_up(self):
+        """预热：初始化数据文件，加载常用 sheet 的行缓存和唯一索引
+
+        服务启动后在后台线程调用，使首批请求不必等待读取和解析 Excel。
+        """
+        self._ensure_files()
+        for filename, sheet in WARM_UP_SHEETS:
+            self._records(filename, sheet)
+        with self.transaction():
+            for sheet in UNIQUE_INDEXES:
+                self._unique_index(sheet)
+
+    def compact(self) -> Dict[str, int]:
+        """清理孤儿数据并紧凑重写所有 Excel 文件（离线维护使用）
+
+        返回各 sheet 被清理的行数。
+        """
+        purged: Dict[str, int] = {}
+
+        with self.transaction():
+            wb = self._load_workbook("entities.xlsx")
+            wb_experiments = self._load_workbook("experiments.xlsx")
+
+            def ids(ws: Worksheet) -> set:
+                return {v[0] for v in ws.iter_rows(min_row=2, max_col=1, values_only=True) if v[0] is not None}
+
+            customer_ids = ids(wb["customers"])
+            purged["apps"] = len(self._delete_rows_where(
+                wb["apps"], lambda r: r["customer_id"] not in customer_ids
+            ))
+            app_ids = ids(wb["apps"])
+            purged["templates"] = len(self._delete_rows_where(
+                wb["templates"], lambda r: r["app_id"] not in app_ids
+            ))
+            template_ids = ids(wb["templates"])
+
+            experiment_ids = ids(wb_experiments["experiments"])
+            purged["experiment_templates"] = len(self._delete_rows_where(
+                wb_experiments["experiment_templates"],
+                lambda r: r["experiment_id"] not in experiment_ids or r["template_id"] not in template_ids
+            ))
+            purged["template_versions"] = len(self._delete_rows_where(
+                wb_experiments["template_versions"],
+                lambda r: r["experiment_id"] not in experiment_ids or r["template_id"] not in template_ids
+            ))
+
+            for filename in ("users.xlsx", "entities.xlsx", "experiments.xlsx"):
+                self._save_workbook(self._rewrite_compact(self._load_workbook(filename)), filename)
+            for sheet in UNIQUE_INDEXES:
+                self._invalidate_unique_index(sheet)
+
+        return purged
+
+    def _rewrite_compact(self, wb: Workbook) -> Workbook:
+        """按原 sheet 顺序只拷贝表头和非空数据行，丢弃空行与多余的格式信息"""
+        new_wb = Workbook()
+        new_wb.remove(new_wb.active)
+        for ws in wb.worksheets:
+            new_ws = new_wb.create_sheet(ws.title)
+            for row, values in enumerate(ws.iter_rows(values_only=True), start=1):
+                if row == 1 or (values and values[0] is not None):
+                    new_ws.append(values)
+        return new_wb
+
+
+def _timed_operation(name: str, func: Callable) -> Callable:
+    """记录存储操作耗时"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with storage_operation_duration.time(operation=name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# 公开的存储操作统一计时（transaction 是上下文管理器，不计时）
+for _name, _func in list(vars(ExcelStore).items()):
+    if not _name.startswith("_") and _name != "transaction" and callable(_func):
+        setattr(ExcelStore, _name, _timed_operation(_name, _func))
+
 
 # 全局实例
 excel_store = ExcelStore()
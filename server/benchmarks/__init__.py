@@ -0,0 +1,12 @@
+"""存储层/服务端性能基准
+
+在 server 目录下以模块方式运行，不需要设置 PYTHONPATH（见 benchmarks._bootstrap）:
+    python -m benchmarks.storage_bench
+    python -m benchmarks.read_only_bench
+    python -m benchmarks.serialization_bench
+    python -m benchmarks.response_bench
+    python -m benchmarks.load_test
+
+依赖 server 的运行环境（pip install -e ../shared -e .）；数据写在临时目录，运行结束后删除。
+各脚本的参数见模块说明或 --help。
+"""
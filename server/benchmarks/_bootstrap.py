@@ -0,0 +1,25 @@
+"""基准脚本的运行环境
+
+各脚本必须在导入 app 之前导入本模块：
+- 把 server 目录和 shared/src 加入 sys.path（及子进程继承的 PYTHONPATH），未安装 voidview_shared 也能运行
+- 让存储层使用临时目录，避免在默认目录建文件；脚本结束时自行删除 TMP_DIR
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).parent.parent.resolve()
+PROJECT_ROOT = SERVER_DIR.parent
+
+for _path in (str(PROJECT_ROOT / "shared" / "src"), str(SERVER_DIR)):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+    _pythonpath = os.environ.get("PYTHONPATH", "")
+    if _path not in _pythonpath.split(os.pathsep):
+        os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [_path, _pythonpath]))
+
+TMP_DIR = Path(tempfile.mkdtemp(prefix="voidview-bench-"))
+os.environ["DEBUG"] = "false"
+os.environ["STORAGE_PATH"] = str(TMP_DIR)
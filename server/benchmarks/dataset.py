@@ -0,0 +1,117 @@
+"""合成数据集生成器
+
+按 N 客户 × M 应用 × K 模板、E 个实验（每个实验关联 L 个模板）、
+每个关联 V 个模板版本的规模，直接写出与 ExcelStore 格式一致的 Excel 文件。
+"""
+
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from openpyxl import Workbook
+from pydantic import BaseModel
+
+from app.core.security import get_password_hash
+from app.storage.excel_store import SHEET_HEADERS, PRESET_COLORS
+
+STATUSES = ["draft", "running", "completed", "archived"]
+REFERENCE_TYPES = ["new", "supplier", "self"]
+
+
+class DatasetSpec(BaseModel):
+    """数据集规模"""
+    customers: int = 10
+    apps_per_customer: int = 3
+    templates_per_app: int = 3
+    experiments: int = 50
+    links_per_experiment: int = 3
+    versions_per_link: int = 1
+    users: int = 5
+    seed: int = 42
+
+    @property
+    def apps(self) -> int:
+        return self.customers * self.apps_per_customer
+
+    @property
+    def templates(self) -> int:
+        return self.apps * self.templates_per_app
+
+
+# 预设规模
+SCALES = {
+    "tiny": DatasetSpec(customers=3, apps_per_customer=2, templates_per_app=2,
+                        experiments=10, links_per_experiment=2, versions_per_link=1),
+    "small": DatasetSpec(),
+    "medium": DatasetSpec(customers=50, apps_per_customer=5, templates_per_app=5,
+                          experiments=1000, links_per_experiment=5, versions_per_link=2),
+    "large": DatasetSpec(customers=200, apps_per_customer=5, templates_per_app=10,
+                         experiments=10000, links_per_experiment=5, versions_per_link=2),
+}
+
+
+def _new_workbook(sheets: list) -> Workbook:
+    """按表头创建空工作簿"""
+    wb = Workbook()
+    wb.remove(wb.active)
+    for title in sheets:
+        wb.create_sheet(title).append(SHEET_HEADERS[title])
+    return wb
+
+
+def generate_dataset(data_dir: Path, spec: DatasetSpec) -> None:
+    """在 data_dir 下生成 users/entities/experiments 三个文件
+
+    使用普通模式保存（与 ExcelStore 一致，会写出 <dimension>），
+    保证只读加载的表现与真实数据相同。
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(spec.seed)
+    base_time = datetime(2024, 1, 1)
+
+    def timestamp(i: int) -> str:
+        return (base_time + timedelta(minutes=i)).isoformat()
+
+    # 用户：密码统一为 bench123，方便压测登录
+    wb = _new_workbook(["users"])
+    ws = wb["users"]
+    password_hash = get_password_hash("bench123")
+    ws.append([1, "root", password_hash, "管理员", "root", True, False, timestamp(0), None, None])
+    for i in range(2, spec.users + 2):
+        ws.append([i, f"tester{i - 1}", password_hash, f"测试员{i - 1}", "tester",
+                   True, False, timestamp(i), 1, None])
+    wb.save(data_dir / "users.xlsx")
+
+    # 客户 / 应用 / 模板
+    wb = _new_workbook(["customers", "apps", "templates"])
+    app_id = template_id = 0
+    for customer_id in range(1, spec.customers + 1):
+        wb["customers"].append([customer_id, f"客户{customer_id}", f"联系人{customer_id}", None,
+                                timestamp(customer_id)])
+        for a in range(spec.apps_per_customer):
+            app_id += 1
+            wb["apps"].append([app_id, customer_id, f"应用{a + 1}", None, timestamp(app_id)])
+            for t in range(spec.templates_per_app):
+                template_id += 1
+                wb["templates"].append([template_id, app_id, f"模板{t + 1}", None, timestamp(template_id)])
+    wb.save(data_dir / "entities.xlsx")
+
+    # 实验 / 关联 / 版本
+    wb = _new_workbook(["experiments", "experiment_templates", "experiment_groups",
+                        "objective_metrics", "template_versions"])
+    version_id = 0
+    links = min(spec.links_per_experiment, spec.templates)
+    for exp_id in range(1, spec.experiments + 1):
+        wb["experiments"].append([
+            exp_id, f"实验{exp_id}", rng.choice(STATUSES), rng.choice(REFERENCE_TYPES),
+            PRESET_COLORS[exp_id % len(PRESET_COLORS)], timestamp(exp_id), 1, None,
+        ])
+        for tid in rng.sample(range(1, spec.templates + 1), links):
+            wb["experiment_templates"].append([exp_id, tid, f"备注{exp_id}-{tid}"])
+            for order_index in range(spec.versions_per_link):
+                version_id += 1
+                wb["template_versions"].append([
+                    version_id, exp_id, tid, f"v{order_index + 1}", "", "preset=medium crf=23",
+                    order_index, timestamp(version_id), None,
+                ])
+    wb.save(data_dir / "experiments.xlsx")
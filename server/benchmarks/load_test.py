@@ -0,0 +1,333 @@
+"""HTTP 压测工具
+
+以多个合成测试员身份登录，按场景权重回放典型流量（矩阵加载、实验列表翻页、
+备注编辑、版本创建），统计总吞吐量和每个路由的 p50/p95/p99 延迟。
+
+默认在临时目录生成合成数据集并启动本地 uvicorn（app.main:app）；
+指定 --base-url 时直接压测已运行的服务（测试员账号需为 tester1..N，密码 bench123）。
+
+用法（在 server 目录下）:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --users 20 --duration 60 --scale medium
+    python -m benchmarks.load_test --scenario read_heavy --output load.json
+    python -m benchmarks.load_test --scenario mypkg.scenarios:NIGHTLY
+
+自定义场景为 [(权重, 动作), ...]，动作签名为 async def action(user: VirtualUser)。
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+# 必须在导入 app 之前导入：设置 sys.path 和临时存储目录
+from benchmarks._bootstrap import SERVER_DIR, TMP_DIR
+
+import httpx
+
+from app.storage import excel_store
+from benchmarks.dataset import SCALES, generate_dataset
+
+PASSWORD = "bench123"
+
+
+class Stats:
+    """按路由收集延迟与状态码"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, route: str, seconds: float, ok: bool):
+        self.latencies.setdefault(route, []).append(seconds * 1000)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self, duration: float) -> List[dict]:
+        result = []
+        for route, values in sorted(self.latencies.items()):
+            values.sort()
+            result.append({
+                "route": route,
+                "count": len(values),
+                "errors": self.errors.get(route, 0),
+                "rps": round(len(values) / duration, 2),
+                "p50_ms": round(_percentile(values, 50), 2),
+                "p95_ms": round(_percentile(values, 95), 2),
+                "p99_ms": round(_percentile(values, 99), 2),
+                "max_ms": round(values[-1], 2),
+            })
+        return result
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """最近秩百分位"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class VirtualUser:
+    """一个虚拟测试员：持有登录态，并缓存从矩阵中发现的实验-模板关联"""
+
+    def __init__(self, client: httpx.AsyncClient, stats: Stats, username: str, rng: random.Random):
+        self.client = client
+        self.stats = stats
+        self.username = username
+        self.rng = rng
+        self.links: List[Tuple[int, int]] = []
+        self.total_experiments = 0
+
+    async def request(self, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """发送请求并按路由模板记录耗时（route 用于聚合，如 "GET /experiments/{id}"）"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(route, time.perf_counter() - start, ok=False)
+            return None
+        self.stats.record(route, time.perf_counter() - start, ok=response.is_success)
+        return response
+
+    async def login(self):
+        response = await self.request("POST /auth/login", "POST", "/api/v1/auth/login",
+                                      json={"username": self.username, "password": PASSWORD})
+        if response is None or not response.is_success:
+            raise RuntimeError(f"{self.username} 登录失败")
+        token = response.json()["access_token"]
+        self.client.headers["Authorization"] = f"Bearer {token}"
+        await load_matrix(self)
+        await list_experiments(self)
+
+
+# ============ 动作 ============
+
+async def load_matrix(user: VirtualUser):
+    """加载客户矩阵（客户端主页）"""
+    response = await user.request("GET /experiments/matrix", "GET", "/api/v1/experiments/matrix")
+    if response is not None and response.is_success:
+        user.links = [
+            (int(exp_id), row["template_id"])
+            for row in response.json()["rows"]
+            for exp_id in row["experiments"]
+        ]
+
+
+async def list_experiments(user: VirtualUser):
+    """实验列表随机翻页"""
+    pages = max(1, (user.total_experiments + 19) // 20)
+    response = await user.request("GET /experiments", "GET", "/api/v1/experiments",
+                                  params={"page": user.rng.randint(1, pages), "page_size": 20})
+    if response is not None and response.is_success:
+        user.total_experiments = response.json()["total"]
+
+
+async def edit_notes(user: VirtualUser):
+    """读取并修改一个实验-模板关联的备注"""
+    if not user.links:
+        return
+    experiment_id, template_id = user.rng.choice(user.links)
+    url = f"/api/v1/experiments/{experiment_id}/templates/{template_id}/notes"
+    route = "/experiments/{id}/templates/{id}/notes"
+    await user.request(f"GET {route}", "GET", url)
+    await user.request(f"PUT {route}", "PUT", url,
+                       json={"notes": f"{user.username} @ {datetime.now().isoformat()}"})
+
+
+async def create_version(user: VirtualUser):
+    """在一个实验-模板关联下创建版本"""
+    if not user.links:
+        return
+    experiment_id, template_id = user.rng.choice(user.links)
+    await user.request(
+        "POST /experiments/{id}/templates/{id}/versions", "POST",
+        f"/api/v1/experiments/{experiment_id}/templates/{template_id}/versions",
+        json={"name": f"v-{user.username}-{user.rng.randrange(10 ** 6)}",
+              "template_content": "preset=medium crf=23"},
+    )
+
+
+async def view_experiment(user: VirtualUser):
+    """打开实验详情"""
+    if not user.links:
+        return
+    experiment_id, template_id = user.rng.choice(user.links)
+    await user.request("GET /experiments/{id}", "GET", f"/api/v1/experiments/{experiment_id}")
+    await user.request("GET /experiments/{id}/templates/{id}/versions", "GET",
+                       f"/api/v1/experiments/{experiment_id}/templates/{template_id}/versions")
+
+
+Action = Callable[[VirtualUser], Awaitable[None]]
+
+# 内置场景：[(权重, 动作)]
+SCENARIOS: Dict[str, List[Tuple[float, Action]]] = {
+    "mixed": [
+        (3, load_matrix),
+        (4, list_experiments),
+        (2, view_experiment),
+        (2, edit_notes),
+        (1, create_version),
+    ],
+    "read_heavy": [
+        (4, load_matrix),
+        (5, list_experiments),
+        (3, view_experiment),
+    ],
+    "write_heavy": [
+        (1, load_matrix),
+        (1, list_experiments),
+        (3, edit_notes),
+        (3, create_version),
+    ],
+}
+
+
+def resolve_scenario(name: str) -> List[Tuple[float, Action]]:
+    """内置场景名，或 "模块:属性" 形式的自定义场景"""
+    if name in SCENARIOS:
+        return SCENARIOS[name]
+    if ":" not in name:
+        raise SystemExit(f"未知场景: {name}（可选 {', '.join(SCENARIOS)} 或 模块:属性）")
+    module_name, attr = name.split(":", 1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+# ============ 运行 ============
+
+async def run_user(base_url: str, username: str, scenario, stats: Stats,
+                   deadline: float, think_time: float, seed: int):
+    """单个虚拟用户的循环"""
+    rng = random.Random(seed)
+    weights = [weight for weight, _ in scenario]
+    actions = [action for _, action in scenario]
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        user = VirtualUser(client, stats, username, rng)
+        await user.login()
+        while time.perf_counter() < deadline:
+            await rng.choices(actions, weights)[0](user)
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, think_time * 2))
+
+
+async def run_load(base_url: str, users: int, duration: float, scenario,
+                   think_time: float, ramp_up: float) -> Tuple[Stats, float]:
+    stats = Stats()
+    start = time.perf_counter()
+    deadline = start + duration
+    tasks = []
+    for i in range(users):
+        tasks.append(asyncio.create_task(
+            run_user(base_url, f"tester{i + 1}", scenario, stats, deadline, think_time, seed=i)
+        ))
+        if ramp_up:
+            await asyncio.sleep(ramp_up / users)
+    await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - start
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(data_dir: Path, port: int, workers: int) -> subprocess.Popen:
+    """用 uvicorn 在子进程中启动 app.main:app，等待健康检查通过"""
+    env = dict(os.environ, DEBUG="false", STORAGE_PATH=str(data_dir))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=SERVER_DIR, env=env,
+    )
+    url = f"http://127.0.0.1:{port}/health"
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError("服务启动失败")
+        try:
+            if httpx.get(url, timeout=1).is_success:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("等待服务启动超时")
+
+
+def print_report(rows: List[dict], duration: float):
+    total = sum(row["count"] for row in rows)
+    errors = sum(row["errors"] for row in rows)
+    print(f"\n总请求 {total}，错误 {errors}，耗时 {duration:.1f}s，吞吐 {total / duration:.1f} req/s\n")
+    print(f"{'路由':<52}{'次数':>7}{'错误':>6}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for row in rows:
+        print(f"{row['route']:<52}{row['count']:>7}{row['errors']:>6}{row['rps']:>8.1f}"
+              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="VoidView HTTP 压测")
+    parser.add_argument("--users", type=int, default=10, help="并发虚拟测试员数量")
+    parser.add_argument("--duration", type=float, default=30, help="压测时长（秒）")
+    parser.add_argument("--scenario", default="mixed", help="场景名或 模块:属性")
+    parser.add_argument("--think-time", type=float, default=0.0, help="动作间平均等待（秒）")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="所有用户启动完毕所需时间（秒）")
+    parser.add_argument("--scale", default="small", choices=list(SCALES.keys()), help="合成数据规模")
+    parser.add_argument("--workers", type=int, default=1, help="本地 uvicorn worker 数")
+    parser.add_argument("--base-url", help="压测已运行的服务，不再本地启动")
+    parser.add_argument("--output", type=Path, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    scenario = resolve_scenario(args.scenario)
+    process = None
+    base_url = args.base_url
+    try:
+        if not base_url:
+            spec = SCALES[args.scale].model_copy(update={"users": args.users})
+            generate_dataset(excel_store.data_dir, spec)
+            port = _free_port()
+            process = start_server(TMP_DIR, port, args.workers)
+            base_url = f"http://127.0.0.1:{port}"
+
+        print(f"压测 {base_url}：{args.users} 用户，{args.duration:.0f}s，场景 {args.scenario}")
+        stats, duration = asyncio.run(run_load(
+            base_url, args.users, args.duration, scenario, args.think_time, args.ramp_up
+        ))
+        rows = stats.summary(duration)
+        print_report(rows, duration)
+
+        if args.output:
+            report = {
+                "meta": {
+                    "timestamp": datetime.now().isoformat(timespec="seconds"),
+                    "base_url": base_url,
+                    "users": args.users,
+                    "duration": round(duration, 2),
+                    "scenario": args.scenario,
+                    "scale": None if args.base_url else args.scale,
+                    "workers": None if args.base_url else args.workers,
+                },
+                "results": rows,
+            }
+            args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            print(f"\n结果已写入 {args.output}")
+        return 1 if any(row["errors"] for row in rows) else 0
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""只读流式加载基准
+
+对比默认 load_workbook()（构建完整单元格对象图）与 ExcelStore 读路径
+使用的 read_only 流式模式在大 experiments.xlsx 上的耗时和内存峰值。
+
+ExcelStore 按文件版本缓存已读取的行，冷读场景每次调用前清空行缓存，测量的是流式读取本身；
+热读场景单独列出，只反映缓存命中的开销。
+
+用法（在 server 目录下）:
+    python -m benchmarks.read_only_bench
+    python -m benchmarks.read_only_bench --rows 50000
+    python -m benchmarks.read_only_bench --rows 5000 --legacy
+"""
+
+import argparse
+import shutil
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# 必须在导入 app 之前导入：设置 sys.path 和临时存储目录
+from benchmarks._bootstrap import TMP_DIR
+
+from openpyxl import Workbook, load_workbook
+
+from app.storage import excel_store
+
+
+def generate_experiments_file(filepath: Path, rows: int, links_per_experiment: int = 3):
+    """生成指定行数的 experiments.xlsx
+
+    与 ExcelStore 一样用普通模式保存：write_only 模式不写 <dimension>，
+    会让 read_only 打开时为每个 sheet 额外全量扫描一遍，结果失真。
+    """
+    wb = Workbook()
+    wb.remove(wb.active)
+    now = datetime.now().isoformat()
+
+    ws = wb.create_sheet("experiments")
+    ws.append(["id", "name", "status", "reference_type", "color", "created_at", "created_by", "updated_at"])
+    for i in range(1, rows + 1):
+        ws.append([i, f"实验{i}", "draft", "new", "#FF6B6B", now, 1, None])
+
+    ws = wb.create_sheet("experiment_templates")
+    ws.append(["experiment_id", "template_id", "notes"])
+    for i in range(1, rows + 1):
+        for j in range(links_per_experiment):
+            ws.append([i, (i + j) % 1000 + 1, None])
+
+    for title, headers in [
+        ("experiment_groups", ["id", "experiment_id", "name"]),
+        ("objective_metrics", ["id", "group_id"]),
+        ("template_versions", ["id", "experiment_id", "template_id", "name", "notes",
+                               "template_content", "order_index", "created_at", "updated_at"]),
+    ]:
+        wb.create_sheet(title).append(headers)
+
+    wb.save(filepath)
+
+
+def measure(func, repeat: int):
+    """返回 (最佳耗时秒, 内存峰值MB)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024 / 1024
+
+
+def full_load_iter(filepath: Path):
+    """默认模式加载整个工作簿后用 iter_rows 读取（只对比加载模式的差异）"""
+    wb = load_workbook(filepath)
+    rows = wb["experiments"].iter_rows(values_only=True)
+    headers = next(rows)
+    return [dict(zip(headers, values)) for values in rows]
+
+
+def legacy_cell_scan(filepath: Path):
+    """旧读路径：默认模式加载后逐单元格读取（每行重复计算 max_column，行数大时极慢）"""
+    wb = load_workbook(filepath)
+    ws = wb["experiments"]
+    headers = [ws.cell(row=1, column=col).value for col in range(1, ws.max_column + 1)]
+    result = []
+    for row in range(2, ws.max_row + 1):
+        result.append(dict(zip(headers, [ws.cell(row=row, column=col).value
+                                         for col in range(1, ws.max_column + 1)])))
+    return result
+
+
+def cold(func):
+    """每次调用前清空 ExcelStore 的行缓存，使调用重新流式读取文件"""
+    def run():
+        excel_store._record_cache.clear()
+        return func()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="read_only 流式加载基准")
+    parser.add_argument("--rows", type=int, default=50000, help="实验行数")
+    parser.add_argument("--repeat", type=int, default=3, help="计时重复次数（取最佳）")
+    parser.add_argument("--legacy", action="store_true", help="同时测量旧的逐单元格读取路径")
+    args = parser.parse_args()
+
+    filepath = excel_store.data_dir / "experiments.xlsx"
+    print(f"生成 {args.rows} 行 experiments.xlsx ...")
+    generate_experiments_file(filepath, args.rows)
+    print(f"文件大小: {filepath.stat().st_size / 1024 / 1024:.1f} MB\n")
+
+    cases = [
+        ("load_workbook() + iter_rows", lambda: full_load_iter(filepath)),
+        ("read_only: list_experiments(全量页, 冷)",
+         cold(lambda: excel_store.list_experiments(page=1, page_size=args.rows))),
+        ("read_only: list_experiments(第1页, 冷)", cold(lambda: excel_store.list_experiments())),
+        ("read_only: get_experiment_by_id(末行, 冷)",
+         cold(lambda: excel_store.get_experiment_by_id(args.rows))),
+    ]
+    if args.legacy:
+        cases.insert(0, ("load_workbook() + 逐单元格读取", lambda: legacy_cell_scan(filepath)))
+
+    baseline = None
+    print(f"{'场景':<40}{'耗时(s)':>10}{'峰值内存(MB)':>16}{'加速':>8}{'省内存':>8}")
+    for name, func in cases:
+        seconds, peak_mb = measure(func, args.repeat)
+        if baseline is None:
+            baseline = (seconds, peak_mb)
+        print(f"{name:<40}{seconds:>10.2f}{peak_mb:>16.1f}"
+              f"{baseline[0] / seconds:>7.1f}x{baseline[1] / peak_mb:>7.1f}x")
+
+    # 热读：文件未变化时命中行缓存，不读取文件，不与加载模式对比
+    excel_store.list_experiments()
+    seconds, _ = measure(lambda: excel_store.list_experiments(), args.repeat)
+    print(f"\n行缓存命中 list_experiments(第1页): {seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
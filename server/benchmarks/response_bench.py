@@ -0,0 +1,107 @@
+"""响应序列化与压缩基准
+
+用合成数据集构造矩阵和实验列表响应，比较几种序列化方式的耗时
+（标准库 json / orjson / Pydantic 直接序列化）以及 gzip / brotli 压缩后的大小。
+
+用法（在 server 目录下）:
+    python -m benchmarks.response_bench
+    python -m benchmarks.response_bench --scales medium large --repeat 10
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+# 必须在导入 app 之前导入：设置 sys.path 和临时存储目录
+from benchmarks._bootstrap import TMP_DIR
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, TypeAdapter
+
+from app.api.v1 import experiments as routes
+from app.core import compression, responses
+from app.config import settings
+from app.schemas.experiment import ExperimentListResponse
+from benchmarks.dataset import SCALES, generate_dataset
+from benchmarks.storage_bench import use_dataset
+
+
+def _median_ms(func: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def _serializers(model: BaseModel) -> List[tuple]:
+    """(名称, 函数)：函数从处理器返回值生成响应体字节"""
+    adapter = TypeAdapter(type(model))
+    result = [
+        ("json", lambda: json.dumps(jsonable_encoder(model), ensure_ascii=False,
+                                    separators=(",", ":")).encode("utf-8")),
+        ("pydantic", lambda: adapter.dump_json(adapter.validate_python(model))),
+    ]
+    if responses.orjson is not None:
+        result.insert(1, ("orjson", lambda: responses.dumps(jsonable_encoder(model))))
+    return result
+
+
+def _bench_payload(name: str, model: BaseModel, repeat: int):
+    print(f"  {name}")
+    body = b""
+    for label, func in _serializers(model):
+        body = func()
+        print(f"    serialize/{label:<10}{_median_ms(func, repeat):>10.2f} ms")
+
+    print(f"    size/raw            {len(body):>10,} B")
+    encodings = ["gzip", "br"] if compression.brotli is not None else ["gzip"]
+    for encoding in encodings:
+        compressed = compression.compress(body, encoding)
+        elapsed = _median_ms(lambda: compression.compress(body, encoding), repeat)
+        print(f"    size/{encoding:<14}{len(compressed):>10,} B  "
+              f"({len(body) / len(compressed):.1f}x, {elapsed:.2f} ms)")
+
+
+def run_scale(scale: str, repeat: int):
+    spec = SCALES[scale]
+    data_dir = settings.storage_path / scale
+    generate_dataset(data_dir, spec)
+    use_dataset(data_dir)
+    print(f"\n[{scale}] templates={spec.templates} experiments={spec.experiments}")
+
+    matrix = asyncio.run(routes.get_experiment_matrix(current_user={}))
+    _bench_payload(f"matrix ({len(matrix.rows)} rows)", matrix, repeat)
+
+    # 列表处理器返回已类型化的行字典，与 FastAPI 一样按 response_model 校验
+    listing = ExperimentListResponse.model_validate(asyncio.run(routes.list_experiments(
+        page=1, page_size=100, template_id=None, status=None, current_user={})))
+    _bench_payload(f"experiments page ({len(listing.items)} items)", listing, repeat)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="响应序列化与压缩基准")
+    parser.add_argument("--scales", nargs="+", default=["small", "medium"],
+                        choices=list(SCALES.keys()), help="要测量的数据规模")
+    parser.add_argument("--repeat", type=int, default=5, help="每项的计时次数")
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if responses.orjson else 'no'}  brotli: {'yes' if compression.brotli else 'no'}  "
+          f"gzip level: {settings.GZIP_LEVEL}")
+    for scale in args.scales:
+        run_scale(scale, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        code = main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+    sys.exit(code)
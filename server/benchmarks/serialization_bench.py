@@ -0,0 +1,102 @@
+"""列表接口逐行序列化微基准
+
+对比列表接口两种处理方式的每行耗时：
+- before: 处理器中逐行 _convert_datetime（复制字典）+ Model.model_validate，
+  FastAPI 再按 response_model 校验并序列化
+- after: 处理器直接返回存储层已类型化的行字典，由 response_model 只校验一次并序列化
+
+另外给出存储层读取整表的耗时（未命中 / 命中行缓存）。
+
+用法（在 server 目录下）:
+    python -m benchmarks.serialization_bench
+    python -m benchmarks.serialization_bench --scale large --repeat 10
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+# 必须在导入 app 之前导入：设置 sys.path 和临时存储目录
+from benchmarks._bootstrap import TMP_DIR
+
+from pydantic import TypeAdapter
+
+from app.api.v1.experiments import _convert_datetime
+from app.config import settings
+from app.schemas.experiment import CustomerResponse, ExperimentResponse, TemplateVersionResponse
+from app.storage import excel_store
+from benchmarks.dataset import SCALES, generate_dataset
+from benchmarks.storage_bench import use_dataset
+
+
+def _median(func: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _bench_rows(name: str, model, rows: List[dict], repeat: int):
+    adapter = TypeAdapter(List[model])
+
+    def before():
+        items = [model.model_validate(_convert_datetime(row)) for row in rows]
+        return adapter.dump_json(adapter.validate_python(items))
+
+    def after():
+        return adapter.dump_json(adapter.validate_python([dict(row) for row in rows]))
+
+    assert before() == after(), f"{name}: 两种方式输出不一致"
+    count = max(len(rows), 1)
+    old = _median(before, repeat) / count * 1e6
+    new = _median(after, repeat) / count * 1e6
+    print(f"  {name:<12}{len(rows):>8} rows   before {old:7.2f} us/row   after {new:7.2f} us/row   "
+          f"({old / new:.1f}x)")
+
+
+def _bench_storage(filename: str, sheet: str, repeat: int):
+    def uncached():
+        excel_store._record_cache.clear()
+        return excel_store._records(filename, sheet)
+
+    cold = _median(uncached, repeat) * 1000
+    excel_store._records(filename, sheet)
+    warm = _median(lambda: excel_store._records(filename, sheet), repeat) * 1000
+    print(f"  {sheet:<22} read {cold:9.2f} ms   cached {warm:7.3f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="列表接口逐行序列化微基准")
+    parser.add_argument("--scale", default="medium", choices=list(SCALES.keys()), help="数据规模")
+    parser.add_argument("--repeat", type=int, default=5, help="每项的计时次数")
+    args = parser.parse_args()
+
+    data_dir = settings.storage_path / args.scale
+    generate_dataset(data_dir, SCALES[args.scale])
+    use_dataset(data_dir)
+
+    experiments = [{**exp, "template_names": []} for exp in excel_store._records("experiments.xlsx", "experiments")]
+    print(f"[{args.scale}] 序列化（每行）")
+    _bench_rows("customers", CustomerResponse, excel_store._records("entities.xlsx", "customers"), args.repeat)
+    _bench_rows("experiments", ExperimentResponse, experiments, args.repeat)
+    _bench_rows("versions", TemplateVersionResponse,
+                excel_store._records("experiments.xlsx", "template_versions"), args.repeat)
+
+    print(f"[{args.scale}] 存储读取（整表）")
+    _bench_storage("entities.xlsx", "templates", args.repeat)
+    _bench_storage("experiments.xlsx", "experiments", args.repeat)
+    _bench_storage("experiments.xlsx", "template_versions", args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        code = main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+    sys.exit(code)
@@ -0,0 +1,238 @@
+"""存储层基准套件
+
+按多个规模生成合成数据集（见 benchmarks.dataset），逐个测量 ExcelStore
+公开方法（列表/查询/创建/更新/删除/矩阵）的耗时与内存峰值，
+结果可写为 JSON，并可与历史结果对比以发现热点路径的性能回退。
+
+用法（在 server 目录下）:
+    python -m benchmarks.storage_bench
+    python -m benchmarks.storage_bench --scales small medium --output bench.json
+    python -m benchmarks.storage_bench --compare bench.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+# 必须在导入 app 之前导入：设置 sys.path 和临时存储目录
+from benchmarks._bootstrap import TMP_DIR
+
+import openpyxl
+
+from app.storage import excel_store
+from benchmarks.dataset import SCALES, DatasetSpec, generate_dataset
+
+
+class Case:
+    """一个基准场景
+
+    setup 在计时之外执行，其返回值作为参数传给 func，
+    用于删除类场景预先创建待删除的数据。
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self.func = func
+        self.setup = setup
+
+    def run_once(self) -> float:
+        arg = self.setup() if self.setup else None
+        start = time.perf_counter()
+        self.func(arg)
+        return time.perf_counter() - start
+
+    def peak_memory(self) -> int:
+        arg = self.setup() if self.setup else None
+        tracemalloc.start()
+        self.func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+
+def use_dataset(data_dir: Path):
+    """切换存储层到指定数据目录，并清空与目录相关的缓存"""
+    excel_store.data_dir = data_dir
+    excel_store._meta = None
+    excel_store._index_cache.clear()
+    excel_store._record_cache.clear()
+
+
+def build_cases(spec: DatasetSpec) -> List[Case]:
+    """按数据集规模构造场景，查询目标取数据集末尾的记录（最坏扫描）"""
+    last_customer = spec.customers
+    last_app = spec.apps
+    last_template = spec.templates
+    last_experiment = spec.experiments
+    counter = iter(range(10 ** 9))
+
+    def unique(prefix: str) -> str:
+        return f"{prefix}-bench-{next(counter)}"
+
+    def new_customer(_=None):
+        return excel_store.create_customer(unique("客户"))["id"]
+
+    def new_app(_=None):
+        return excel_store.create_app(last_customer, unique("应用"))["id"]
+
+    def new_template(_=None):
+        return excel_store.create_template(last_app, unique("模板"))["id"]
+
+    def new_experiment(_=None):
+        return excel_store.create_experiment(unique("实验"), [1, last_template], created_by=1)["id"]
+
+    def new_version(_=None):
+        return excel_store.create_template_version(
+            last_experiment, last_template, unique("v"), template_content="preset=medium"
+        )["id"]
+
+    return [
+        # 读
+        Case("list_users", lambda _: excel_store.list_users()),
+        Case("get_user_by_username", lambda _: excel_store.get_user_by_username("root")),
+        Case("list_customers", lambda _: excel_store.list_customers()),
+        Case("get_customer_by_id", lambda _: excel_store.get_customer_by_id(last_customer)),
+        Case("get_customer_by_name", lambda _: excel_store.get_customer_by_name(f"客户{last_customer}")),
+        Case("list_apps", lambda _: excel_store.list_apps()),
+        Case("list_apps(customer)", lambda _: excel_store.list_apps(last_customer)),
+        Case("get_app_by_id", lambda _: excel_store.get_app_by_id(last_app)),
+        Case("list_templates", lambda _: excel_store.list_templates()),
+        Case("list_templates(app)", lambda _: excel_store.list_templates(last_app)),
+        Case("get_template_by_id", lambda _: excel_store.get_template_by_id(last_template)),
+        Case("list_experiments(page1)", lambda _: excel_store.list_experiments()),
+        Case("list_experiments(template)", lambda _: excel_store.list_experiments(template_id=last_template)),
+        Case("list_experiments(status)", lambda _: excel_store.list_experiments(status="running")),
+        Case("get_experiment_by_id", lambda _: excel_store.get_experiment_by_id(last_experiment)),
+        Case("get_experiment_template_ids",
+             lambda _: excel_store.get_experiment_template_ids(last_experiment)),
+        Case("get_experiment_template_notes",
+             lambda _: excel_store.get_experiment_template_notes(last_experiment, last_template)),
+        Case("list_template_versions",
+             lambda _: excel_store.list_template_versions(last_experiment, last_template)),
+        Case("get_matrix_data", lambda _: excel_store.get_matrix_data()),
+        # 写
+        Case("create_customer", new_customer),
+        Case("update_customer", lambda _: excel_store.update_customer(last_customer, contact=unique("c"))),
+        Case("delete_customer(cascade)", lambda cid: excel_store.delete_customer(cid), setup=new_customer),
+        Case("create_app", new_app),
+        Case("update_app", lambda _: excel_store.update_app(last_app, description=unique("d"))),
+        Case("delete_app(cascade)", lambda aid: excel_store.delete_app(aid), setup=new_app),
+        Case("create_template", new_template),
+        Case("update_template", lambda _: excel_store.update_template(last_template, description=unique("d"))),
+        Case("delete_template(cascade)", lambda tid: excel_store.delete_template(tid), setup=new_template),
+        Case("create_experiment", new_experiment),
+        Case("update_experiment", lambda _: excel_store.update_experiment(last_experiment, name=unique("实验"))),
+        Case("delete_experiment", lambda eid: excel_store.delete_experiment(eid), setup=new_experiment),
+        Case("link_experiment_templates",
+             lambda tid: excel_store.link_experiment_templates(last_experiment, [tid]), setup=new_template),
+        Case("update_experiment_template_notes",
+             lambda _: excel_store.update_experiment_template_notes(last_experiment, last_template, unique("n"))),
+        Case("create_template_version", new_version),
+        Case("update_template_version",
+             lambda vid: excel_store.update_template_version(vid, notes=unique("n")), setup=new_version),
+        Case("delete_template_version",
+             lambda vid: excel_store.delete_template_version(vid), setup=new_version),
+    ]
+
+
+def run_scale(scale: str, spec: DatasetSpec, repeat: int, only: Optional[List[str]]) -> List[dict]:
+    """在一个规模下生成数据并执行全部场景"""
+    data_dir = TMP_DIR / scale
+    start = time.perf_counter()
+    generate_dataset(data_dir, spec)
+    print(f"\n[{scale}] 客户 {spec.customers} / 应用 {spec.apps} / 模板 {spec.templates} / "
+          f"实验 {spec.experiments} × {spec.links_per_experiment} 关联 × {spec.versions_per_link} 版本"
+          f"（生成 {time.perf_counter() - start:.1f}s）")
+    use_dataset(data_dir)
+
+    results = []
+    print(f"{'场景':<40}{'最小(ms)':>10}{'中位(ms)':>10}{'平均(ms)':>10}{'峰值内存(KB)':>14}")
+    for case in build_cases(spec):
+        if only and not any(pattern in case.name for pattern in only):
+            continue
+        timings = [case.run_once() * 1000 for _ in range(repeat)]
+        peak_kb = case.peak_memory() / 1024
+        result = {
+            "scale": scale,
+            "case": case.name,
+            "min_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "mean_ms": round(statistics.mean(timings), 3),
+            "peak_kb": round(peak_kb, 1),
+            "repeat": repeat,
+        }
+        results.append(result)
+        print(f"{case.name:<40}{result['min_ms']:>10.2f}{result['median_ms']:>10.2f}"
+              f"{result['mean_ms']:>10.2f}{result['peak_kb']:>14.1f}")
+    return results
+
+
+def compare(results: List[dict], baseline_file: Path, threshold: float) -> int:
+    """与历史结果对比中位耗时，返回回退场景数"""
+    baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+    previous = {(r["scale"], r["case"]): r for r in baseline["results"]}
+
+    regressions = 0
+    print(f"\n对比 {baseline_file}（阈值 +{threshold:.0%}）")
+    for result in results:
+        old = previous.get((result["scale"], result["case"]))
+        if not old or not old["median_ms"]:
+            continue
+        ratio = result["median_ms"] / old["median_ms"]
+        if ratio > 1 + threshold:
+            regressions += 1
+            print(f"  回退 [{result['scale']}] {result['case']}: "
+                  f"{old['median_ms']:.2f}ms -> {result['median_ms']:.2f}ms ({ratio:.2f}x)")
+    if not regressions:
+        print("  无回退")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="存储层基准套件")
+    parser.add_argument("--scales", nargs="+", default=["tiny", "small", "medium"],
+                        choices=list(SCALES.keys()), help="要测量的数据规模")
+    parser.add_argument("--repeat", type=int, default=5, help="每个场景的计时次数")
+    parser.add_argument("--only", nargs="+", help="只运行名称包含这些关键字的场景")
+    parser.add_argument("--output", type=Path, help="结果 JSON 输出路径")
+    parser.add_argument("--compare", type=Path, help="与之前的结果 JSON 对比")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定回退的中位耗时增幅")
+    args = parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        results.extend(run_scale(scale, SCALES[scale], args.repeat, args.only))
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "openpyxl": openpyxl.__version__,
+                "platform": platform.platform(),
+                "scales": {scale: SCALES[scale].model_dump() for scale in args.scales},
+            },
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n结果已写入 {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        code = main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+    sys.exit(code)
@@ -0,0 +1,39 @@
+"""服务端 pytest 公共配置"""
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "shared" / "src"))
+sys.path.insert(0, str(project_root / "server"))
+
+from app.storage.excel_store import ExcelStore  # noqa: E402
+
+excel_store_module = importlib.import_module("app.storage.excel_store")
+
+
+@pytest.fixture
+def new_store(tmp_path, monkeypatch):
+    """返回创建 ExcelStore 的函数：数据放在 tmp_path 下，不影响全局单例
+
+    每次调用都得到新实例（内存中的缓存和 ID 序列为空），同一测试内多次调用可模拟服务端重启。
+    """
+    data_dir = tmp_path / "excel_data"
+    monkeypatch.setattr(excel_store_module, "_get_data_dir", lambda: data_dir)
+
+    def factory() -> ExcelStore:
+        # 清空单例槽位以创建新实例，测试结束后 monkeypatch 恢复原来的全局实例
+        monkeypatch.setattr(ExcelStore, "_instance", None)
+        return ExcelStore()
+
+    return factory
+
+
+@pytest.fixture
+def store(new_store) -> ExcelStore:
+    """tmp_path 下的全新 ExcelStore"""
+    return new_store()
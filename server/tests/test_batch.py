@@ -0,0 +1,47 @@
+"""
+VoidView 批量操作测试
+
+BatchService 和各实体服务使用的全局 excel_store 替换为 tmp_path 下的全新实例（见 conftest.py）。
+
+用法（不需要启动服务端）:
+    cd server && python -m pytest tests/test_batch.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.schemas.batch import BatchOperation
+from app.services import batch_service, experiment_service
+from app.services.batch_service import BatchService, BatchAborted
+
+USER = {"id": 1, "role": "root"}
+
+
+@pytest.fixture
+def store(store, monkeypatch):
+    """服务层使用的 excel_store 指向测试用的实例"""
+    for module in (batch_service, experiment_service):
+        monkeypatch.setattr(module, "excel_store", store)
+    return store
+
+
+def test_batch_rollback(store):
+    """子操作失败时前面的操作全部回滚，唯一索引不残留被回滚的键"""
+    service = BatchService()
+    operations = [
+        BatchOperation(resource="customer", action="create", data={"name": "批量客户"}),
+        BatchOperation(resource="app", action="create", data={"customer_id": "$0.id", "name": "批量应用"}),
+        BatchOperation(resource="app", action="create", data={"customer_id": "$0.id", "name": "批量应用"}),
+    ]
+    with pytest.raises(BatchAborted) as aborted:
+        asyncio.run(service.execute(operations, USER))
+    assert aborted.value.index == 2
+    assert aborted.value.status_code == 400
+
+    assert "批量客户" not in [c["name"] for c in store.list_customers()]
+    assert not [a for a in store.list_apps() if a["name"] == "批量应用"]
+
+    # 回滚后可以重新创建同名数据
+    results = asyncio.run(service.execute(operations[:2], USER))
+    assert results[1]["customer_id"] == results[0]["id"]
@@ -0,0 +1,96 @@
+"""
+VoidView 存储层不变量测试
+
+每个测试使用 tmp_path 下的全新 ExcelStore（见 conftest.py），检查：
+唯一约束、级联删除不留孤儿数据、ID 删除后不复用。
+
+用法（不需要启动服务端）:
+    cd server && python -m pytest tests/test_storage.py
+"""
+
+import pytest
+
+from app.storage import DuplicateKeyError
+
+
+def test_unique_constraints(store):
+    """客户名称、同一客户下的应用名称、同一应用下的模板名称唯一"""
+    customer = store.create_customer(name="唯一客户")
+    other = store.create_customer(name="唯一客户2")
+    with pytest.raises(DuplicateKeyError):
+        store.create_customer(name="唯一客户")
+    with pytest.raises(DuplicateKeyError):
+        store.update_customer(other["id"], name="唯一客户")
+
+    app = store.create_app(customer_id=customer["id"], name="应用")
+    with pytest.raises(DuplicateKeyError):
+        store.create_app(customer_id=customer["id"], name="应用")
+    # 不同客户下允许同名应用
+    store.create_app(customer_id=other["id"], name="应用")
+
+    store.create_template(app_id=app["id"], name="模板")
+    with pytest.raises(DuplicateKeyError):
+        store.create_template(app_id=app["id"], name="模板")
+
+    # 被拒绝的写入没有落盘
+    names = [c["name"] for c in store.list_customers()]
+    assert names.count("唯一客户") == 1, names
+    assert store.get_customer_by_id(other["id"])["name"] == "唯一客户2"
+
+
+def test_cascade_delete(store):
+    """删除模板和客户后不留孤儿应用、模板、关联和版本，其他客户的数据保留"""
+    customer = store.create_customer(name="级联客户")
+    keep_customer = store.create_customer(name="保留客户")
+    template_ids = []
+    for i in range(2):
+        app = store.create_app(customer_id=customer["id"], name=f"级联应用{i}")
+        for j in range(2):
+            template_ids.append(store.create_template(app_id=app["id"], name=f"级联模板{j}")["id"])
+    keep_app = store.create_app(customer_id=keep_customer["id"], name="保留应用")
+    keep_template = store.create_template(app_id=keep_app["id"], name="保留模板")
+
+    experiment = store.create_experiment(
+        name="级联实验", template_ids=template_ids + [keep_template["id"]], created_by=1
+    )
+    for template_id in template_ids + [keep_template["id"]]:
+        store.create_template_version(experiment["id"], template_id, name="001")
+
+    # 先删一个模板，再删整个客户
+    store.delete_template(template_ids[0])
+    store.delete_customer(customer["id"])
+
+    customer_ids = {c["id"] for c in store.list_customers()}
+    app_ids = {a["id"] for a in store.list_apps()}
+    assert not store.list_apps(customer_id=customer["id"])
+    assert all(a["customer_id"] in customer_ids for a in store.list_apps())
+    assert all(t["app_id"] in app_ids for t in store.list_templates())
+
+    # 只剩其他客户的关联和版本
+    assert store.get_experiment_template_ids(experiment["id"]) == [keep_template["id"]]
+    for template_id in template_ids:
+        assert not store.list_template_versions(experiment["id"], template_id)
+    assert len(store.list_template_versions(experiment["id"], keep_template["id"])) == 1
+    assert store.get_experiment_by_id(experiment["id"]) is not None
+
+
+def test_ids_not_reused(new_store):
+    """删除最大 ID 的行后新 ID 仍然更大，重启后也不复用"""
+    store = new_store()
+    first = store.create_customer(name="ID客户1")
+    last = store.create_customer(name="ID客户2")
+    # 删除当前最大ID的行，扫描最大ID的实现会复用它
+    store.delete_customer(last["id"])
+    created = store.create_customer(name="ID客户3")
+    assert created["id"] > last["id"]
+
+    store.delete_customer(first["id"])
+    store.delete_customer(created["id"])
+    # 模拟重启：新实例从 meta.json 重新加载序列
+    store = new_store()
+    assert store.create_customer(name="ID客户4")["id"] > created["id"]
+
+    experiment = store.create_experiment(name="ID实验", template_ids=[], created_by=1)
+    store.delete_experiment(experiment["id"])
+    again = store.create_experiment(name="ID实验2", template_ids=[], created_by=1)
+    assert again["id"] > experiment["id"]
@@ -1,7 +1,7 @@
 """VoidView Shared - 共享代码模块"""
 
 from .enums import UserRole, ExperimentStatus, GroupStatus, ReferenceType, EvaluationType, ReviewResult
-from .constants import API_VERSION
+from .constants import API_VERSION, SERVER_READY_MARKER
 from .logging import setup_logging, get_logger
 
 __all__ = [
@@ -12,6 +12,7 @@ __all__ = [
     "EvaluationType",
     "ReviewResult",
     "API_VERSION",
+    "SERVER_READY_MARKER",
     "setup_logging",
     "get_logger",
 ]
@@ -12,3 +12,6 @@ DEFAULT_ROOT_DISPLAY_NAME = "系统管理员"
 # Token 配置
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+
+# 本地服务器就绪握手：服务端就绪后向 stdout 输出以此开头的一行
+SERVER_READY_MARKER = "VOIDVIEW_SERVER_READY"